@@ -1,6 +1,6 @@
 # backend/app.py
 from flask import Flask, jsonify
-from flask_cors import CORS
+from backend.cors import init_cors
 
 # Import blueprints
 from backend.routes.users import user_blueprint
@@ -8,35 +8,13 @@ from backend.routes.events import event_blueprint
 from backend.routes.bookings import booking_blueprint
 from backend.routes.attendance import attendance_bp
 from backend.routes.auditoriums import auditorium_bp
+from backend.services.mail_outbox import ensure_in_process_drainer
 
 # Create Flask app
 app = Flask(__name__)
 
-# ---------------------------
-# CORS Configuration
-# ---------------------------
-# Allow localhost, production, and ALL Vercel preview deployments
-ALLOWED_ORIGINS = [
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-    "https://turbo007.pythonanywhere.com",
-    "https://book-evntz.vercel.app",
-    "https://book-evntz-pw1umm1v3-chetans-projects-c8f1a790.vercel.app",
-    "https://book-evntz-wjk3401u7-chetans-projects-c8f1a790.vercel.app",
-    "https://book-evntz-8lc06te2n-chetans-projects-c8f1a790.vercel.app",
-]
-
-# Regex to allow ANY Vercel preview URL for this project
-import re
-VERCEL_PREVIEW_REGEX = re.compile(r"https://book-evntz.*\.vercel\.app")
-
-CORS(
-    app,
-    resources={r"/*": {"origins": ALLOWED_ORIGINS + [VERCEL_PREVIEW_REGEX]}},
-    supports_credentials=True,
-    allow_headers=["Content-Type", "Authorization"],
-    methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
-)
+# CORS (origins, Authorization header, preflight caching) - see backend/cors.py
+init_cors(app)
 
 # ---------------------------
 # Register Blueprints
@@ -47,6 +25,13 @@ app.register_blueprint(booking_blueprint, url_prefix="/api/bookings")
 app.register_blueprint(attendance_bp, url_prefix="/api/attendance")
 app.register_blueprint(auditorium_bp, url_prefix="/api/auditoriums")
 
+# ---------------------------
+# Background Workers
+# ---------------------------
+# The Sheets write-behind sync starts with the store; the mail outbox drainer
+# starts here so mail still pending from a previous run is sent right away.
+ensure_in_process_drainer()
+
 # ---------------------------
 # Test Route
 # ---------------------------
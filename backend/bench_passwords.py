@@ -0,0 +1,48 @@
+import sys
+import time
+from backend.services.passwords import hash_password, PasswordVerifier
+
+# Login throughput per core for each password work factor.
+#   python -m backend.bench_passwords                 -> pbkdf2_sha256 and scrypt defaults
+#   python -m backend.bench_passwords pbkdf2_sha256 50000 100000 200000
+#   python -m backend.bench_passwords scrypt 8192 16384 32768
+
+DEFAULTS = {
+    "pbkdf2_sha256": [50000, 100000, 200000, 600000],
+    "scrypt": [4096, 8192, 16384, 32768],
+}
+
+
+def bench(algo, work_factor, seconds=1.0):
+    stored = hash_password("correct horse", algo=algo, work_factor=work_factor)
+    cold = PasswordVerifier(ttl=0)  # every login hashes
+    n, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        assert cold.verify(stored, "correct horse")
+        n += 1
+    cold_rate = n / (time.perf_counter() - start)
+
+    warm = PasswordVerifier()  # repeat logins inside the cache TTL
+    warm.verify(stored, "correct horse")
+    n, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds / 4:
+        warm.verify(stored, "correct horse")
+        n += 1
+    warm_rate = n / (time.perf_counter() - start)
+    return cold_rate, warm_rate
+
+
+def main():
+    if len(sys.argv) > 2:
+        runs = {sys.argv[1]: [int(x) for x in sys.argv[2:]]}
+    else:
+        runs = DEFAULTS
+
+    print(f"{'algorithm':<15}{'work factor':>12}{'ms/login':>10}{'logins/s/core':>15}{'cached/s':>12}")
+    for algo, factors in runs.items():
+        for wf in factors:
+            cold, warm = bench(algo, wf)
+            print(f"{algo:<15}{wf:>12}{1000 / cold:>10.1f}{cold:>15.1f}{warm:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -47,3 +47,63 @@ SHEET_SPEAKERS = "Speakers"
 SHEET_COORDINATORS = "Coordinators"
 SHEET_AUDITORIUMS = "Auditoriums"
 SHEET_ATTENDANCE = "Attendance"
+SHEET_AUDITORIUM_LAYOUTS = "AuditoriumLayouts"  # every saved version of each auditorium's SeatLayout
+
+# Storage engine behind the `gs` singleton:
+# "sheets" (default) talks to Google Sheets directly,
+# "sqlite" keeps the same sheets in a local SQLite database (indexed on USN / EventID / BookingID)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sheets").strip().lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bookevntz.db"))
+
+# Write-behind sync from the local SQLite store to Google Sheets (STORAGE_BACKEND=sqlite only).
+# Writes are acknowledged once committed locally; a background worker pushes them to the spreadsheet.
+SHEETS_SYNC_ENABLED = os.getenv("SHEETS_SYNC", "true").strip().lower() in ("1", "true", "yes")
+SHEETS_SYNC_INTERVAL = float(os.getenv("SHEETS_SYNC_INTERVAL", "5"))        # seconds between flushes
+SHEETS_SYNC_BACKOFF_MAX = float(os.getenv("SHEETS_SYNC_BACKOFF_MAX", "300"))  # cap for retry backoff
+
+# Read cache TTLs (seconds) for the Google Sheets engine. Events change rarely,
+# Bookings/Attendance need to stay close to real time during a booking rush.
+CACHE_TTL_DEFAULT = float(os.getenv("CACHE_TTL", "10"))
+CACHE_TTLS = {
+    SHEET_EVENTS: float(os.getenv("CACHE_TTL_EVENTS", "60")),
+    SHEET_AUDITORIUMS: float(os.getenv("CACHE_TTL_AUDITORIUMS", "60")),
+    SHEET_SPEAKERS: float(os.getenv("CACHE_TTL_SPEAKERS", "60")),
+    SHEET_COORDINATORS: float(os.getenv("CACHE_TTL_COORDINATORS", "60")),
+    SHEET_USERS: float(os.getenv("CACHE_TTL_USERS", "10")),
+    SHEET_BOOKINGS: float(os.getenv("CACHE_TTL_BOOKINGS", "5")),
+    SHEET_ATTENDANCE: float(os.getenv("CACHE_TTL_ATTENDANCE", "5")),
+    SHEET_AUDITORIUM_LAYOUTS: float(os.getenv("CACHE_TTL_AUDITORIUM_LAYOUTS", "300")),  # versions never change
+}
+
+# Outgoing mail. Defaults target Gmail over SSL; for local testing point it at a
+# debug server, e.g. `python -m aiosmtpd -n -l localhost:1025` with
+# SMTP_HOST=localhost SMTP_PORT=1025 SMTP_USE_SSL=false SMTP_AUTH=false
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").strip().lower() in ("1", "true", "yes")
+# Without SSL, upgrade the connection with STARTTLS when the server offers it
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").strip().lower() in ("1", "true", "yes")
+SMTP_AUTH = os.getenv("SMTP_AUTH", "true").strip().lower() in ("1", "true", "yes")
+MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", "3"))              # persistent SMTP connections
+MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", "2000"))     # pending messages held in memory
+MAIL_RATE_PER_SEC = float(os.getenv("MAIL_RATE_PER_SEC", "5"))  # across all workers
+MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", "3"))
+
+# Durable outbox for booking emails: messages are stored here when the booking
+# commits and sent by a drainer (in-process thread and/or `python -m backend.drain_outbox`)
+MAIL_OUTBOX_PATH = os.getenv("MAIL_OUTBOX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "outbox.db"))
+MAIL_OUTBOX_DRAIN_IN_PROCESS = os.getenv("MAIL_OUTBOX_DRAIN_IN_PROCESS", "true").strip().lower() in ("1", "true", "yes")
+MAIL_OUTBOX_BATCH = int(os.getenv("MAIL_OUTBOX_BATCH", "50"))
+MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("MAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+
+# Password hashing: "pbkdf2_sha256" (work factor = iterations) or "scrypt" (work factor = N, a power of 2).
+# Stored hashes with a lower work factor (and legacy plaintext) are upgraded on the next successful login.
+PASSWORD_HASH_ALGO = os.getenv("PASSWORD_HASH_ALGO", "pbkdf2_sha256")
+PASSWORD_WORK_FACTOR = int(os.getenv("PASSWORD_WORK_FACTOR", "100000" if PASSWORD_HASH_ALGO == "pbkdf2_sha256" else "16384"))
+PASSWORD_CACHE_TTL = int(os.getenv("PASSWORD_CACHE_TTL", "300"))  # seconds a verified password skips re-hashing
+
+# Signed session tokens issued at /api/users/login (must be the same on every worker)
+SESSION_SECRET = os.getenv("SESSION_SECRET") or os.getenv("SECRET_KEY", "")
+# Local development only: start without SESSION_SECRET, signing with a random per-process key
+ALLOW_RANDOM_SESSION_SECRET = os.getenv("ALLOW_RANDOM_SESSION_SECRET", "false").strip().lower() in ("1", "true", "yes")
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(7 * 24 * 3600)))  # seconds
@@ -0,0 +1,32 @@
+# backend/cors.py
+import re
+from flask_cors import CORS
+
+# ---------------------------
+# CORS Configuration
+# ---------------------------
+# Shared by app.py (local dev) and server.py (gunicorn on Render)
+# Allow localhost, production, and ALL Vercel preview deployments
+ALLOWED_ORIGINS = [
+    "http://localhost:5173",
+    "http://127.0.0.1:5173",
+    "https://turbo007.pythonanywhere.com",
+    "https://book-evntz.vercel.app",
+    "https://book-evntz-pw1umm1v3-chetans-projects-c8f1a790.vercel.app",
+    "https://book-evntz-wjk3401u7-chetans-projects-c8f1a790.vercel.app",
+    "https://book-evntz-8lc06te2n-chetans-projects-c8f1a790.vercel.app",
+]
+
+# Regex to allow ANY Vercel preview URL for this project
+VERCEL_PREVIEW_REGEX = re.compile(r"https://book-evntz.*\.vercel\.app")
+
+
+def init_cors(app):
+    CORS(
+        app,
+        resources={r"/*": {"origins": ALLOWED_ORIGINS + [VERCEL_PREVIEW_REGEX]}},
+        supports_credentials=True,
+        allow_headers=["Content-Type", "Authorization"],
+        methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        max_age=600  # Authorization headers make GETs preflighted; let browsers cache the preflight
+    )
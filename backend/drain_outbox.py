@@ -0,0 +1,23 @@
+import sys
+from backend.services.mail_outbox import mail_outbox, get_drainer
+
+# Sends queued booking emails from the durable outbox.
+#   python -m backend.drain_outbox          -> run forever (separate worker process)
+#   python -m backend.drain_outbox --once   -> send what is pending and exit
+# Set MAIL_OUTBOX_DRAIN_IN_PROCESS=false on the web service when running this separately.
+
+def main():
+    drainer = get_drainer()
+    if "--once" in sys.argv:
+        total = 0
+        while True:
+            n = drainer.drain_once()
+            if not n:
+                break
+            total += n
+        print(f"Drained {total} messages. Outbox: {mail_outbox.stats()}")
+        return
+    drainer.run_forever()
+
+if __name__ == "__main__":
+    main()
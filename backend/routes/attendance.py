@@ -1,13 +1,20 @@
 # backend/routes/attendance.py
 from flask import Blueprint, request, jsonify
 from backend.services.google_sheets import gs
+from backend.services.listing import list_params_present, query_rows, select_fields
+from backend.services.event_models import event_catalog
 
 attendance_bp = Blueprint("attendance", __name__)
 
 @attendance_bp.route("/list", methods=["GET"])
 def list_attendance():
     rows = gs.get_attendance()
-    return jsonify({"status":"success","data": rows}), 200
+    if not list_params_present(request.args):
+        return jsonify({"status":"success","data": rows}), 200
+
+    # ?eventId=&usn=&auditorium=&from=&to=&q=&limit=&offset=&fields=
+    rows, meta = query_rows(rows, request.args, date_field="Timestamp", search_fields=("USN", "EventName", "Email", "Schedule"))
+    return jsonify({"status":"success","data": select_fields(rows, request.args), "meta": meta}), 200
 
 @attendance_bp.route("/mark", methods=["POST"])
 def mark():
@@ -45,8 +52,7 @@ def mark():
     event_name = ""
     user_email = ""
     try:
-        events_list = gs.get_events()
-        ev_match = next((e for e in events_list if str(e.get("ID", "")).strip() == str(event_id).strip()), None)
+        ev_match = event_catalog.get(event_id)
         if ev_match:
             event_name = ev_match.get("Name", "")
         
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from backend.services.google_sheets import gs
+from backend.services.seat_layout import compact_cell
 
 auditorium_bp = Blueprint("auditorium", __name__)
 
@@ -18,10 +19,9 @@ def add_auditorium():
         if not data.get("Name"):
             return jsonify({"status": "error", "message": "Auditorium Name is required"}), 400
         
-        # Ensure SeatLayout is a string if it's a dict/json
-        import json
-        if data.get("SeatLayout") and not isinstance(data["SeatLayout"], str):
-             data["SeatLayout"] = json.dumps(data["SeatLayout"])
+        # SeatLayout (dict or JSON string) is stored in the compact SL1: format
+        if data.get("SeatLayout"):
+             data["SeatLayout"] = compact_cell(data["SeatLayout"])
 
         success = gs.add_auditorium(data)
         if success:
@@ -36,10 +36,9 @@ def update_auditorium(name):
     try:
         updates = request.json
         
-        # Ensure SeatLayout is a string if present
-        import json
-        if updates.get("SeatLayout") and not isinstance(updates["SeatLayout"], str):
-             updates["SeatLayout"] = json.dumps(updates["SeatLayout"])
+        # SeatLayout (dict or JSON string) is stored in the compact SL1: format
+        if updates.get("SeatLayout"):
+             updates["SeatLayout"] = compact_cell(updates["SeatLayout"])
 
         success = gs.update_auditorium(name, updates)
         if success:
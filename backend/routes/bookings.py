@@ -1,17 +1,34 @@
 # backend/routes/bookings.py
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, send_file, redirect
 from backend.services.google_sheets import gs
+from backend.services.seat_reservations import seat_reservations, is_released
+from backend.services.ticket_codes import ticket_codes
+from backend.services.qr_codes import qr_codes, external_qr_url
+from backend.services.lookups import current_lookups
+from backend.services.event_models import event_catalog
+from backend.services.auth import require_auth
+from backend.services.listing import list_params_present, query_rows, select_fields
+import os
 import uuid
-import urllib.parse
 from datetime import datetime
 
 booking_blueprint = Blueprint("bookings", __name__)
 
 @booking_blueprint.route("/", methods=["GET"])
 def list_bookings():
-    bookings = gs.get_bookings()
-    bookings = _merge_attendance(bookings)
-    return jsonify({"status":"success","data": bookings}), 200
+    if not list_params_present(request.args):
+        bookings = gs.get_bookings()
+        bookings = _merge_attendance(bookings)
+        return jsonify({"status":"success","data": bookings}), 200
+
+    # ?eventId=&status=&usn=&from=&to=&q=&limit=&offset=&fields=
+    bookings, meta = query_rows(
+        gs.get_bookings(), request.args, date_field="Timestamp",
+        search_fields=("BookingID", "USN", "EventName", "Email", "Seats")
+    )
+    # attendance is only merged into the page being returned (copies, the cache stays untouched)
+    bookings = _merge_attendance([dict(b) for b in bookings])
+    return jsonify({"status":"success","data": select_fields(bookings, request.args), "meta": meta}), 200
 
 def _merge_attendance(bookings_list):
     """
@@ -73,14 +90,11 @@ def add_booking():
     # ---------------------------
     # CHECK EXISTING BOOKING
     # ---------------------------
-    all_bookings = gs.get_bookings()
-    
-    # 1. Check if user already booked this event
-    for b in all_bookings:
-        if str(b.get("EventID")) == str(event_id) and str(b.get("USN")).lower() == str(usn).lower():
-             return jsonify({"status":"failed","message":"You have already booked a seat for this event."}), 400
+    # 1. Fast fail if user already booked this event (set lookup in the per-event index)
+    if seat_reservations.has_booked(event_id, usn):
+        return jsonify({"status":"failed","message":"You have already booked a seat for this event."}), 400
 
-    # 2. Check if seat is already taken (if specific seat passed)
+    # 2. Parse requested seats (duplicate + availability are re-checked atomically right before saving)
     # seats_str e.g. "A1" or "A1,A2"
     req_seats = [s.strip() for s in seats_str.split(",") if s.strip()]
     
@@ -88,55 +102,26 @@ def add_booking():
     # If explicitly "General Entry", we skip specific seat checks
     is_general_entry = any(s.lower() == "general entry" for s in req_seats)
 
-    if req_seats and not is_general_entry:
-        for b in all_bookings:
-            if str(b.get("EventID")) == str(event_id):
-                existing_seats = [s.strip() for s in str(b.get("Seats","")).split(",")]
-                for rs in req_seats:
-                    if rs in existing_seats:
-                        return jsonify({"status":"failed","message":f"Seat {rs} is already booked."}), 400
-
     # Secure short alphanumeric ID (e.g. BK-AB123456)
     # short_id = f"BK-{uuid.uuid4().hex[:8].upper()}"
     
     # ---------------------------
     # TICKET CODE ASSIGNMENT
     # ---------------------------
-    import json
-    import os
-    import random
+    # Next unused code from ticket_codes.json, or a random ID once the pool runs out
+    allocated_code = None if data.get("BookingID") else ticket_codes.allocate()
+    chosen_id = allocated_code or f"BK-{uuid.uuid4().hex[:8].upper()}"
 
-    # Load codes
-    codes_path = os.path.join(os.path.dirname(__file__), "..", "ticket_codes.json")
-    chosen_id = f"BK-{uuid.uuid4().hex[:8].upper()}" # fallback
-    
-    if os.path.exists(codes_path):
-        try:
-            with open(codes_path, "r") as f:
-                codes = json.load(f)
-            
-            # Find unused code
-            # We already have 'all_bookings' from above
-            existing_ids = [str(b.get("BookingID")) for b in all_bookings]
-            available_codes = [c for c in codes if c not in existing_ids]
-            
-            if available_codes:
-                chosen_id = available_codes[0] # Pick first available or random.choice(available_codes)
-            else:
-                # Fallback if all used
-                chosen_id = f"BK-{uuid.uuid4().hex[:8].upper()}" 
-        except Exception as e:
-            print(f"Error reading ticket codes: {e}")
+    # Event and user records, looked up once and shared with the email block below
+    lookups = current_lookups()
 
     # Fetch event name for the booking record
-    events = gs.get_events()
-    ev_for_booking = next((e for e in events if str(e.get("ID")) == str(event_id)), None)
+    ev_for_booking = lookups.event(event_id)
     event_name = ev_for_booking.get("Name", "Unknown") if ev_for_booking else "Unknown"
 
     # Fetch user email from Users sheet
-    users = gs.get_users()
     target_usn = str(usn).strip().lower()
-    user_record = next((u for u in users if str(u.get("USN")).strip().lower() == target_usn), None)
+    user_record = lookups.user(usn)
     user_email = user_record.get("Email", "") if user_record else ""
 
     booking = {
@@ -147,58 +132,51 @@ def add_booking():
         "Email": user_email,
         "Seats": seats_str,
         "Auditorium": data.get("Auditorium") or data.get("auditorium") or "",
-        "QR URL": data.get("QR URL") or data.get("qr") or f"https://api.qrserver.com/v1/create-qr-code/?size=300x300&data={urllib.parse.quote_plus(str({'bookingId': data.get('BookingID') or chosen_id}))}",
+        "QR URL": data.get("QR URL") or data.get("qr") or qr_codes.url_for(data.get("BookingID") or chosen_id, request.host_url),
         "Status": data.get("Status") or data.get("status") or "CONFIRMED",
         "Timestamp": data.get("Timestamp") or datetime.utcnow().timestamp(),
         "Schedule": data.get("Schedule") or data.get("schedule", "")
     }
-    booking_id = gs.add_booking(booking)
+
+    # Check-and-reserve is atomic per event, so two requests for the same seat
+    # (or two bookings by the same user) can't both pass
+    reserved_seats = req_seats if (req_seats and not is_general_entry) else []
+    ok, message = seat_reservations.reserve(event_id, usn, reserved_seats)
+    if not ok:
+        if allocated_code:
+            ticket_codes.release(allocated_code)
+        return jsonify({"status":"failed","message":message}), 400
+
+    try:
+        booking_id = gs.add_booking(booking)
+    except Exception:
+        seat_reservations.abort(event_id, usn, reserved_seats)
+        if allocated_code:
+            ticket_codes.release(allocated_code)
+        raise
+    seat_reservations.commit(event_id, usn, reserved_seats)
     
     # Send Email Notification
     try:
         from backend.services.email_service import EmailService
+        from backend.services.email_templates import format_schedule
         
-        # Fetch user email (assuming USN is the key or we have a user lookup)
-        # We need to fetch user details from Sheets to get the email
+        # Same records the booking was built from (no second fetch / scan)
         print(f"DEBUG: Attempting to send email for USN: {usn}")
-        users = gs.get_users()
-        print(f"DEBUG: Fetched {len(users)} users from sheet.")
-        
-        # normalized lookup
-        target_usn = str(usn).strip().lower()
-        user = next((u for u in users if str(u.get("USN")).strip().lower() == target_usn), None)
+        user = user_record
         
         if user:
             print(f"DEBUG: User found: {user.get('Name')} | Email: {user.get('Email')}")
             if user.get("Email"):
                 # Get Event Details for the email
                 event_name = "Event"
-                events = gs.get_events()
-                ev = next((e for e in events if str(e.get("ID")) == str(event_id)), None)
+                ev = ev_for_booking
                 if ev:
                     event_name = ev.get("Name")
                 
                 print(f"DEBUG: Sending email to {user.get('Email')} for event {event_name}")
                 # Parse Date/Time
-                date_str = "TBA"
-                time_str = ""
-                schedule = booking.get("Schedule", "")
-
-                if schedule:
-                    try:
-                        # Try parsing ISO format (2026-02-21T10:36:00)
-                        if "T" in schedule:
-                            dt = datetime.fromisoformat(schedule)
-                            date_str = dt.strftime("%a, %d %b %Y") # Sat, 21 Feb 2026
-                            time_str = dt.strftime("%I:%M %p")     # 10:36 AM
-                        else:
-                            # Fallback for old format "YYYY-MM-DD HH:MM"
-                            parts = schedule.split(' ', 1)
-                            date_str = parts[0]
-                            if len(parts) > 1:
-                                time_str = parts[1]
-                    except:
-                        date_str = schedule # fallback
+                date_str, time_str = format_schedule(booking.get("Schedule", ""))
 
                 # Get Event Banner (Poster)
                 event_poster = ev.get("Poster") if ev else ""
@@ -208,11 +186,13 @@ def add_booking():
                     user_email=user.get("Email"),
                     user_name=user.get("Name", "Student"),
                     booking_details={
+                        "event_id": event_id,
                         "event_name": event_name,
                         "venue": booking.get("Auditorium"),
                         "date": date_str,
                         "time": time_str,
                         "booking_id": booking.get("BookingID"),
+                        "timestamp": booking.get("Timestamp"),
                         "seats": booking.get("Seats"),
                         "poster": event_poster,
                         "qr_url": qr_url
@@ -223,7 +203,7 @@ def add_booking():
         else:
             print(f"DEBUG: User with USN {target_usn} NOT FOUND in Users sheet.")
             # Print available USNs to help debug case/whitespace issues
-            all_usns = [str(u.get("USN")) for u in users]
+            all_usns = [str(u.get("USN")) for u in lookups.users]
             print(f"DEBUG: Available USNs: {all_usns[:10]}...") 
 
     except Exception as e:
@@ -235,22 +215,74 @@ def add_booking():
     return jsonify({"status":"success","bookingId": booking["BookingID"]}), 201
 
 @booking_blueprint.route("/delete/<booking_id>", methods=["DELETE"])
+@require_auth(role="admin")
 def delete_booking(booking_id):
+    _, existing = gs.find_booking(booking_id)
     ok = gs.delete_booking(booking_id)
     if ok:
+        seat_reservations.release(existing.get("EventID", ""), existing.get("USN", ""), existing.get("Seats", ""))
+        ticket_codes.release(booking_id)
         return jsonify({"status":"success"}), 200
     return jsonify({"status":"failed","message":"booking not found"}), 404
 
 @booking_blueprint.route("/update_status/<booking_id>", methods=["PUT"])
+@require_auth(role="admin")
 def update_status(booking_id):
     data = request.json or {}
     status = data.get("status")
     if not status:
         return jsonify({"status":"failed","message":"status required"}), 400
-    ok = gs.update_booking_status(booking_id, status)
-    if ok:
-        return jsonify({"status":"success"}), 200
-    return jsonify({"status":"failed","message":"booking not found"}), 404
+    _, existing = gs.find_booking(booking_id)
+    if not existing:
+        return jsonify({"status":"failed","message":"booking not found"}), 404
+    event_id, usn, seats = existing.get("EventID", ""), existing.get("USN", ""), existing.get("Seats", "")
+
+    # A cancelled / rejected booking gave its seat back; reinstating it has to
+    # claim the seat (and the user's slot) again, like a new booking
+    reinstating = is_released(existing.get("Status")) and not is_released(status)
+    if reinstating:
+        ok, message = seat_reservations.reserve(event_id, usn, seats)
+        if not ok:
+            return jsonify({"status":"failed","message":message}), 409
+
+    try:
+        ok = gs.update_booking_status(booking_id, status)
+    except Exception:
+        if reinstating:
+            seat_reservations.abort(event_id, usn, seats)
+        raise
+    if not ok:
+        if reinstating:
+            seat_reservations.abort(event_id, usn, seats)
+        return jsonify({"status":"failed","message":"booking not found"}), 404
+
+    if reinstating:
+        seat_reservations.commit(event_id, usn, seats)
+    else:
+        # cancelled / rejected bookings give their seat back
+        seat_reservations.set_status(event_id, usn, seats, status, existing.get("Status"))
+    return jsonify({"status":"success"}), 200
+
+@booking_blueprint.route("/qr/<booking_id>.png", methods=["GET"])
+def booking_qr(booking_id):
+    """Ticket QR image, generated once and cached on disk (static/qr)"""
+    if not qr_codes.valid_id(booking_id):
+        return jsonify({"status":"failed","message":"invalid booking id"}), 400
+    if not qr_codes.available:
+        return redirect(external_qr_url(booking_id))
+
+    path = qr_codes.path_for(booking_id)
+    if not os.path.exists(path):
+        # only generate images for real bookings
+        row_index, _ = gs.find_booking(booking_id)
+        if not row_index:
+            return jsonify({"status":"failed","message":"booking not found"}), 404
+        path = qr_codes.ensure(booking_id)
+
+    resp = send_file(path, mimetype="image/png")
+    # a ticket's QR never changes
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return resp
 
 @booking_blueprint.route("/scan", methods=["POST"])
 def scan_booking():
@@ -313,17 +345,15 @@ def bookings_for_event(event_id):
     return jsonify({"status":"success","data": filtered}), 200
 
 @booking_blueprint.route("/user/<usn>", methods=["GET"])
+@require_auth(self_param="usn")
 def bookings_for_user(usn):
     try:
         # 1. Fetch ALL data once (Parallel fetch ideally, but sequential here is fine compared to loop)
         bookings = gs.get_bookings()
-        events = gs.get_events()
-        users = gs.get_users()
 
-        # 2. Create Lookup Maps for O(1) access
-        events_map = {str(e.get("ID", "")).strip(): e for e in events}
-        # users_map key: normalized USN
-        users_map = {str(u.get("USN", "")).strip().lower(): u for u in users}
+        # 2. Events come from the shared catalog (ID -> model, no per-request map)
+        # every booking here belongs to one user: a single indexed lookup
+        u_found = current_lookups().user(usn)
 
         filtered = []
         target_usn = str(usn).strip().lower()
@@ -337,8 +367,8 @@ def bookings_for_user(usn):
                 event_id = str(b.get("EventID", "")).strip()
                 event_details = {}
                 
-                if event_id in events_map:
-                    found = events_map[event_id]
+                found = event_catalog.get(event_id)
+                if found:
                     event_details = {
                         "eventName": found.get("Name"),
                         "poster": found.get("Poster"),
@@ -351,8 +381,7 @@ def bookings_for_user(usn):
 
                 # Enrich with User Details using Map (though we likely know the user)
                 user_details = {}
-                if idx_usn in users_map:
-                    u_found = users_map[idx_usn]
+                if u_found:
                     user_details = {
                         "userName": u_found.get("Name") or u_found.get("name") or "User"
                     }
@@ -1,5 +1,15 @@
 from flask import Blueprint, jsonify, request
 from backend.services.google_sheets import gs
+from backend.services.seat_reservations import seat_reservations
+from backend.services.email_templates import email_templates
+from backend.services.broadcasts import broadcasts
+from backend.services.auth import require_auth
+from backend.services.listing import list_params_present, query_rows, select_fields, selects_field
+from backend.services.schedule_index import schedule_index
+from backend.services.event_models import event_catalog, parse_slot, parse_duration
+from backend.services.seat_layout import compact_cell
+from backend.services.auditorium_layouts import auditorium_layouts
+from backend.services.seat_availability import seat_availability
 import json
 
 event_blueprint = Blueprint("events", __name__)
@@ -10,7 +20,15 @@ event_blueprint = Blueprint("events", __name__)
 @event_blueprint.route("/", methods=["GET"])
 def list_events():
     events = gs.get_events()
-    return jsonify({"status": "success", "events": events}), 200
+    if not list_params_present(request.args):
+        return jsonify({"status": "success", "events": auditorium_layouts.with_layouts(events)}), 200
+
+    # ?auditorium=&visibility=&from=&to=&q=&limit=&offset=&fields= (SeatLayout/Poster only via fields when paging)
+    events, meta = query_rows(events, request.args, date_field="Date", search_fields=("Name", "Auditorium", "About", "EventType"))
+    # Layouts are only resolved for this page, and only when SeatLayout is returned
+    if selects_field(request.args, "SeatLayout"):
+        events = auditorium_layouts.with_layouts(events)
+    return jsonify({"status": "success", "events": select_fields(events, request.args), "meta": meta}), 200
 
 
 # ---------------------------
@@ -23,6 +41,7 @@ import os
 # ADD EVENT
 # ---------------------------
 @event_blueprint.route("/add", methods=["POST"])
+@require_auth(role="admin")
 def add_event():
     data = request.json or {}
 
@@ -40,7 +59,7 @@ def add_event():
         "About": data.get("About") or data.get("about", ""),
         "Visibility": data.get("Visibility", "visible"),
         "Featured": str(data.get("Featured", "false")), # Force string
-        "SeatLayout": data.get("SeatLayout", ""),
+        "SeatLayout": compact_cell(data.get("SeatLayout", "")), # stored compact (SL1:...), see seat_layout.py
         "Schedules": data.get("Schedules", ""), # JSON string or already list? Ideally stored as JSON string in sheet
         "Duration": data.get("Duration", ""),
         "PublishAt": data.get("PublishAt", ""),
@@ -54,6 +73,10 @@ def add_event():
     if isinstance(ev["Schedules"], (list, dict)):
         ev["Schedules"] = json.dumps(ev["Schedules"])
 
+    # A layout matching the auditorium's is stored as a reference (+ diff of the changed seats), not a copy
+    if ev["SeatLayout"] and ev["Auditorium"]:
+        ev.update(auditorium_layouts.reference(ev["Auditorium"], ev["SeatLayout"]))
+
     try:
         # Pre-process Poster if Base64
         # We need an ID to name the file. If we rely on gs.add_event to generate ID, we don't have it yet.
@@ -221,6 +244,7 @@ def add_event():
         
         ok = gs.add_event(ev)
         if ok:
+            schedule_index.refresh_event(ev.get("ID"))
             return jsonify({"status": "success"}), 201
         return jsonify({"status": "failed", "message": "Unknown error in google sheet append"}), 500
     except Exception as e:
@@ -234,6 +258,7 @@ def add_event():
 # UPDATE EVENT
 # ---------------------------
 @event_blueprint.route("/update/<event_id>", methods=["PUT"])
+@require_auth(role="admin")
 def update_event(event_id):
     data = request.json or {}
     updates = {}
@@ -252,10 +277,23 @@ def update_event(event_id):
             # Serialize if needed
             if key == "Schedules" and isinstance(val, (list, dict)):
                 val = json.dumps(val)
+            elif key == "SeatLayout":
+                val = compact_cell(val)
             updates[key] = val
 
+    if "SeatLayout" in updates:
+        # Same as add: reference the auditorium's layout where possible; clearing the layout clears the reference
+        current = event_catalog.get(event_id)
+        auditorium = updates.get("Auditorium") or (current.auditorium if current else "")
+        if updates["SeatLayout"] and auditorium:
+            updates.update(auditorium_layouts.reference(auditorium, updates["SeatLayout"]))
+        else:
+            updates.update({"LayoutRef": "", "LayoutDiff": ""})
+
     ok = gs.update_event(event_id, updates)
     if ok:
+        email_templates.invalidate_event(event_id)
+        schedule_index.refresh_event(event_id)
         return jsonify({"status": "success"}), 200
 
     return jsonify({"status": "failed", "message": "event not found"}), 404
@@ -265,9 +303,13 @@ def update_event(event_id):
 # DELETE EVENT
 # ---------------------------
 @event_blueprint.route("/delete/<event_id>", methods=["DELETE"])
+@require_auth(role="admin")
 def delete_event(event_id):
     ok = gs.delete_event(event_id)
     if ok:
+        seat_reservations.forget_event(event_id)
+        email_templates.invalidate_event(event_id)
+        schedule_index.remove_event(event_id)
         return jsonify({"status": "success"}), 200
     return jsonify({"status": "failed", "message": "event not found"}), 404
 
@@ -286,86 +328,25 @@ def check_conflict():
         if not auditorium or not schedules:
             return jsonify({"status": "success", "conflicts": []}), 200
             
-        # Helper to parse time
-        from datetime import datetime, timedelta
-        
-        def parse_dt(d, t):
-            try:
-                # Basic cleanup
-                t = t.strip()
-                if len(t) == 5: t = t # HH:MM
-                # Check format
-                return datetime.strptime(f"{d} {t}", "%Y-%m-%d %H:%M")
-            except:
-                return None
-                
-        # Parse Duration
-        duration_minutes = 0
-        if duration_str:
-            try:
-                parts = duration_str.lower().split()
-                for p in parts:
-                    if 'h' in p:
-                        duration_minutes += int(p.replace('h','')) * 60
-                    elif 'm' in p:
-                        duration_minutes += int(p.replace('m',''))
-            except:
-                pass
-                
-        # Default duration if not provided (e.g. 3 hours)
-        if duration_minutes == 0:
-            duration_minutes = 180 
+        from datetime import timedelta
+
+        # Same parsing (and 3 hour default) as the stored events' Duration
+        duration_minutes = parse_duration(duration_str)
             
-        # 1. Get All Events
-        all_events = gs.get_events()
+        # Existing events are kept pre-parsed in a per-auditorium interval index
         conflicts = []
-        
         for req_slot in schedules:
-            req_start = parse_dt(req_slot.get("Date"), req_slot.get("Time"))
+            req_start = parse_slot(req_slot.get("Date"), req_slot.get("Time"))
             if not req_start: continue
             req_end = req_start + timedelta(minutes=duration_minutes)
-            
-            for ev in all_events:
-                if ev.get("ID") == exclude_event_id: continue
-                if ev.get("Auditorium") != auditorium: continue
-                
-                # Existing event schedules
-                ev_schedules = []
-                if ev.get("Schedules"):
-                    try:
-                        ev_schedules = json.loads(ev.get("Schedules"))
-                    except:
-                        pass
-                
-                if not ev_schedules:
-                    ev_schedules = [{"Date": ev.get("Date"), "Time": ev.get("Time")}]
-                
-                # Existing Duration
-                ev_dur_mins = 180 
-                if ev.get("Duration"):
-                    try:
-                        d_str = ev.get("Duration").lower()
-                        dm = 0
-                        for p in d_str.split():
-                            if 'h' in p: dm += int(p.replace('h','')) * 60
-                            elif 'm' in p: dm += int(p.replace('m',''))
-                        if dm > 0: ev_dur_mins = dm
-                    except:
-                        pass
-                
-                for ev_slot in ev_schedules:
-                    ev_start = parse_dt(ev_slot.get("Date"), ev_slot.get("Time"))
-                    if not ev_start: continue
-                    ev_end = ev_start + timedelta(minutes=ev_dur_mins)
-                    
-                    # Overlap logic: StartA < EndB AND StartB < EndA
-                    if req_start < ev_end and ev_start < req_end:
-                        conflicts.append({
-                            "Date": req_slot.get("Date"),
-                            "Time": req_slot.get("Time"),
-                            "Reason": f"Booked by '{ev.get('Name')}'"
-                        })
-                        break 
+
+            # Overlap logic: StartA < EndB AND StartB < EndA
+            for _, name in schedule_index.conflicts(auditorium, req_start, req_end, exclude_event_id):
+                conflicts.append({
+                    "Date": req_slot.get("Date"),
+                    "Time": req_slot.get("Time"),
+                    "Reason": f"Booked by '{name}'"
+                })
         
         return jsonify({"status": "success", "conflicts": conflicts}), 200
     except Exception as e:
@@ -377,6 +358,7 @@ def check_conflict():
 # SET EVENT VISIBILITY
 # ---------------------------
 @event_blueprint.route("/visibility/<event_id>", methods=["PUT"])
+@require_auth(role="admin")
 def set_visibility(event_id):
     data = request.json or {}
     flag = data.get("visibility", "visible")
@@ -392,6 +374,7 @@ def set_visibility(event_id):
 # TOGGLE FEEDBACK LINK
 # ---------------------------
 @event_blueprint.route("/feedback/<event_id>", methods=["PUT"])
+@require_auth(role="admin")
 def toggle_feedback(event_id):
     data = request.json or {}
     enabled = data.get("FeedbackEnabled", "false")
@@ -403,6 +386,54 @@ def toggle_feedback(event_id):
     return jsonify({"status": "failed", "message": "event not found"}), 404
 
 
+# ---------------------------
+# BROADCAST REMINDER TO ATTENDEES
+# ---------------------------
+@event_blueprint.route("/<event_id>/broadcast", methods=["POST"])
+@require_auth(role="admin")
+def start_broadcast(event_id):
+    """Queues a reminder email for every booking of the event (pass jobId to resume a job)"""
+    data = request.json or {}
+    job = broadcasts.start(
+        event_id,
+        message=data.get("message", ""),
+        subject=data.get("subject") or None,
+        job_id=data.get("jobId") or None
+    )
+    if not job:
+        return jsonify({"status": "failed", "message": "job not found"}), 404
+    return jsonify({"status": "success", "data": job}), 202
+
+
+@event_blueprint.route("/<event_id>/broadcast/<job_id>", methods=["GET"])
+@require_auth(role="admin")
+def broadcast_progress(event_id, job_id):
+    job = broadcasts.progress(job_id)
+    if not job or job["event_id"] != str(event_id):
+        return jsonify({"status": "failed", "message": "job not found"}), 404
+    return jsonify({"status": "success", "data": job}), 200
+
+
+# ---------------------------
+# LIVE SEAT AVAILABILITY
+# ---------------------------
+@event_blueprint.route("/<event_id>/availability", methods=["GET"])
+def seat_availability_for_event(event_id):
+    """Decoded layout + occupancy bitmap; send If-None-Match with the last ETag to get a 304 while nothing changed"""
+    snap = seat_availability.snapshot(event_id)
+    if snap is None:
+        return jsonify({"status": "failed", "message": "event not found"}), 404
+    etag, body = snap
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # always revalidate, never reuse blindly
+
+    sent = [t.strip().replace("W/", "", 1) for t in request.headers.get("If-None-Match", "").split(",")]
+    if etag in sent or "*" in sent:
+        return "", 304, headers
+    resp = jsonify({"status": "success", "data": body})
+    resp.headers.update(headers)
+    return resp, 200
+
+
 # ---------------------------
 # GET SPEAKERS
 # ---------------------------
@@ -1,5 +1,10 @@
 from flask import Blueprint, jsonify, request
 from backend.services.google_sheets import gs
+from backend.services.login_index import login_index, clean_phone
+from backend.services.passwords import password_verifier, hash_password, needs_rehash
+from backend.services.auth import issue_token, require_auth, current_user
+from backend.services.lookups import current_lookups
+from backend.services.listing import list_params_present, query_rows, select_fields
 
 print("✅ users.py module loaded")
 
@@ -12,7 +17,6 @@ user_blueprint = Blueprint("users", __name__)
 @user_blueprint.route("/login", methods=["POST"])
 def login():
     data = request.json or {}
-    print(f"DEBUG: Login Attempt received: {data}")
 
     role = str(data.get("role", "user")).lower()
     login_id = str(data.get("loginId") or data.get("usn") or data.get("phone") or "").strip()
@@ -21,78 +25,69 @@ def login():
     if not login_id or not password:
         return jsonify({"status": "failed", "message": "Login ID and Password required"}), 400
 
-    users = gs.get_users()
-    print(f"DEBUG: Checking against {len(users)} users in sheet")
-
-    # Helper to clean phone numbers:
-    # - Remove .0 suffix from Google Sheets numeric storage (e.g., "7349107584.0" -> "7349107584")
-    # - Strip leading zeros (Google Sheets drops them for numeric cells, e.g., "0011223344" -> "11223344")
-    def clean_phone(val):
-        s = str(val).split('.')[0].strip()
-        s = s.lstrip('0') or '0'  # strip leading zeros, keep '0' if all zeros
-        return s
-
-    print(f"DEBUG: Trying to match loginId='{login_id}' (cleaned phone='{clean_phone(login_id)}') role='{role}'")
-    for u in users:
-        u_usn = str(u.get("USN", "")).strip().lower()
-        u_phone = clean_phone(u.get("Phone", ""))
-        u_name = str(u.get("Name", "")).strip().lower()
-        u_role = str(u.get("Role", "user")).lower()
-        u_pass = str(u.get("Password", "")).strip()
-
-        print(f"  Checking: USN='{u_usn}' Phone='{u_phone}' Name='{u_name}' Role='{u_role}'")
-
-        # Admin login by USN
-        if role == "admin" and u_usn == login_id.lower():
-            pass
-        # User login by USN, Phone, or Name
-        elif role == "user" and (
-            u_usn == login_id.lower() or
-            u_phone == clean_phone(login_id) or
-            u_name == login_id.lower()
-        ):
-            pass
-        else:
-            continue
-
-        # Found user, now check password and status
-        print(f"DEBUG: Found matching user profile: {u_usn or u_phone}")
-
-        if str(u.get("Suspended", "")).lower() == "yes":
-            print(f"DEBUG: Login failed - Account suspended for {login_id}")
-            return jsonify({"status": "failed", "message": "Account suspended"}), 403
-
-        if u_pass != password:
-            print(f"DEBUG: Login failed - Password mismatch for {login_id}")
-            return jsonify({"status": "failed", "message": "Incorrect password"}), 401
-
-        # Success
-        user_copy = u.copy()
-        user_copy.pop("Password", None)
-        user_copy["role"] = u_role
-
-        if u_role == "admin":
-             print(f"DEBUG: Login successful for Admin: {login_id}")
-        else:
-             print(f"DEBUG: Login successful for User: {u.get('Name', 'Unknown')} ({u_phone})")
-        
-        return jsonify({
-            "status": "success",
-            "message": "Login successful",
-            "user": user_copy
-        }), 200
-
-    print(f"DEBUG: Login failed - User not found for {login_id} (Role: {role})")
-    return jsonify({"status": "failed", "message": "User not found"}), 404
+    # O(1) lookup by USN / phone / name instead of scanning every user row
+    u = login_index.find(login_id, role)
+    if u is None:
+        print(f"DEBUG: Login failed - User not found for {login_id} (Role: {role})")
+        return jsonify({"status": "failed", "message": "User not found"}), 404
+
+    u_usn = str(u.get("USN", "")).strip().lower()
+    u_phone = clean_phone(u.get("Phone", ""))
+    u_role = str(u.get("Role", "user")).lower()
+
+    # Found user, now check password and status
+    print(f"DEBUG: Found matching user profile: {u_usn or u_phone}")
+
+    if str(u.get("Suspended", "")).lower() == "yes":
+        print(f"DEBUG: Login failed - Account suspended for {login_id}")
+        return jsonify({"status": "failed", "message": "Account suspended"}), 403
+
+    stored_pass = u.get("Password", "")
+    if not password_verifier.verify(stored_pass, password):
+        print(f"DEBUG: Login failed - Password mismatch for {login_id}")
+        return jsonify({"status": "failed", "message": "Incorrect password"}), 401
+
+    # Upgrade-on-login: legacy plaintext / weaker hashes are re-hashed now that we know the password
+    if needs_rehash(stored_pass) and u_usn:
+        try:
+            gs.update_user(u.get("USN"), {"Password": hash_password(password)})
+        except Exception as e:
+            print(f"⚠️ Password upgrade failed for {u_usn}: {e}")
+
+    # Success
+    user_copy = u.copy()
+    user_copy.pop("Password", None)
+    user_copy["role"] = u_role
+
+    if u_role == "admin":
+         print(f"DEBUG: Login successful for Admin: {login_id}")
+    else:
+         print(f"DEBUG: Login successful for User: {u.get('Name', 'Unknown')} ({u_phone})")
+    
+    return jsonify({
+        "status": "success",
+        "message": "Login successful",
+        "user": user_copy,
+        # send back as "Authorization: Bearer <token>"
+        "token": issue_token(u.get("USN", ""), u_role)
+    }), 200
 
 
 # ------------------------------------------------------
 # LIST USERS
 # ------------------------------------------------------
 @user_blueprint.route("/", methods=["GET"])
+@require_auth(role="admin")
 def list_users():
-    users = gs.get_users()
-    return jsonify({"status": "success", "users": users}), 200
+    if not list_params_present(request.args):
+        # password hashes never leave the server
+        users = [{k: v for k, v in u.items() if k != "Password"} for u in gs.get_users()]
+        return jsonify({"status": "success", "users": users}), 200
+
+    # ?role=&q=&limit=&offset=&fields=
+    users, meta = query_rows(gs.get_users(), request.args, search_fields=("USN", "Name", "Email", "Phone", "College"))
+    users = select_fields(users, request.args, exclude=("Password",))
+    return jsonify({"status": "success", "users": users, "meta": meta}), 200
 
 
 # ------------------------------------------------------
@@ -101,7 +96,7 @@ def list_users():
 @user_blueprint.route("/add", methods=["POST"])
 def add_user():
     raw_data = request.json or {}
-    print(f"DEBUG: Receiving /users/add payload: {raw_data}") # SERVER LOG
+    print(f"DEBUG: Receiving /users/add payload for USN: {raw_data.get('USN') or raw_data.get('usn')}") # SERVER LOG
     
     # Helper to get value regardless of casing (e.g. 'name' or 'Name')
     def get_val(key):
@@ -117,6 +112,9 @@ def add_user():
                 return v
         return ""
 
+    # Passwords are stored hashed (see services/passwords.py)
+    raw_password = str(get_val("Password")).strip()
+
     # Explicitly map to primary headers (A-J)
     normalized_data = {
         "Name": get_val("Name"),
@@ -126,12 +124,12 @@ def add_user():
         "Branch": get_val("Branch"),
         "Sem": get_val("Sem"),
         "Phone": get_val("Phone"),
-        "Password": get_val("Password"),
+        "Password": hash_password(raw_password) if raw_password else "",
         "Role": "user",
         "Suspended": "No"
     }
     
-    print(f"DEBUG: Normalized data for Sheet: {normalized_data}")
+    print(f"DEBUG: Normalized data for Sheet: {dict(normalized_data, Password='***')}")
     
     ok = gs.add_user(normalized_data)
     if ok:
@@ -146,11 +144,12 @@ def add_user():
 # UPDATE ROLE
 # ------------------------------------------------------
 @user_blueprint.route("/role", methods=["POST"])
+@require_auth(role="admin")
 def update_role():
     data = request.json or {}
     usn = data.get("usn")
     role = data.get("role")
-    admin_usn = data.get("adminUsn", "")
+    admin_usn = current_user()["usn"]
 
     if not usn or not role:
         return jsonify({"status": "failed", "message": "usn and role required"}), 400
@@ -169,10 +168,11 @@ def update_role():
 # SUSPEND USER
 # ------------------------------------------------------
 @user_blueprint.route("/suspend", methods=["POST"])
+@require_auth(role="admin")
 def suspend_user():
     data = request.json or {}
     usn = data.get("usn")
-    admin_usn = data.get("adminUsn", "")
+    admin_usn = current_user()["usn"]
 
     if not usn:
         return jsonify({"status": "failed", "message": "usn required"}), 400
@@ -191,6 +191,7 @@ def suspend_user():
 # UNSUSPEND USER
 # ------------------------------------------------------
 @user_blueprint.route("/unsuspend", methods=["POST"])
+@require_auth(role="admin")
 def unsuspend_user():
     data = request.json or {}
     usn = data.get("usn")
@@ -209,10 +210,11 @@ def unsuspend_user():
 # DELETE USER
 # ------------------------------------------------------
 @user_blueprint.route("/delete", methods=["POST"])
+@require_auth(role="admin")
 def delete_user():
     data = request.json or {}
     usn = data.get("usn")
-    admin_usn = data.get("adminUsn", "")
+    admin_usn = current_user()["usn"]
 
     if not usn:
         return jsonify({"status": "failed", "message": "usn required"}), 400
@@ -231,12 +233,12 @@ def delete_user():
 # GET USER BY USN
 # ------------------------------------------------------
 @user_blueprint.route("/<usn>", methods=["GET"])
+@require_auth(self_param="usn")
 def get_user(usn):
-    rows = gs.get_users()
-    for r in rows:
-        if str(r.get("USN", "")).lower() == usn.lower():
-            user = r.copy()
-            user.pop("Password", None)
-            return jsonify({"status": "success", "user": user}), 200
+    found = current_lookups().user(usn)
+    if found:
+        user = found.copy()
+        user.pop("Password", None)
+        return jsonify({"status": "success", "user": user}), 200
 
     return jsonify({"status": "failed", "message": "user not found"}), 404
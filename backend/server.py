@@ -3,25 +3,15 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from flask import Flask, jsonify
-from flask_cors import CORS
+from backend.cors import init_cors
 from backend.routes.users import user_blueprint
 from backend.routes.bookings import booking_blueprint
 from backend.routes.events import event_blueprint
 from backend.routes.attendance import attendance_bp
+from backend.services.mail_outbox import ensure_in_process_drainer
 
 app = Flask(__name__)
-ALLOWED_ORIGINS = [
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-    "https://turbo007.pythonanywhere.com",
-    "https://book-evntz.vercel.app",
-    "https://book-evntz-pw1umm1v3-chetans-projects-c8f1a790.vercel.app",
-    "https://book-evntz-wjk3401u7-chetans-projects-c8f1a790.vercel.app",
-]
-
-VERCEL_PREVIEW_REGEX = r"https://book-evntz.*\.vercel\.app"
-
-CORS(app, supports_credentials=True, resources={r"/*": {"origins": ALLOWED_ORIGINS + [VERCEL_PREVIEW_REGEX]}})
+init_cors(app)
 
 # ✅ Register blueprints with error handling
 try:
@@ -48,6 +38,9 @@ try:
 except Exception as e:
     print(f"❌ Failed to register attendance_bp: {e}")
 
+# ✅ Start the mail outbox drainer (sends mail still pending from a previous run)
+ensure_in_process_drainer()
+
 @app.route("/api/debug/routes")
 def list_routes():
     import urllib
@@ -0,0 +1,183 @@
+# backend/services/auditorium_layouts.py
+import threading
+from backend.config import SHEET_AUDITORIUMS
+from backend.services.google_sheets import gs
+from backend.services.seat_layout import decode_layout, encode_layout, CELL_VALUES, BOOKABLE_CELLS
+
+# Events point at their auditorium's layout instead of carrying a copy:
+#   LayoutRef  = "Hallama Auditorium"     follow the auditorium's current layout
+#              = "Hallama Auditorium@3"   pinned to version 3 (used with an override)
+#   LayoutDiff = "4:21=3,4:22=3"          per-event changes, "row:col=cell", on top of the referenced layout
+# An event's own SeatLayout (legacy copies, layouts of another size) still wins over the reference.
+
+
+def parse_ref(ref):
+    """'Name@3' -> ('Name', 3); 'Name' -> ('Name', None)"""
+    name, sep, version = str(ref or "").strip().rpartition("@")
+    if sep and version.isdigit():
+        return name.strip(), int(version)
+    return str(ref or "").strip(), None
+
+
+def format_ref(name, version=None):
+    return name if version is None else f"{name}@{version}"
+
+
+def _cell(layout, r, c):
+    # legacy JSON grids can be ragged or shorter than rows x cols; missing cells are gaps
+    grid = layout["grid"]
+    return grid[r][c] if r < len(grid) and c < len(grid[r]) else 0
+
+
+def make_diff(base, layout):
+    """'row:col=cell' changes turning base into layout, None if the sizes differ"""
+    if (base["rows"], base["cols"]) != (layout["rows"], layout["cols"]):
+        return None
+    changes = []
+    for r in range(base["rows"]):
+        for c in range(base["cols"]):
+            new = _cell(layout, r, c)
+            if new != _cell(base, r, c):
+                changes.append(f"{r}:{c}={new}")
+    return ",".join(changes)
+
+
+def apply_diff(layout, diff):
+    """Copy of layout (padded to rows x cols) with the diff applied"""
+    if not diff:
+        return layout
+    grid = [list(row) + [0] * (layout["cols"] - len(row)) for row in layout["grid"]]
+    grid += [[0] * layout["cols"] for _ in range(layout["rows"] - len(grid))]
+    for change in str(diff).split(","):
+        pos, _, cell = change.partition("=")
+        r, _, c = pos.partition(":")
+        r, c, cell = int(r), int(c), int(cell)
+        if not (0 <= r < layout["rows"] and 0 <= c < layout["cols"]) or cell not in CELL_VALUES:
+            raise ValueError(f"layout diff entry {change!r} is out of range")
+        grid[r][c] = cell
+    return {"rows": layout["rows"], "cols": layout["cols"], "grid": grid}
+
+
+class ResolvedLayout:
+    __slots__ = ("ref", "version", "diff", "layout", "cell", "seat_count")
+
+    def __init__(self, ref, version, diff, layout):
+        self.ref = ref
+        self.version = version
+        self.diff = diff
+        self.layout = layout
+        # what the seat picker gets in SeatLayout: the compact encoding
+        self.cell = encode_layout(layout)
+        self.seat_count = sum(1 for row in layout["grid"] for cell in row if cell in BOOKABLE_CELLS)
+
+
+class AuditoriumLayouts:
+    """
+    Resolves layout references to decoded layouts.
+
+    The referenced version is looked up on the (tiny, cached) Auditoriums
+    sheet, or in AuditoriumLayouts for older versions, and the decoded,
+    diffed result is cached by (name, version, diff, layout text), so a
+    resolve costs a short scan and a dict hit. References that follow the
+    current version pick up a new auditorium layout with that single row
+    update; no event row is touched.
+    """
+
+    def __init__(self, store, max_entries=1024):
+        self.store = store
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._resolved = {}  # (name lower, version, diff, cell) -> ResolvedLayout or None
+
+    # ---------- Auditorium rows ----------
+    def current(self, name):
+        """(version, SeatLayout cell) of an auditorium, (None, None) if unknown or without a layout"""
+        key = str(name or "").strip().lower()
+        for a in self.store.read_range(SHEET_AUDITORIUMS):
+            if str(a.get("Name", "")).strip().lower() == key:
+                if not a.get("SeatLayout"):
+                    return None, None
+                return int(a.get("LayoutVersion") or 0), a.get("SeatLayout")
+        return None, None
+
+    def _version_cell(self, name, version):
+        current_version, cell = self.current(name)
+        if version is None or version == current_version:
+            return current_version, cell
+        key = str(name).strip().lower()
+        for v in self.store.get_layout_versions():
+            if str(v.get("Auditorium", "")).strip().lower() == key and str(v.get("Version")) == str(version):
+                return version, v.get("SeatLayout")
+        return None, None
+
+    # ---------- Resolution ----------
+    def resolve(self, ref, diff=""):
+        """ResolvedLayout for a LayoutRef (+ LayoutDiff), None if it can't be resolved"""
+        name, version = parse_ref(ref)
+        if not name:
+            return None
+        version, cell = self._version_cell(name, version)
+        if not cell:
+            return None
+        diff = str(diff or "").strip()
+        # the cell text is part of the key, so a layout edited without a version bump still misses
+        key = (name.lower(), version, diff, cell)
+        with self._lock:
+            if key in self._resolved:
+                return self._resolved[key]
+
+        resolved = None
+        base = decode_layout(cell)
+        if base:
+            try:
+                resolved = ResolvedLayout(format_ref(name, version), version, diff, apply_diff(base, diff))
+            except ValueError as e:
+                print(f"⚠️ Bad layout diff for {ref}: {e}")
+                resolved = ResolvedLayout(format_ref(name, version), version, "", base)
+
+        with self._lock:
+            if len(self._resolved) >= self.max_entries:
+                self._resolved.clear()
+            self._resolved[key] = resolved
+        return resolved
+
+    def reference(self, auditorium, seat_layout):
+        """
+        Columns to store for an event layout in `auditorium`:
+        {"LayoutRef", "LayoutDiff", "SeatLayout"}. Same as the auditorium ->
+        plain reference; same size -> pinned reference + diff; anything else
+        (no auditorium layout, another size) -> the event keeps its own copy.
+        """
+        layout = decode_layout(seat_layout)
+        version, cell = self.current(auditorium)
+        base = decode_layout(cell)
+        if not layout or not base:
+            return {"LayoutRef": "", "LayoutDiff": "", "SeatLayout": seat_layout or ""}
+        diff = make_diff(base, layout)
+        if diff is None:
+            return {"LayoutRef": "", "LayoutDiff": "", "SeatLayout": seat_layout}
+        if not diff:
+            return {"LayoutRef": auditorium, "LayoutDiff": "", "SeatLayout": ""}
+        return {"LayoutRef": format_ref(auditorium, version), "LayoutDiff": diff, "SeatLayout": ""}
+
+    def for_event(self, ev):
+        """ResolvedLayout of an event row without its own SeatLayout (LayoutRef, else its Auditorium)"""
+        ref = ev.get("LayoutRef") or ev.get("Auditorium")
+        return self.resolve(ref, ev.get("LayoutDiff", "")) if ref else None
+
+    def with_layouts(self, events):
+        """
+        Event rows as the frontend expects them: rows that reference a layout
+        get the resolved (compact) SeatLayout filled in on a copy.
+        """
+        out = []
+        for ev in events:
+            if ev.get("LayoutRef") and not ev.get("SeatLayout"):
+                resolved = self.for_event(ev)
+                if resolved:
+                    ev = {**ev, "SeatLayout": resolved.cell}
+            out.append(ev)
+        return out
+
+# single instance shared by the event routes and the Event model
+auditorium_layouts = AuditoriumLayouts(gs)
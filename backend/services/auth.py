@@ -0,0 +1,70 @@
+# backend/services/auth.py
+import os
+from functools import wraps
+from flask import g, jsonify, request
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from backend.config import SESSION_SECRET, SESSION_TTL, ALLOW_RANDOM_SESSION_SECRET
+
+if not SESSION_SECRET:
+    # a random key differs per worker and per restart: tokens would fail at random and everyone gets logged out
+    if not ALLOW_RANDOM_SESSION_SECRET:
+        raise RuntimeError("SESSION_SECRET is not set (set ALLOW_RANDOM_SESSION_SECRET=true for local development only)")
+    print("⚠️ SESSION_SECRET not set: using a random key, sessions won't survive restarts or span workers")
+
+# Tokens carry {"usn", "role"} and are checked with the secret alone, so
+# authorizing a request never touches the Users sheet. The flip side: a
+# role change or suspension applies to tokens issued after it (or once the
+# old token expires after SESSION_TTL).
+_serializer = URLSafeTimedSerializer(SESSION_SECRET or os.urandom(32).hex(), salt="bookevntz-session")
+
+
+def issue_token(usn, role):
+    return _serializer.dumps({"usn": str(usn or "").strip(), "role": str(role or "user").lower()})
+
+
+def read_token(token):
+    """Claims dict for a valid token, None if it is missing, forged or expired"""
+    if not token:
+        return None
+    try:
+        return _serializer.loads(token, max_age=SESSION_TTL)
+    except (SignatureExpired, BadSignature):
+        return None
+
+
+def _bearer_token():
+    header = request.headers.get("Authorization", "")
+    if header.lower().startswith("bearer "):
+        return header[7:].strip()
+    return None
+
+
+def current_user():
+    """Claims of the authenticated caller (set by require_auth)"""
+    return g.get("auth")
+
+
+def require_auth(role=None, self_param=None):
+    """
+    Route decorator: requires a valid session token.
+      role="admin"     -> only admins
+      self_param="usn" -> the caller must be the user named by that URL
+                          parameter (admins may access anyone)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            claims = read_token(_bearer_token())
+            if not claims:
+                return jsonify({"status": "failed", "message": "login required"}), 401
+            is_admin = claims.get("role") == "admin"
+            if role == "admin" and not is_admin:
+                return jsonify({"status": "failed", "message": "admin only"}), 403
+            if self_param and not is_admin:
+                target = str(kwargs.get(self_param, "")).strip().lower()
+                if target != claims.get("usn", "").lower():
+                    return jsonify({"status": "failed", "message": "forbidden"}), 403
+            g.auth = claims
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,140 @@
+# backend/services/broadcasts.py
+import logging
+import threading
+import uuid
+from backend.config import SHEET_BOOKINGS, MAIL_OUTBOX_BATCH
+from backend.services.google_sheets import gs
+from backend.services.mail_outbox import mail_outbox, ensure_in_process_drainer, booking_key
+from backend.services.email_service import EmailService
+from backend.services.email_templates import email_templates, format_schedule
+from backend.services.event_models import event_catalog
+
+SKIP_STATUSES = ("cancelled", "canceled", "rejected")
+
+logger = logging.getLogger(__name__)
+
+
+def _key_prefix(job_id):
+    return f"reminder:{job_id}:"
+
+
+class BroadcastRunner:
+    """
+    Admin-triggered reminder emails for every booking of an event.
+
+    A run streams the Bookings sheet, renders each reminder from the
+    per-event template and writes it to the mail outbox in batches; the
+    outbox drainer then sends them through the pooled, rate-limited
+    dispatcher. Every message has the dedupe key
+    reminder:<job>:<BookingID>:<Timestamp> (see booking_key), so restarting
+    an interrupted job walks the event's bookings again and the outbox
+    ignores the ones already queued: nobody is emailed twice, and bookings
+    added or deleted in the meantime don't shift anyone out.
+    The job row's cursor counts the bookings handled by the current run
+    (out of total, known before the first message is queued).
+    """
+
+    def __init__(self, store, outbox, batch_size=MAIL_OUTBOX_BATCH):
+        self.store = store
+        self.outbox = outbox
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._running = {}  # job_id -> thread
+
+    def start(self, event_id, message="", subject=None, job_id=None):
+        """Starts a new job, or resumes job_id. Returns the job record (None if job_id is unknown)."""
+        if job_id:
+            job = self.outbox.get_job(job_id)
+            if not job or job["event_id"] != str(event_id):
+                return None
+        else:
+            job = self.outbox.create_job(uuid.uuid4().hex[:12], event_id, subject, message)
+        job_id = job["job_id"]
+
+        with self._lock:
+            if job_id in self._running and self._running[job_id].is_alive():
+                return job
+            self.outbox.update_job(job_id, status="running", last_error=None)
+            t = threading.Thread(target=self._run, args=(job_id,), name=f"broadcast-{job_id}", daemon=True)
+            self._running[job_id] = t
+            t.start()
+        return self.outbox.get_job(job_id)
+
+    def progress(self, job_id):
+        job = self.outbox.get_job(job_id)
+        if not job:
+            return None
+        job["delivery"] = self.outbox.stats(key_prefix=_key_prefix(job_id))
+        return job
+
+    # ---------- Worker ----------
+    def _run(self, job_id):
+        job = self.outbox.get_job(job_id)
+        event_id = job["event_id"]
+        try:
+            # Nothing queued without credentials could ever be sent
+            if not EmailService.credentials_ok():
+                self.outbox.update_job(job_id, status="failed", last_error="email credentials not set")
+                return
+
+            ev = event_catalog.get(event_id)
+            if not ev:
+                self.outbox.update_job(job_id, status="failed", last_error="event not found")
+                return
+
+            users = {str(u.get("USN", "")).strip().lower(): u for u in self.store.get_users()}
+            subject_tpl, body_tpl = email_templates.reminder_templates(
+                {"event_id": event_id, "event_name": ev.get("Name", ""), "poster": ev.get("Poster", "")},
+                message=job["message"], subject=job["subject"]
+            )
+            prefix = _key_prefix(job_id)
+
+            bookings = [b for _, b in self.store.iter_rows(SHEET_BOOKINGS)
+                        if str(b.get("EventID", "")).strip() == event_id]
+            total = len(bookings)
+            # enqueued only grows (repeats are ignored by the outbox); skipped is recounted by this walk
+            position, enqueued, skipped = 0, job["enqueued"], 0
+            self.outbox.update_job(job_id, total=total, cursor=0, skipped=0)
+
+            batch = []
+            for b in bookings:
+                position += 1
+                user = users.get(str(b.get("USN", "")).strip().lower()) or {}
+                to_email = b.get("Email") or user.get("Email")
+                if not to_email or str(b.get("Status", "")).strip().lower() in SKIP_STATUSES:
+                    skipped += 1
+                else:
+                    date_str, time_str = format_schedule(b.get("Schedule", ""))
+                    values = email_templates.booking_values(user.get("Name", "Student"), {
+                        "venue": b.get("Auditorium"),
+                        "date": date_str,
+                        "time": time_str,
+                        "booking_id": b.get("BookingID"),
+                        "seats": b.get("Seats"),
+                        "qr_url": b.get("QR URL"),
+                    })
+                    batch.append((to_email, subject_tpl.render(values), body_tpl.render(values),
+                                  booking_key(prefix, b.get("BookingID"), b.get("Timestamp"))))
+
+                if len(batch) >= self.batch_size:
+                    enqueued += self.outbox.enqueue_many(batch)
+                    batch = []
+                    self.outbox.update_job(job_id, cursor=position, enqueued=enqueued, skipped=skipped)
+                    ensure_in_process_drainer()
+
+            if batch:
+                enqueued += self.outbox.enqueue_many(batch)
+            self.outbox.update_job(job_id, status="enqueued", cursor=position,
+                                   enqueued=enqueued, skipped=skipped)
+            ensure_in_process_drainer()
+            logger.info("Broadcast %s for event %s: %d queued, %d skipped",
+                        job_id, event_id, enqueued, skipped)
+        except Exception as e:
+            logger.exception("Broadcast %s failed", job_id)
+            self.outbox.update_job(job_id, status="failed", last_error=str(e)[:500])
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+
+# single instance shared by the event routes
+broadcasts = BroadcastRunner(gs, mail_outbox)
@@ -0,0 +1,274 @@
+# backend/services/email_templates.py
+import html
+import re
+import threading
+from datetime import datetime
+
+_SLOT = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class CompiledTemplate:
+    """
+    Template text split once into literal chunks and {{field}} slots.
+
+    render() is a single join over the pre-split parts. partial() fills
+    some of the slots and returns a new, shorter template, which is how the
+    per-event part of an email is rendered once and reused for every booking.
+    """
+    __slots__ = ("_parts", "fields")
+
+    def __init__(self, source=None, parts=None):
+        if parts is None:
+            # even positions: literal text, odd positions: field names
+            parts = _SLOT.split(source or "")
+        self._parts = parts
+        self.fields = frozenset(parts[1::2])
+
+    def partial(self, values):
+        parts = [self._parts[0]]
+        for i in range(1, len(self._parts), 2):
+            name, literal = self._parts[i], self._parts[i + 1]
+            if name in values:
+                parts[-1] += _text(values[name]) + literal
+            else:
+                parts.extend((name, literal))
+        return CompiledTemplate(parts=parts)
+
+    def render(self, values):
+        parts = self._parts
+        out = [parts[0]]
+        for i in range(1, len(parts), 2):
+            out.append(_text(values.get(parts[i])))
+            out.append(parts[i + 1])
+        return "".join(out)
+
+
+def _text(value):
+    # str() like the f-strings these templates replaced: a missing field still renders as "None"
+    return str(value)
+
+
+# ---------- Booking confirmation ----------
+CONFIRMATION_SUBJECT = "Booking Confirmed: {{event_name}} - {{booking_id}}"
+
+CONFIRMATION_HTML = """
+        <div style="font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; color: #333; max-width: 600px; margin: 0 auto; background-color: #ffffff; border: 1px solid #e0e0e0; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
+            
+            {{poster_html}}
+            
+            <div style="padding: 30px;">
+                <!-- Header with Green Animated-style Check -->
+                <div style="text-align: center; margin-bottom: 25px;">
+                    <div style="display: inline-block; background-color: #e8f5e9; border-radius: 50%; padding: 15px; margin-bottom: 10px;">
+                        <span style="font-size: 40px; color: #2e7d32; line-height: 1;">✅</span>
+                    </div>
+                    <h1 style="color: #2e7d32; margin: 0; font-size: 24px; font-weight: 700;">Booking Confirmed!</h1>
+                    <p style="color: #666; margin-top: 5px; font-size: 16px;">You are all set, {{first_name}}! 🎉</p>
+                </div>
+
+                <p style="font-size: 16px; line-height: 1.6; color: #444; text-align: center;">
+                    Thank you for booking with us. We are thrilled to have you! <br>
+                    Here is your official ticket for <strong>{{event_name}}</strong>.
+                </p>
+
+                <!-- Ticket Card -->
+                <div style="background-color: #f9f9f9; border: 1px solid #ddd; border-radius: 12px; padding: 20px; margin: 25px 0; position: relative;">
+                    <div style="border-left: 4px solid #2e7d32; padding-left: 15px;">
+                        <h3 style="margin: 0 0 15px 0; color: #000; font-size: 18px;">🎟️ Event Details</h3>
+                        
+                        <div style="margin-bottom: 10px;">
+                            <strong style="color: #555; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px;">Event</strong>
+                            <div style="font-size: 16px; font-weight: 600;">{{event_name}}</div>
+                        </div>
+
+                        <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Date</strong>
+                                <div style="font-size: 15px;">{{date}}</div>
+                            </div>
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Time</strong>
+                                <div style="font-size: 15px;">{{time}}</div>
+                            </div>
+                        </div>
+
+                        <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Venue</strong>
+                                <div style="font-size: 15px;">{{venue}}</div>
+                            </div>
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Seats</strong>
+                                <div style="font-size: 15px;">{{seats}}</div>
+                            </div>
+                        </div>
+
+                        <div style="margin-top: 15px; padding-top: 10px; border-top: 1px dashed #ccc;">
+                            <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Booking ID</strong>
+                            <div style="font-family: 'Courier New', monospace; font-size: 16px; letter-spacing: 1px; color: #333;">#{{booking_id}}</div>
+                        </div>
+                    </div>
+
+                    {{qr_html}}
+                    <div style="text-align: center; color: #888; font-size: 12px;">Scan this QR code at the entrance</div>
+                </div>
+
+                <div style="text-align: center; font-size: 14px; color: #666; margin-top: 30px;">
+                    <p>We hope you have a wonderful time at the event! ✨</p>
+                    <p>If you have any questions, feel free to reach out to the coordinators.</p>
+                </div>
+            </div>
+
+            <div style="background-color: #2e7d32; padding: 15px; text-align: center; color: white; font-size: 12px;">
+                © 2026 GM University Auditorium Management<br>
+                <a href="#" style="color: #a5d6a7; text-decoration: none;">View My Bookings</a>
+            </div>
+        </div>
+        """
+
+POSTER_HTML = '<img src="{poster}" alt="Event Banner" style="width: 100%; max-height: 200px; object-fit: cover; border-radius: 8px 8px 0 0; display: block;">'
+QR_HTML = '<div style="text-align: center; margin: 20px 0;"><img src="{qr_url}" alt="Ticket QR Code" style="width: 150px; height: 150px; border: 2px dashed #4CAF50; padding: 10px; border-radius: 8px;"></div>'
+
+# ---------- Event reminder ----------
+REMINDER_SUBJECT = "Reminder: {{event_name}} - {{date}} {{time}}"
+
+REMINDER_HTML = """
+        <div style="font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; color: #333; max-width: 600px; margin: 0 auto; background-color: #ffffff; border: 1px solid #e0e0e0; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
+
+            {{poster_html}}
+
+            <div style="padding: 30px;">
+                <div style="text-align: center; margin-bottom: 25px;">
+                    <h1 style="color: #2e7d32; margin: 0; font-size: 24px; font-weight: 700;">See you soon! ⏰</h1>
+                    <p style="color: #666; margin-top: 5px; font-size: 16px;">Hi {{first_name}}, this is a reminder for <strong>{{event_name}}</strong>.</p>
+                </div>
+
+                <p style="font-size: 16px; line-height: 1.6; color: #444; text-align: center;">{{message}}</p>
+
+                <div style="background-color: #f9f9f9; border: 1px solid #ddd; border-radius: 12px; padding: 20px; margin: 25px 0;">
+                    <div style="border-left: 4px solid #2e7d32; padding-left: 15px;">
+                        <div style="margin-bottom: 10px;"><strong style="color: #555; font-size: 12px; text-transform: uppercase;">When</strong>
+                            <div style="font-size: 15px;">{{date}} {{time}}</div></div>
+                        <div style="margin-bottom: 10px;"><strong style="color: #555; font-size: 12px; text-transform: uppercase;">Venue</strong>
+                            <div style="font-size: 15px;">{{venue}}</div></div>
+                        <div style="margin-bottom: 10px;"><strong style="color: #555; font-size: 12px; text-transform: uppercase;">Seats</strong>
+                            <div style="font-size: 15px;">{{seats}}</div></div>
+                        <div><strong style="color: #555; font-size: 12px; text-transform: uppercase;">Booking ID</strong>
+                            <div style="font-family: 'Courier New', monospace; font-size: 16px; letter-spacing: 1px;">#{{booking_id}}</div></div>
+                    </div>
+
+                    {{qr_html}}
+                    <div style="text-align: center; color: #888; font-size: 12px;">Show this QR code at the entrance</div>
+                </div>
+            </div>
+
+            <div style="background-color: #2e7d32; padding: 15px; text-align: center; color: white; font-size: 12px;">
+                © 2026 GM University Auditorium Management
+            </div>
+        </div>
+        """
+
+# Fields shared by every booking of an event; the rest is filled per message
+EVENT_FIELDS = ("event_name", "poster")
+
+
+def format_schedule(schedule):
+    """Booking 'Schedule' value -> (date, time) strings for emails"""
+    date_str, time_str = "TBA", ""
+    if schedule:
+        try:
+            # Try parsing ISO format (2026-02-21T10:36:00)
+            if "T" in schedule:
+                dt = datetime.fromisoformat(schedule)
+                date_str = dt.strftime("%a, %d %b %Y")  # Sat, 21 Feb 2026
+                time_str = dt.strftime("%I:%M %p")      # 10:36 AM
+            else:
+                # Fallback for old format "YYYY-MM-DD HH:MM"
+                parts = schedule.split(' ', 1)
+                date_str = parts[0]
+                if len(parts) > 1:
+                    time_str = parts[1]
+        except Exception:
+            date_str = schedule  # fallback
+    return date_str, time_str
+
+
+class EmailTemplates:
+    """
+    Compiled email templates with the per-event part cached by EventID.
+
+    The first email for an event renders the event name and poster into
+    the template; every later booking of that event only fills in its own
+    fields (name, seats, booking id, QR, schedule). The cached entry also
+    remembers the event values it was built from, so an event edited in
+    another worker is re-rendered on its next email even without an
+    explicit invalidate_event().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates = {
+            "confirmation": (CompiledTemplate(CONFIRMATION_SUBJECT), CompiledTemplate(CONFIRMATION_HTML)),
+            "reminder": (CompiledTemplate(REMINDER_SUBJECT), CompiledTemplate(REMINDER_HTML)),
+        }
+        self._events = {}  # (kind, event_id) -> (event values, subject template, body template)
+
+    def _event_values(self, details):
+        values = {f: details.get(f) for f in EVENT_FIELDS}
+        values["poster_html"] = POSTER_HTML.format(poster=values["poster"]) if values["poster"] else ""
+        return values
+
+    def _for_event(self, kind, details):
+        values = self._event_values(details)
+        key = (kind, str(details.get("event_id") or values["event_name"]))
+        cached = self._events.get(key)
+        if cached and cached[0] == values:
+            return cached[1], cached[2]
+        subject, body = (t.partial(values) for t in self._templates[kind])
+        with self._lock:
+            self._events[key] = (values, subject, body)
+        return subject, body
+
+    @staticmethod
+    def booking_values(user_name, booking_details):
+        """Per-booking template fields"""
+        qr_url = booking_details.get("qr_url")
+        return {
+            "first_name": (str(user_name or "").split() or [""])[0],
+            "date": booking_details.get("date"),
+            "time": booking_details.get("time"),
+            "venue": booking_details.get("venue"),
+            "seats": booking_details.get("seats"),
+            "booking_id": booking_details.get("booking_id"),
+            "qr_html": QR_HTML.format(qr_url=qr_url) if qr_url else "",
+        }
+
+    def render_confirmation(self, user_name, booking_details):
+        """Returns (subject, html) for a booking confirmation"""
+        subject, body = self._for_event("confirmation", booking_details)
+        values = self.booking_values(user_name, booking_details)
+        return subject.render(values), body.render(values)
+
+    def reminder_templates(self, event_details, message="", subject=None):
+        """
+        (subject, body) templates for one reminder run, with the event and
+        the admin's message already filled in. Render them per booking with
+        booking_values().
+        """
+        subject_tpl, body = self._for_event("reminder", event_details)
+        if subject:
+            subject_tpl = CompiledTemplate(subject).partial(self._event_values(event_details))
+        message_html = html.escape(str(message or "")).replace("\n", "<br>")
+        return subject_tpl, body.partial({"message": message_html})
+
+    def invalidate_event(self, event_id=None):
+        """Drops the cached fragments of one event (or all of them)"""
+        with self._lock:
+            if event_id is None:
+                self._events.clear()
+            else:
+                for key in [k for k in self._events if k[1] == str(event_id)]:
+                    self._events.pop(key, None)
+
+# single instance shared by EmailService and the event routes
+email_templates = EmailTemplates()
@@ -0,0 +1,264 @@
+# backend/services/event_models.py
+import json
+import threading
+from datetime import datetime, timedelta
+from backend.config import SHEET_EVENTS
+from backend.services.google_sheets import gs
+from backend.services.seat_layout import decode_layout, BOOKABLE_CELLS
+from backend.services.auditorium_layouts import auditorium_layouts
+
+DEFAULT_DURATION_MINUTES = 180
+
+_UNSET = object()
+
+
+# ---------- Cell parsers ----------
+def parse_slot(date, time):
+    """'YYYY-MM-DD' + 'HH:MM' -> datetime, None if either is missing or malformed"""
+    try:
+        return datetime.strptime(f"{date} {str(time).strip()}", "%Y-%m-%d %H:%M")
+    except Exception:
+        return None
+
+
+def parse_duration(text, default=DEFAULT_DURATION_MINUTES):
+    """'2h 30m' -> 150; anything unparseable or empty -> default"""
+    minutes = 0
+    try:
+        for p in str(text or "").lower().split():
+            if 'h' in p:
+                minutes += int(p.replace('h', '')) * 60
+            elif 'm' in p:
+                minutes += int(p.replace('m', ''))
+    except ValueError:
+        return default
+    return minutes or default
+
+
+def parse_people(text, comma_separated=False):
+    """Speakers/Coordinators cell -> list of {name, ...}; a bare name (or old comma list) is wrapped"""
+    if not text:
+        return []
+    if isinstance(text, list):
+        return text
+    try:
+        people = json.loads(text)
+        if isinstance(people, list):
+            return people
+    except ValueError:
+        pass
+    if comma_separated:
+        return [{"name": x.strip()} for x in str(text).split(",") if x.strip()]
+    return [{"name": str(text)}]
+
+
+def event_slots(ev):
+    """(start, end) of every schedule of an event row"""
+    schedules = []
+    if ev.get("Schedules"):
+        try:
+            schedules = json.loads(ev.get("Schedules"))
+        except Exception:
+            pass
+    if not schedules:
+        schedules = [{"Date": ev.get("Date"), "Time": ev.get("Time")}]
+
+    duration = timedelta(minutes=parse_duration(ev.get("Duration")))
+    slots = []
+    for s in schedules:
+        start = parse_slot(s.get("Date"), s.get("Time")) if isinstance(s, dict) else None
+        if start:
+            slots.append((start, start + duration))
+    return slots
+
+
+# ---------- Model ----------
+class Event:
+    """
+    Read-only view of one Events row with the JSON / free-text cells parsed.
+
+    Each derived value is parsed on first access and kept on the instance,
+    so an Event handed out by the catalog pays for a given cell once per
+    cache generation. get() reads the raw columns, so code written against
+    row dicts keeps working.
+    """
+
+    __slots__ = ("row", "id", "name", "auditorium",
+                 "_duration", "_slots", "_layout", "_seat_count", "_speakers", "_coordinators")
+
+    def __init__(self, row):
+        self.row = row
+        self.id = str(row.get("ID", "")).strip()
+        self.name = row.get("Name", "")
+        self.auditorium = row.get("Auditorium", "")
+        self._duration = self._slots = self._layout = self._seat_count = _UNSET
+        self._speakers = self._coordinators = _UNSET
+
+    def get(self, column, default=None):
+        return self.row.get(column, default)
+
+    def __getitem__(self, column):
+        return self.row[column]
+
+    def __repr__(self):
+        return f"<Event {self.id} {self.name!r}>"
+
+    # ---------- Schedule ----------
+    @property
+    def duration_minutes(self):
+        if self._duration is _UNSET:
+            self._duration = parse_duration(self.row.get("Duration"))
+        return self._duration
+
+    @property
+    def slots(self):
+        """[(start, end)] for every schedule, in the order stored"""
+        if self._slots is _UNSET:
+            self._slots = event_slots(self.row)
+        return self._slots
+
+    @property
+    def start(self):
+        return min((s for s, _ in self.slots), default=None)
+
+    @property
+    def end(self):
+        return max((e for _, e in self.slots), default=None)
+
+    # ---------- Seats ----------
+    def _resolved(self):
+        # events without their own SeatLayout use the auditorium's (LayoutRef + LayoutDiff);
+        # not kept here, the resolver's cache follows new auditorium versions
+        return auditorium_layouts.for_event(self.row)
+
+    @property
+    def layout(self):
+        if not self.row.get("SeatLayout"):
+            resolved = self._resolved()
+            return resolved.layout if resolved else None
+        if self._layout is _UNSET:
+            self._layout = decode_layout(self.row.get("SeatLayout"))
+        return self._layout
+
+    @property
+    def layout_cell(self):
+        """SeatLayout as shipped to the seat picker (compact or legacy JSON), "" without a layout"""
+        if not self.row.get("SeatLayout"):
+            resolved = self._resolved()
+            return resolved.cell if resolved else ""
+        return self.row.get("SeatLayout")
+
+    @property
+    def grid(self):
+        return self.layout["grid"] if self.layout else None
+
+    @property
+    def seat_count(self):
+        """Bookable seats in the layout (standard + VIP), 0 without a layout"""
+        if not self.row.get("SeatLayout"):
+            resolved = self._resolved()
+            return resolved.seat_count if resolved else 0
+        if self._seat_count is _UNSET:
+            grid = self.grid or []
+            self._seat_count = sum(1 for row in grid for cell in row if cell in BOOKABLE_CELLS)
+        return self._seat_count
+
+    # ---------- People ----------
+    @property
+    def speakers(self):
+        if self._speakers is _UNSET:
+            self._speakers = parse_people(self.row.get("Speakers"))
+        return self._speakers
+
+    @property
+    def coordinators(self):
+        if self._coordinators is _UNSET:
+            self._coordinators = parse_people(self.row.get("Coordinators"), comma_separated=True)
+        return self._coordinators
+
+
+class EventCatalog:
+    """
+    Event models for the rows of store.get_events(), looked up by ID.
+
+    Models are keyed by the row dict they wrap: both engines replace a
+    row's dict when they patch an update into the cache, so a changed row
+    simply gets a fresh model and unchanged rows keep their parsed values.
+    The ID map is rebuilt when the store's Events generation moves (rows
+    reloaded), checked against the live list on every hit, and rebuilt
+    once more on a stale position before get() gives up, so no route has
+    to invalidate it. An unknown ID returns None without a rebuild: the
+    map already covers the current rows, and /events/<id> is public.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._source = None
+        self._gen = None
+        self._count = 0
+        self._models = {}   # id(row) -> Event (the Event keeps the row alive)
+        self._by_id = {}    # event ID -> position in the events list
+
+    def _model(self, row):
+        # callers hold self._lock
+        model = self._models.get(id(row))
+        if model is None or model.row is not row:
+            model = self._models[id(row)] = Event(row)
+        return model
+
+    def _sync(self, force=False):
+        # callers hold self._lock
+        gen = self.store.generation(SHEET_EVENTS)  # read before the rows: they are at least this new
+        events = self.store.get_events()
+        if events is not self._source:
+            self._models = {}
+        if force or gen != self._gen or events is not self._source or len(events) < self._count:
+            self._by_id = {}
+            self._index_rows(events, 0)
+        elif len(events) > self._count:
+            self._index_rows(events, self._count)
+        if len(self._models) > 2 * len(events) + 16:
+            # models of rows replaced in place by cache patches
+            live = {id(r) for r in events}
+            self._models = {k: m for k, m in self._models.items() if k in live}
+        self._source = events
+        self._gen = gen
+        return events
+
+    def _index_rows(self, events, start):
+        for pos in range(start, len(events)):
+            key = str(events[pos].get("ID", "")).strip()
+            if key:
+                self._by_id.setdefault(key, pos)
+        self._count = len(events)
+
+    def model(self, row):
+        """Event for a row dict of the current events list"""
+        with self._lock:
+            return self._model(row)
+
+    def get(self, event_id):
+        """Event with this ID, None if there is none"""
+        key = str(event_id if event_id is not None else "").strip()
+        if not key:
+            return None
+        with self._lock:
+            for attempt in range(2):
+                events = self._sync(force=attempt > 0)
+                pos = self._by_id.get(key)
+                if pos is None:
+                    # unknown ID: _sync already rebuilt if the Events generation moved
+                    return None
+                if pos < len(events) and str(events[pos].get("ID", "")).strip() == key:
+                    return self._model(events[pos])
+                # stale position (rows deleted / replaced in place): rebuild once and retry
+            return None
+
+    def all(self):
+        """Every event, in sheet order"""
+        with self._lock:
+            return [self._model(row) for row in self._sync()]
+
+# single instance shared by the routes and services reading events
+event_catalog = EventCatalog(gs)
@@ -5,15 +5,18 @@ from backend.config import (
     get_google_credentials, SPREADSHEET_ID,
     SHEET_USERS, SHEET_EVENTS, SHEET_BOOKINGS,
     SHEET_SPEAKERS, SHEET_COORDINATORS, SHEET_ATTENDANCE,
-    SHEET_AUDITORIUMS
+    SHEET_AUDITORIUMS, STORAGE_BACKEND, SQLITE_PATH, SHEETS_SYNC_ENABLED,
+    CACHE_TTL_DEFAULT, CACHE_TTLS
 )
-from datetime import datetime
-import uuid
+from backend.services.storage import SheetStore
+import bisect
+import re
+import threading
 import time
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
 
-class GoogleSheets:
+class GoogleSheets(SheetStore):
     def __init__(self):
         # Use the centralized credentials helper
         creds_dict = get_google_credentials()
@@ -33,7 +36,14 @@ class GoogleSheets:
         self._ws_cache = {}
         self._data_cache = {}
         self._last_read = {}  # sheet_name -> timestamp
-        self.CACHE_TTL = 10    # 10 seconds cache
+        self._row_indexes = {}  # sheet_name -> {key_col: {normalized value: [row numbers]}}
+        self._header_cache = {}  # sheet_name -> header row
+        self._landed = {}  # sheet_name -> writes patched in while a fetch is in flight
+        self._generations = {}  # sheet_name -> bumped on every fill from the API
+        self._inflight = {}  # sheet_name -> threading.Event of the fetch in progress
+        self._cache_lock = threading.RLock()
+        self.CACHE_TTL = CACHE_TTL_DEFAULT
+        self.CACHE_TTLS = dict(CACHE_TTLS)  # per-sheet overrides, e.g. Events 60s, Bookings 5s
 
     # ---------- Generic helpers ----------
     def _worksheet(self, name):
@@ -43,45 +53,253 @@ class GoogleSheets:
         try:
             ws = self.sheet.worksheet(name)
             self._ws_cache[name] = ws
+            # Freshly resolved sheet: headers are re-read on the next write
+            self._header_cache.pop(name, None)
             return ws
         except gspread.exceptions.WorksheetNotFound:
             # Auto-create if missing (Generic fallback)
             # Default 1000 rows, 26 cols
             ws = self.sheet.add_worksheet(title=name, rows=1000, cols=26)
             self._ws_cache[name] = ws
+            self._header_cache[name] = []
             return ws
 
     def _headers(self, worksheet):
-        return worksheet.row_values(1)
+        """Header row, cached per worksheet so writes don't pay a row_values(1) round-trip"""
+        headers = self._header_cache.get(worksheet.title)
+        if headers is None:
+            headers = worksheet.row_values(1)
+            self._header_cache[worksheet.title] = headers
+        # callers extend this list during header expansion; only commit it once the sheet accepts it
+        return list(headers)
+
+    def _reload_headers(self, sheet_name):
+        self._header_cache.pop(sheet_name, None)
+
+    def _headers_for(self, worksheet, row_dict):
+        """
+        Header row to write row_dict against. A key the cached row doesn't have
+        may be a column someone else added since it was cached, so the row is
+        re-read before the write treats it as new (and expands the sheet).
+        """
+        cached = worksheet.title in self._header_cache
+        headers = self._headers(worksheet)
+        known = {h.lower() for h in headers}
+        if cached and any(k.lower() not in known for k in row_dict):
+            print(f"DEBUG: Unknown columns for {worksheet.title}, re-reading the header row")
+            self._reload_headers(worksheet.title)
+            headers = self._headers(worksheet)
+        return headers
 
     def _clear_cache(self, sheet_name):
         """Invalidates data cache for a specific sheet"""
-        if sheet_name in self._data_cache:
-            del self._data_cache[sheet_name]
-        if sheet_name in self._last_read:
-            del self._last_read[sheet_name]
+        with self._cache_lock:
+            if sheet_name in self._data_cache:
+                del self._data_cache[sheet_name]
+            if sheet_name in self._last_read:
+                del self._last_read[sheet_name]
+            self._row_indexes.pop(sheet_name, None)
+            # a fetch that started before this must not be trusted either
+            self._log_write(sheet_name, "clear")
+
+    def _ttl(self, sheet_name):
+        return self.CACHE_TTLS.get(sheet_name, self.CACHE_TTL)
+
+    # ---------- Incremental cache maintenance ----------
+    # Writes patch the cached rows (and their hash indexes) instead of
+    # dropping them, so the next read doesn't re-download the whole sheet.
+    # Anything that doesn't line up with the cache falls back to _clear_cache.
+
+    @staticmethod
+    def _appended_row_number(response):
+        """Sheet row written by ws.append_row, from the API's updatedRange (e.g. 'Bookings!A57:K57')"""
+        try:
+            updated_range = response["updates"]["updatedRange"]
+            return int(re.search(r"[A-Z]+(\d+)", updated_range.split("!")[-1]).group(1))
+        except Exception:
+            return None
+
+    def _log_write(self, sheet_name, op, row_number=None, record=None):
+        # callers hold self._cache_lock
+        landed = self._landed.get(sheet_name)
+        if landed is not None:
+            landed.append((op, row_number, record))
+
+    def _begin_patch(self, sheet_name, op, row_number=None, record=None):
+        # an in-flight fetch may have missed this write; it is re-applied to the fetched rows
+        self._log_write(sheet_name, op, row_number, record)
+        return self._data_cache.get(sheet_name)
+
+    @staticmethod
+    def _replay_writes(fetched, landed):
+        """
+        Re-applies writes that landed while `fetched` was downloading. Appends
+        and updates carry their sheet row, so they are placed whether or not
+        the fetch already saw them; returns False for anything that can't be
+        placed (deletes, invalidations).
+        """
+        for op, row_number, record in landed:
+            if op not in ("append", "update") or row_number is None:
+                return False
+            if not 2 <= row_number <= len(fetched) + 2 or (op == "update" and row_number == len(fetched) + 2):
+                return False
+            for h in record:
+                if fetched and h not in fetched[0]:
+                    for r in fetched:
+                        r.setdefault(h, "")
+            if row_number == len(fetched) + 2:
+                fetched.append(record)
+            else:
+                fetched[row_number - 2] = record
+        return True
+
+    def _patch_append(self, sheet_name, row_number, record):
+        with self._cache_lock:
+            data = self._begin_patch(sheet_name, "append", row_number, record)
+            if data is None:
+                return
+            if row_number != len(data) + 2:
+                # another writer got in between (or the response was unexpected)
+                self._clear_cache(sheet_name)
+                return
+            for h in record:
+                if data and h not in data[0]:
+                    for r in data:
+                        r.setdefault(h, "")
+            data.append(record)
+            for col, index in self._row_indexes.get(sheet_name, {}).items():
+                index.setdefault(self._index_key(record.get(col, "")), []).append(row_number)
+
+    def _patch_update(self, sheet_name, row_index, record):
+        with self._cache_lock:
+            data = self._begin_patch(sheet_name, "update", row_index, record)
+            if data is None:
+                return
+            if not 2 <= row_index < len(data) + 2:
+                self._clear_cache(sheet_name)
+                return
+            old = data[row_index - 2]
+            for h in record:
+                if h not in old:
+                    for r in data:
+                        r.setdefault(h, "")
+            for col, index in self._row_indexes.get(sheet_name, {}).items():
+                old_key = self._index_key(old.get(col, ""))
+                new_key = self._index_key(record.get(col, ""))
+                if old_key == new_key:
+                    continue
+                rows_for_key = index.get(old_key, [])
+                if row_index in rows_for_key:
+                    rows_for_key.remove(row_index)
+                    if not rows_for_key:
+                        del index[old_key]
+                bisect.insort(index.setdefault(new_key, []), row_index)
+            data[row_index - 2] = record
+
+    def _patch_delete(self, sheet_name, row_numbers):
+        with self._cache_lock:
+            data = self._begin_patch(sheet_name, "delete")
+            if data is None or not row_numbers:
+                return
+            if any(not 2 <= r < len(data) + 2 for r in row_numbers):
+                self._clear_cache(sheet_name)
+                return
+            for r in sorted(set(row_numbers), reverse=True):
+                del data[r - 2]
+            # every row below the deletion moved up; rebuild lazily on the next lookup
+            self._row_indexes.pop(sheet_name, None)
+
+    @staticmethod
+    def _index_key(value):
+        return str(value).strip().lower()
+
+    def _row_index(self, sheet_name, key_col_name, rows):
+        """Hash index of normalized key -> sheet row numbers, built once per cache fill"""
+        with self._cache_lock:
+            # rows may be an older fill than the cache holds now; don't mix the two
+            current = self._data_cache.get(sheet_name) is rows
+            sheet_indexes = self._row_indexes.setdefault(sheet_name, {}) if current else {}
+            index = sheet_indexes.get(key_col_name)
+            if index is None:
+                index = {}
+                for i, r in enumerate(rows, start=2):
+                    index.setdefault(self._index_key(r.get(key_col_name, "")), []).append(i)
+                sheet_indexes[key_col_name] = index
+            return index
 
     def read_range(self, sheet_name):
-        now = time.time()
-        # Return cached data if valid
-        if sheet_name in self._data_cache:
-            last_time = self._last_read.get(sheet_name, 0)
-            if now - last_time < self.CACHE_TTL:
+        """
+        Cached get_all_records(). Only one fetch per sheet runs at a time:
+        while it is in flight other callers get the stale copy, or wait for
+        it if there is nothing cached yet.
+        """
+        with self._cache_lock:
+            data = self._data_cache.get(sheet_name)
+            if data is not None and time.time() - self._last_read.get(sheet_name, 0) < self._ttl(sheet_name):
                 print(f"⚡ Cache Hit: {sheet_name}")
-                return self._data_cache[sheet_name]
-
+                return data
+
+            inflight = self._inflight.get(sheet_name)
+            leader = inflight is None
+            if leader:
+                inflight = threading.Event()
+                self._inflight[sheet_name] = inflight
+                self._landed[sheet_name] = []
+
+        if not leader:
+            if data is not None:
+                print(f"⚡ Stale Hit (refresh in progress): {sheet_name}")
+                return data
+            inflight.wait(timeout=60)
+            with self._cache_lock:
+                data = self._data_cache.get(sheet_name)
+            if data is not None:
+                return data
+            # The leading fetch failed or was invalidated; fetch directly
+            return self._fetch_records(sheet_name)
+
+        fetched = None
+        try:
+            fetched = self._fetch_records(sheet_name)
+        except Exception as e:
+            if data is not None:
+                print(f"⚠️ Refresh of {sheet_name} failed ({e}), serving stale data")
+                return data
+            raise
+        finally:
+            with self._cache_lock:
+                landed = self._landed.pop(sheet_name, [])
+                if fetched is not None:
+                    # Update cache (indexes belong to the previous fill). Writes that
+                    # landed meanwhile are re-applied; if one can't be, the rows are
+                    # still cached but count as expired, so the next read refreshes.
+                    replayed = self._replay_writes(fetched, landed)
+                    self._data_cache[sheet_name] = fetched
+                    self._last_read[sheet_name] = time.time() if replayed else 0
+                    self._row_indexes.pop(sheet_name, None)
+                    self._generations[sheet_name] = self._generations.get(sheet_name, 0) + 1
+                self._inflight.pop(sheet_name, None)
+            inflight.set()
+        return fetched
+
+    def generation(self, sheet_name):
+        return self._generations.get(sheet_name, 0)
+
+    def _fetch_records(self, sheet_name):
         print(f"🌐 API Fetch: {sheet_name}")
         ws = self._worksheet(sheet_name)
         data = ws.get_all_records()
-        
-        # Update cache
-        self._data_cache[sheet_name] = data
-        self._last_read[sheet_name] = now
+
+        # Someone edited the header row in the spreadsheet: drop the cached copy
+        cached_headers = self._header_cache.get(sheet_name)
+        if data and cached_headers is not None and [k for k in data[0].keys() if k] != [h for h in cached_headers if h]:
+            print(f"DEBUG: Header change detected in {sheet_name}, reloading headers")
+            self._reload_headers(sheet_name)
         return data
 
     def append_row(self, sheet_name, row_dict):
         ws = self._worksheet(sheet_name)
-        headers = self._headers(ws)
+        headers = self._headers_for(ws, row_dict)
         
         # --- CASE-INSENSITIVE HEADER MAPPING ---
         header_map = {h.lower(): h for h in headers}
@@ -103,6 +321,7 @@ class GoogleSheets:
                 print(f"DEBUG: Found new columns for {sheet_name}: {missing_headers}")
                 headers.extend(missing_headers)
                 ws.update("A1", [headers]) 
+                self._header_cache[sheet_name] = list(headers)
                 # Refresh header map
                 header_map = {h.lower(): h for h in headers}
         except Exception as e:
@@ -113,6 +332,7 @@ class GoogleSheets:
         
         # create row in same header order
         row = []
+        record = {}  # what get_all_records() would now return for this row
         for h in headers:
             # Try exact match first, then case-insensitive
             val = row_dict.get(h)
@@ -130,14 +350,15 @@ class GoogleSheets:
                 print(f"WARNING: Truncating column '{h}' (len {len(val_str)}) to avoid API crash.")
                 val_str = val_str[:40000] + "...(TRUNCATED)"
             row.append(val_str)
+            record[h] = val if val is not None and str(val) == val_str else val_str
             
-        ws.append_row(row)
-        self._clear_cache(sheet_name)
+        res = ws.append_row(row)
+        self._patch_append(sheet_name, self._appended_row_number(res), record)
         return True
 
     def write_row_by_index(self, sheet_name, row_index, row_dict):
         ws = self._worksheet(sheet_name)
-        headers = self._headers(ws)
+        headers = self._headers_for(ws, row_dict)
         
         # --- CASE-INSENSITIVE HEADER MAPPING ---
         header_map = {h.lower(): h for h in headers}
@@ -153,6 +374,7 @@ class GoogleSheets:
                 print(f"DEBUG: Found new columns for {sheet_name} (update): {missing_headers}")
                 headers.extend(missing_headers)
                 ws.update("A1", [headers]) 
+                self._header_cache[sheet_name] = list(headers)
                 header_map = {h.lower(): h for h in headers}
         except Exception as e:
             print(f"Header Expansion Failed (Update) (Non-critical): {e}")
@@ -160,6 +382,7 @@ class GoogleSheets:
 
         # create row in same header order with safety truncate
         row = []
+        record = {}
         for h in headers:
             # Try exact match first, then case-insensitive
             val = row_dict.get(h)
@@ -174,6 +397,7 @@ class GoogleSheets:
                  print(f"WARNING: Truncating column '{h}' to avoid API crash.")
                  val_str = val_str[:40000] + "...(TRUNCATED)"
             row.append(val_str)
+            record[h] = val if val is not None and str(val) == val_str else val_str
 
         # compute last column letter
         last_col = len(headers)
@@ -185,368 +409,91 @@ class GoogleSheets:
             return s
         last_col_letter = col_letter(last_col)
         ws.update(f"A{row_index}:{last_col_letter}{row_index}", [row])
-        self._clear_cache(sheet_name)
+        self._patch_update(sheet_name, row_index, record)
         return True
 
     def find_row_index(self, sheet_name, key_col_name, key_value):
         rows = self.read_range(sheet_name)
-        for i, r in enumerate(rows, start=2):
-            if str(r.get(key_col_name, "")).strip().lower() == str(key_value).strip().lower():
-                return i, r
-        return None, None
+        matches = self._row_index(sheet_name, key_col_name, rows).get(self._index_key(key_value))
+        if not matches:
+            return None, None
+        i = matches[0]
+        # a copy: callers edit it before writing, and the cache must only change once the write lands
+        return i, dict(rows[i - 2])
 
     def delete_rows_matching(self, sheet_name, key_col_name, key_value):
         ws = self._worksheet(sheet_name)
         rows = self.read_range(sheet_name)
-        # delete from bottom up so indices remain valid
-        for i in range(len(rows), 0, -1):
-            if str(rows[i-1].get(key_col_name, "")).strip() == str(key_value):
-                ws.delete_rows(i+1)
-        self._clear_cache(sheet_name)
-
-    # ---------- Users ----------
-    def get_users(self):
-        try:
-            return self.read_range(SHEET_USERS)
-        except Exception:
-            return []
-
-    def add_user(self, user):
-        return self.append_row(SHEET_USERS, user)
-
-    def update_user(self, usn, updates):
-        row_index, existing = self.find_row_index(SHEET_USERS, "USN", usn)
-        if not row_index:
-            return False
-        for k, v in updates.items():
-            existing[k] = v
-        return self.write_row_by_index(SHEET_USERS, row_index, existing)
-
-    def delete_user(self, usn):
-        row_index, _ = self.find_row_index(SHEET_USERS, "USN", usn)
-        if not row_index:
-            return False
-        ws = self._worksheet(SHEET_USERS)
-        ws.delete_rows(row_index)
-        return True
-
-    # ---------- Events ----------
-    def get_events(self):
-        try:
-            return self.read_range(SHEET_EVENTS)
-        except Exception:
-            return []
-
-    def add_event(self, ev):
-        # 1. Fetch existing events to determine next ID
-        existing_events = self.get_events()
-        
-        if not ev.get("ID"):
-            # Analyze existing IDs to find max number
-            max_num = 0
-            for e in existing_events:
-                eid = str(e.get("ID", "")).upper()
-                if eid.startswith("EV"):
-                    try:
-                        # Extract numeric part "EV01" -> 1
-                        num_part = int(eid[2:])
-                        if num_part > max_num:
-                            max_num = num_part
-                    except ValueError:
-                        pass
-            
-            # Generate new ID
-            next_num = max_num + 1
-            ev["ID"] = f"EV{next_num:02d}"
-        
-        # 2. Check for Duplicates (Double Check)
-        for e in existing_events:
-            # Case-insensitive check for ID collision
-            if str(e.get("ID", "")).strip().lower() == str(ev["ID"]).strip().lower():
-                # We could raise an error here if we wanted strict unique ID enforcement
-                # For now just proceed, assuming we want to overwrite or it's fine
-                pass 
-
-        print(f"Adding Event: {ev['ID']}") # Debug log
-        
-        # FAIL-SAFE SAVE ATTEMPT
-        try:
-            return self.append_row(SHEET_EVENTS, ev)
-        except Exception as e:
-            print(f"CRITICAL: Event Save Failed: {e}. Retrying with Clean Data...", flush=True)
-            # STRATEGIC FALLBACK: Strip heavy fields that likely caused the crash (e.g. Layout too big, Image too big)
-            # We preserve the ID and core info so the event is created.
-            ev_clean = ev.copy()
-            ev_clean["SeatLayout"] = ""
-            ev_clean["Poster"] = ""
-            ev_clean["Speakers"] = ""
-            ev_clean["Coordinators"] = ""
-            ev_clean["About"] += " [AUTO-RECOVERED: Some data omitted due to size error]"
-            
-            try:
-                return self.append_row(SHEET_EVENTS, ev_clean)
-            except Exception as e2:
-                 print(f"FATAL: Recovery Save Failed too: {e2}", flush=True)
-                 raise e # Bubble up to global handler now
-
-    def update_event(self, event_id, updates):
-        row_index, existing = self.find_row_index(SHEET_EVENTS, "ID", event_id)
-        if not row_index:
-            return False
-        for k, v in updates.items():
-            existing[k] = v
-        return self.write_row_by_index(SHEET_EVENTS, row_index, existing)
-
-    def delete_event(self, event_id):
-        row_index, _ = self.find_row_index(SHEET_EVENTS, "ID", event_id)
-        if not row_index:
-            return False
-        ws = self._worksheet(SHEET_EVENTS)
-        ws.delete_rows(row_index)
-        # cleanup related bookings and attendance
-        self.delete_bookings_for_event(event_id)
-        self.delete_attendance_for_event(event_id)
-        return True
-
-    def toggle_event_visibility(self, event_id, flag):
-        return self.update_event(event_id, {"Visibility": flag})
-
-    # ---------- Bookings ----------
-    def get_bookings(self):
-        try:
-            return self.read_range(SHEET_BOOKINGS)
-        except Exception:
-            return []
-
-    def add_booking(self, b):
-        if not b.get("BookingID"):
-            b["BookingID"] = str(uuid.uuid4())
-        if not b.get("Timestamp"):
-            b["Timestamp"] = datetime.utcnow().timestamp()
-        return self.append_row(SHEET_BOOKINGS, b)
-
-    def find_booking(self, booking_id):
-        return self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
-
-    def update_booking_status(self, booking_id, status):
-        row_index, existing = self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
-        if not row_index:
-            return False
-        existing["Status"] = status
-        return self.write_row_by_index(SHEET_BOOKINGS, row_index, existing)
-
-    def delete_booking(self, booking_id):
-        row_index, _ = self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
-        if not row_index:
-            return False
-        ws = self._worksheet(SHEET_BOOKINGS)
-        ws.delete_rows(row_index)
-        return True
-
-    def delete_bookings_for_event(self, event_id):
-        self.delete_rows_matching(SHEET_BOOKINGS, "EventID", event_id)
-
-    def mark_booking_attendance(self, booking_id):
-        row_index, existing = self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
-        if not row_index:
-            return False
-        
-        # We can add a new column "Attended" dynamically
-        existing["Attended"] = "Yes"
-        existing["AttendedAt"] = str(datetime.utcnow())
-        
-        return self.write_row_by_index(SHEET_BOOKINGS, row_index, existing)
-
-    # ---------- Attendance ----------
-    def get_attendance(self):
-        try:
-            return self.read_range(SHEET_ATTENDANCE)
-        except Exception:
-            return []
-
-    def mark_attendance(self, event_id, usn, attended=True, schedule=None, auditorium=None, event_name=None, email=None):
-        rows = self.read_range(SHEET_ATTENDANCE)
-        try:
-            ws = self._worksheet(SHEET_ATTENDANCE)
-            headers = self._headers(ws)
-        except Exception:
-            headers = []
-
-        # Find match by EventID, USN, and Schedule (if provided)
-        target_schedule = str(schedule).strip() if schedule else ""
-
-        for i, r in enumerate(rows, start=2):
-            matched_event = str(r.get("EventID","")).strip() == str(event_id).strip()
-            matched_usn = str(r.get("USN","")).strip().lower() == str(usn).strip().lower()
-            matched_schedule = True
-            if target_schedule:
-                matched_schedule = str(r.get("Schedule","")).strip() == target_schedule
-
-            if matched_event and matched_usn and matched_schedule:
-                r["Attended"] = "Yes" if attended else "No"
-                r["Timestamp"] = str(datetime.utcnow())
-                if auditorium:
-                    r["Auditorium"] = str(auditorium)
-                if event_name:
-                    r["EventName"] = str(event_name)
-                if email:
-                    r["Email"] = str(email)
-                return self.write_row_by_index(SHEET_ATTENDANCE, i, r)
-        
-        # append new record
-        new_row = {h: "" for h in headers}
-        new_row["EventID"] = event_id
-        new_row["USN"] = usn
-        new_row["Schedule"] = target_schedule
-        new_row["Attended"] = "Yes" if attended else "No"
-        new_row["Timestamp"] = str(datetime.utcnow())
-        if auditorium:
-            new_row["Auditorium"] = str(auditorium)
-        if event_name:
-            new_row["EventName"] = str(event_name)
-        if email:
-            new_row["Email"] = str(email)
-        return self.append_row(SHEET_ATTENDANCE, new_row)
-
-    def delete_attendance_for_event(self, event_id):
-        self.delete_rows_matching(SHEET_ATTENDANCE, "EventID", event_id)
-
-    # ---------- Speakers / Coordinators ----------
-    def get_speakers(self):
-        try:
-            return self.read_range(SHEET_SPEAKERS)
-        except Exception:
-            return []
-
-    def add_speaker(self, sp):
-        # sp = { "Name": "", "Photo": "", "Designation": "", "Department": "", "Bio": "" }
-        # Check duplicates by Name
-        current = self.get_speakers()
-        for c in current:
-            if str(c.get("Name", "")).lower() == str(sp.get("Name", "")).lower():
-                return False # already exists
-        
-        # Determine ID? Or just append. 
-        # Sheet columns: ID, Name, Photo, Designation, Department, Bio
-        if "ID" not in sp:
-             sp["ID"] = f"SP{len(current) + 1:03d}"
-             
-        return self.append_row(SHEET_SPEAKERS, sp)
-
-    def update_speaker(self, sp_id, updates):
-        row_index, existing = self.find_row_index(SHEET_SPEAKERS, "ID", sp_id)
-        if not row_index:
-             return False
-        for k, v in updates.items():
-             existing[k] = v
-        return self.write_row_by_index(SHEET_SPEAKERS, row_index, existing)
-
-    def delete_speaker(self, sp_id):
-        row_index, _ = self.find_row_index(SHEET_SPEAKERS, "ID", sp_id)
-        if not row_index:
-            return False
-        ws = self._worksheet(SHEET_SPEAKERS)
+        deleted = [i for i, r in enumerate(rows, start=2)
+                   if str(r.get(key_col_name, "")).strip() == str(key_value)]
+        # one API call for all matching rows instead of one delete_rows() per row
+        self._batch_delete_rows(ws, deleted)
+        self._patch_delete(sheet_name, deleted)
+
+    def _batch_delete_rows(self, ws, row_numbers):
+        """Deletes the given 1-based sheet rows with a single batch_update call"""
+        # Collapse into contiguous ranges: [5, 6, 7, 10] -> (5..7), (10..10)
+        ranges = []
+        for r in sorted(set(row_numbers)):
+            if ranges and r == ranges[-1][1] + 1:
+                ranges[-1][1] = r
+            else:
+                ranges.append([r, r])
+
+        requests = []
+        # bottom-up so earlier deletions don't shift the later ones
+        for start, end in reversed(ranges):
+            requests.append({
+                "deleteDimension": {
+                    "range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end}
+                }
+            })
+        if requests:
+            self.sheet.batch_update({"requests": requests})
+
+    def delete_row(self, sheet_name, row_index):
+        ws = self._worksheet(sheet_name)
         ws.delete_rows(row_index)
-        return True
-
-    def get_coordinators(self):
-        try:
-            return self.read_range(SHEET_COORDINATORS)
-        except Exception:
-            return []
-
-    def add_coordinator(self, coord):
-        # coord = { "USN": "", "Name": "", "Photo": "", "Department": "", "Contact": "", "About": "" }
-        # Check duplicates by Name (since we only capture Name in the event form usually)
-        current = self.get_coordinators()
-        for c in current:
-            if str(c.get("Name", "")).lower() == str(coord.get("Name", "")).lower():
-                return False
+        self._patch_delete(sheet_name, [row_index])
 
-        # If USN not provided, generate a placeholder or leave empty
-        # Sheet columns: USN, Name, Photo, Department, Contact, About
-        if "USN" not in coord or not coord["USN"]:
-             coord["USN"] = f"TEMP{len(current) + 1:03d}"
-
-        return self.append_row(SHEET_COORDINATORS, coord)
-
-    def update_coordinator(self, cid, updates):
-        # CID is usually USN
-        row_index, existing = self.find_row_index(SHEET_COORDINATORS, "USN", cid)
-        if not row_index:
-             return False
-        for k, v in updates.items():
-             existing[k] = v
-        return self.write_row_by_index(SHEET_COORDINATORS, row_index, existing)
-
-    def delete_coordinator(self, cid):
-        row_index, _ = self.find_row_index(SHEET_COORDINATORS, "USN", cid)
-        if not row_index:
-            return False
-        ws = self._worksheet(SHEET_COORDINATORS)
-        ws.delete_rows(row_index)
-        return True
+    def iter_rows(self, sheet_name):
+        # copies, for the same reason as find_row_index
+        return ((i, dict(r)) for i, r in enumerate(self.read_range(sheet_name), start=2))
 
-    def get_auditoriums(self):
-        # THIS IS THE OLD HELPER getting names from Events
-        # We might want to deprecate this or merge with the new one.
-        # For now, let's look at the actual Auditoriums sheet first.
-        try:
-            # First try to fetch from the new Auditoriums sheet
-            auditoriums = self.read_range(SHEET_AUDITORIUMS)
-            if auditoriums:
-                return sorted([a.get("Name") for a in auditoriums if a.get("Name")])
-        except Exception:
-            pass
-            
-        # Fallback to legacy method (reading from events)
-        try:
-            events = self.read_range(SHEET_EVENTS)
-            auditoriums = set()
-            for e in events:
-                val = e.get("Auditorium", "").strip()
-                if val:
-                    auditoriums.add(val)
-            return sorted(list(auditoriums))
-        except Exception:
-            return []
+    def get_headers(self, sheet_name):
+        return self._headers(self._worksheet(sheet_name))
 
-    def get_auditoriums_full(self):
-        try:
-            data = self.read_range(SHEET_AUDITORIUMS)
-            print(f"DEBUG: get_auditoriums_full read {len(data)} records")
-            return data
-        except Exception as e:
-            print(f"Error fetching auditoriums: {e}")
-            return []
+    def ensure_sheet(self, sheet_name, headers):
+        ws = self._ws_cache.get(sheet_name)
+        if ws is None:
+            try:
+                ws = self.sheet.worksheet(sheet_name)
+            except:
+                 ws = self.sheet.add_worksheet(title=sheet_name, rows=100, cols=10)
+            self._ws_cache[sheet_name] = ws
+            self._header_cache.pop(sheet_name, None)
 
-    def add_auditorium(self, audi_data):
-        # audi_data = {Name, Capacity, Description, Status, SeatLayout}
-        
-        # Ensure sheet exists with headers if it's new
-        try:
-            ws = self.sheet.worksheet(SHEET_AUDITORIUMS)
-        except:
-             ws = self.sheet.add_worksheet(title=SHEET_AUDITORIUMS, rows=100, cols=10)
-        
         # Check if headers exist
-        if not ws.row_values(1):
-             ws.append_row(["Name", "Capacity", "Description", "Status", "SeatLayout"])
-
-        # Check duplicate name
-        current = self.get_auditoriums_full()
-        for c in current:
-            if str(c.get("Name", "")).lower() == str(audi_data.get("Name", "")).lower():
-                return False
-        return self.append_row(SHEET_AUDITORIUMS, audi_data)
-
-    def update_auditorium(self, name, updates):
-        row_index, existing = self.find_row_index(SHEET_AUDITORIUMS, "Name", name)
-        if not row_index:
-            return False
-        for k, v in updates.items():
-            existing[k] = v
-        return self.write_row_by_index(SHEET_AUDITORIUMS, row_index, existing)
+        if not self._headers(ws):
+             ws.append_row(headers)
+             self._header_cache[sheet_name] = list(headers)
+
+def create_store():
+    """Builds the storage engine selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "sqlite":
+        from backend.services.sqlite_store import SQLiteStore
+        print(f"🗄️ Using local SQLite storage: {SQLITE_PATH}")
+        store = SQLiteStore(SQLITE_PATH)
+        if SHEETS_SYNC_ENABLED:
+            from backend.services.sheets_sync import SheetsSyncWorker
+            try:
+                store.journal_enabled = True
+                SheetsSyncWorker(store, GoogleSheets()).start()
+            except Exception as e:
+                # Keep journaling: changes are flushed once a worker can connect again
+                print(f"❌ Sheets sync disabled for this process: {e}")
+        return store
+    return GoogleSheets()
 
 # single instance to import elsewhere
-gs = GoogleSheets()
+gs = create_store()
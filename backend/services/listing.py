@@ -0,0 +1,116 @@
+# backend/services/listing.py
+from datetime import datetime, timedelta
+
+# Large cells left out of paged responses unless asked for with ?fields=
+HEAVY_FIELDS = ("SeatLayout", "Poster")
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# query parameter -> column, shared by every list endpoint (missing columns just don't match)
+COMMON_FILTERS = {
+    "eventId": "EventID",
+    "usn": "USN",
+    "status": "Status",
+    "auditorium": "Auditorium",
+    "role": "Role",
+    "visibility": "Visibility",
+}
+
+
+def _as_datetime(value):
+    """Sheet date/timestamp cell -> datetime (epoch seconds, ISO date or ISO datetime), None if unparseable"""
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.utcfromtimestamp(float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).strip().replace("Z", ""))
+    except ValueError:
+        return None
+
+
+def _int_arg(args, name, default, lo, hi):
+    try:
+        return max(lo, min(hi, int(args.get(name, default))))
+    except (TypeError, ValueError):
+        return default
+
+
+def list_params_present(args):
+    """No parameters -> endpoints keep returning the whole sheet as before"""
+    return any(k in args for k in ("limit", "offset", "cursor", "fields", "q", "from", "to", *COMMON_FILTERS))
+
+
+def is_paged(args):
+    return "limit" in args or "offset" in args or "cursor" in args
+
+
+def query_rows(rows, args, date_field=None, search_fields=(), filters=COMMON_FILTERS):
+    """
+    Applies ?<filter>=, ?from=&to= (on date_field), ?q= (substring over
+    search_fields), then ?limit=&offset= (or ?cursor=, the nextCursor of the
+    previous page). Returns (matching rows, meta). Rows are not copied.
+    """
+    wanted = {col: str(args[p]).strip().lower() for p, col in filters.items() if args.get(p)}
+    q = str(args.get("q", "")).strip().lower()
+    start = _as_datetime(args.get("from")) if date_field else None
+    end = _as_datetime(args.get("to")) if date_field else None
+    if end and len(str(args.get("to")).strip()) == 10:
+        end += timedelta(days=1, microseconds=-1)  # ?to=2026-03-01 includes that whole day
+
+    def keep(r):
+        for col, val in wanted.items():
+            if str(r.get(col, "")).strip().lower() != val:
+                return False
+        if start or end:
+            when = _as_datetime(r.get(date_field))
+            if when is None or (start and when < start) or (end and when > end):
+                return False
+        if q and not any(q in str(r.get(f, "")).lower() for f in search_fields):
+            return False
+        return True
+
+    matched = [r for r in rows if keep(r)] if (wanted or q or start or end) else rows
+
+    meta = {"total": len(matched)}
+    if is_paged(args):
+        offset = _int_arg(args, "cursor" if "cursor" in args else "offset", 0, 0, len(matched))
+        limit = _int_arg(args, "limit", DEFAULT_LIMIT, 1, MAX_LIMIT)
+        matched = matched[offset:offset + limit]
+        next_offset = offset + len(matched)
+        meta.update({
+            "offset": offset,
+            "limit": limit,
+            "nextCursor": str(next_offset) if next_offset < meta["total"] else None,
+        })
+    return matched, meta
+
+
+def _field_selection(args, exclude=()):
+    """(columns asked for with ?fields=, or None) and the columns to drop otherwise"""
+    fields = [f.strip() for f in str(args.get("fields", "")).split(",") if f.strip() and f.strip() not in exclude]
+    if fields:
+        return fields, set()
+    return None, set(exclude) | (set(HEAVY_FIELDS) if is_paged(args) else set())
+
+
+def selects_field(args, field, exclude=()):
+    """True if select_fields(rows, args, exclude) keeps this column"""
+    fields, drop = _field_selection(args, exclude)
+    return field in fields if fields else field not in drop
+
+
+def select_fields(rows, args, exclude=()):
+    """
+    ?fields=A,B keeps only those columns. Without it, paged responses drop
+    HEAVY_FIELDS. Columns in `exclude` are never returned.
+    """
+    fields, drop = _field_selection(args, exclude)
+    if fields:
+        return [{f: r.get(f, "") for f in fields} for r in rows]
+    if not drop:
+        return rows
+    return [{k: v for k, v in r.items() if k not in drop} for r in rows]
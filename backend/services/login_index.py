@@ -0,0 +1,103 @@
+# backend/services/login_index.py
+import threading
+from backend.config import SHEET_USERS
+from backend.services.google_sheets import gs
+
+
+def clean_phone(val):
+    # - Remove .0 suffix from Google Sheets numeric storage (e.g., "7349107584.0" -> "7349107584")
+    # - Strip leading zeros (Google Sheets drops them for numeric cells, e.g., "0011223344" -> "11223344")
+    s = str(val).split('.')[0].strip()
+    s = s.lstrip('0') or '0'  # strip leading zeros, keep '0' if all zeros
+    return s
+
+
+def _usn_key(u):
+    return str(u.get("USN", "")).strip().lower()
+
+
+def _phone_key(u):
+    return clean_phone(u.get("Phone", ""))
+
+
+def _name_key(u):
+    return str(u.get("Name", "")).strip().lower()
+
+
+class LoginIndex:
+    """
+    Normalized USN / phone / name -> position in the Users sheet.
+
+    Built from store.get_users() and rebuilt when the store's Users
+    generation moves or it hands back a different list (cache refresh,
+    another worker's writes). Users appended to the cached list in place
+    (add_user) are indexed incrementally, and a hit is re-checked against
+    the live record, so a stale position is never trusted; a stale hit
+    rebuilds the index once before find() gives up. An unknown login does
+    not: the index already covers the current rows, so a miss costs a
+    lookup, not a rebuild. Each key keeps its first row, matching the old
+    top-to-bottom scan.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._source = None
+        self._gen = None
+        self._count = 0
+        self._maps = {"usn": {}, "phone": {}, "name": {}}
+
+    def _index_rows(self, users, start):
+        for pos in range(start, len(users)):
+            u = users[pos]
+            self._maps["usn"].setdefault(_usn_key(u), pos)
+            self._maps["phone"].setdefault(_phone_key(u), pos)
+            self._maps["name"].setdefault(_name_key(u), pos)
+        self._count = len(users)
+
+    def _sync(self, force=False):
+        # callers hold self._lock
+        gen = self.store.generation(SHEET_USERS)  # read before the rows: they are at least this new
+        users = self.store.get_users()
+        if force or gen != self._gen or users is not self._source or len(users) < self._count:
+            self._maps = {"usn": {}, "phone": {}, "name": {}}
+            self._index_rows(users, 0)
+        elif len(users) > self._count:
+            self._index_rows(users, self._count)
+        self._source = users
+        self._gen = gen
+        return users
+
+    def find(self, login_id, role="user"):
+        """
+        User record for a login: admins by USN, users by USN, phone or name.
+        Returns None if nobody matches.
+        """
+        login_id = str(login_id).strip()
+        keys = {"usn": login_id.lower()}
+        if role == "user":
+            keys["phone"] = clean_phone(login_id)
+            keys["name"] = login_id.lower()
+        elif role != "admin":
+            return None
+
+        checks = {"usn": _usn_key, "phone": _phone_key, "name": _name_key}
+        with self._lock:
+            for attempt in range(2):
+                users = self._sync(force=attempt > 0)
+                hits = sorted(
+                    (self._maps[field][key], field) for field, key in keys.items() if key in self._maps[field]
+                )
+                if not hits:
+                    # unknown login: _sync already rebuilt if the rows were reloaded
+                    return None
+                # first row in sheet order wins, as in a linear scan
+                pos, field = hits[0]
+                if pos < len(users) and checks[field](users[pos]) == keys[field]:
+                    return users[pos]
+                # the position went stale (rows edited or deleted in place,
+                # another user swapped in): rebuild once and retry
+            return None
+
+# single instance shared by the user routes
+login_index = LoginIndex(gs)
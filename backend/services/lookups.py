@@ -0,0 +1,64 @@
+# backend/services/lookups.py
+from flask import g, has_request_context
+from backend.config import SHEET_USERS, SHEET_EVENTS
+from backend.services.google_sheets import gs
+from backend.services.event_models import event_catalog
+
+
+def _key(value):
+    return str(value if value is not None else "").strip().lower()
+
+
+class RequestLookups:
+    """
+    Users/Events lookups for the duration of one request.
+
+    Single users are resolved through the store's key index (hash index
+    over the cached sheet, or an indexed SQLite column) instead of scanning
+    the sheet, and each answer is remembered, so the route and the email
+    code asking for the same user cost one lookup. Events come pre-parsed
+    from the shared event catalog. Whole sheets are
+    fetched at most once per request.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._sheets = {}   # sheet_name -> rows
+        self._records = {}  # (sheet_name, key column, normalized key) -> record or None
+
+    def sheet(self, sheet_name):
+        if sheet_name not in self._sheets:
+            self._sheets[sheet_name] = self.store.read_range(sheet_name)
+        return self._sheets[sheet_name]
+
+    @property
+    def users(self):
+        return self.sheet(SHEET_USERS)
+
+    @property
+    def events(self):
+        return self.sheet(SHEET_EVENTS)
+
+    def _lookup(self, sheet_name, key_col, value):
+        memo_key = (sheet_name, key_col, _key(value))
+        if memo_key not in self._records:
+            _, record = self.store.find_row_index(sheet_name, key_col, value)
+            self._records[memo_key] = record
+        return self._records[memo_key]
+
+    def user(self, usn):
+        return self._lookup(SHEET_USERS, "USN", usn) if _key(usn) else None
+
+    def event(self, event_id):
+        """Parsed Event model (read-only; .get() reads the raw columns)"""
+        return event_catalog.get(event_id)
+
+
+def current_lookups():
+    """RequestLookups shared by everything handling the current request (a fresh one outside requests)"""
+    if not has_request_context():
+        return RequestLookups(gs)
+    lookups = g.get("lookups")
+    if lookups is None:
+        lookups = g.lookups = RequestLookups(gs)
+    return lookups
@@ -0,0 +1,169 @@
+# backend/services/mail_dispatcher.py
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from backend.config import (
+    EMAIL_SENDER, EMAIL_PASSWORD, SMTP_HOST, SMTP_PORT, SMTP_USE_SSL, SMTP_STARTTLS, SMTP_AUTH,
+    MAIL_WORKERS, MAIL_QUEUE_SIZE, MAIL_RATE_PER_SEC, MAIL_MAX_RETRIES
+)
+
+
+class RateLimiter:
+    """Token bucket shared by all mail workers"""
+
+    def __init__(self, rate_per_sec, burst=None):
+        self.rate = rate_per_sec
+        self.capacity = burst or max(1.0, rate_per_sec)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class MailDispatcher:
+    """
+    Fixed pool of worker threads draining a bounded queue of messages.
+
+    Each worker keeps one authenticated SMTP connection open and reuses it
+    for every message, reconnecting only when the server drops it. Sends
+    are rate limited across the pool and retried with backoff, so a booking
+    rush costs a handful of TLS handshakes instead of one per email.
+    """
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, use_ssl=SMTP_USE_SSL, starttls=SMTP_STARTTLS,
+                 username=EMAIL_SENDER, password=EMAIL_PASSWORD, auth=SMTP_AUTH,
+                 workers=MAIL_WORKERS, queue_size=MAIL_QUEUE_SIZE,
+                 rate_per_sec=MAIL_RATE_PER_SEC, max_retries=MAIL_MAX_RETRIES):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self.auth = auth
+        self.workers = workers
+        self.max_retries = max_retries
+        self.limiter = RateLimiter(rate_per_sec)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    # ---------- Public API ----------
+    def submit(self, sender, to_email, message_str, on_result=None, timeout=0):
+        """
+        Queues an already-rendered message. Returns False if the queue is full
+        (after waiting up to `timeout` seconds). `on_result(ok, error)` is
+        called from the worker once the message was sent or gave up.
+        """
+        self._ensure_started()
+        try:
+            if timeout:
+                self._queue.put((sender, to_email, message_str, on_result), timeout=timeout)
+            else:
+                self._queue.put_nowait((sender, to_email, message_str, on_result))
+            return True
+        except queue.Full:
+            print(f"⚠️ Mail queue full ({self._queue.maxsize}), dropping email to {to_email}")
+            return False
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def join(self):
+        """Blocks until every queued message has been processed"""
+        self._queue.join()
+
+    # ---------- Workers ----------
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for n in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"mail-worker-{n}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            print(f"📧 Mail dispatcher started: {self.workers} workers -> {self.host}:{self.port}")
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=30)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=30)
+            if self.starttls:
+                # never send the password in the clear to a server that can encrypt
+                server.ehlo()
+                if server.has_extn("starttls"):
+                    server.starttls(context=ssl.create_default_context())
+                    server.ehlo()
+        if self.auth and self.password:
+            server.login(self.username, self.password)
+        return server
+
+    @staticmethod
+    def _close(server):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _worker(self):
+        server = None
+        while True:
+            sender, to_email, message_str, on_result = self._queue.get()
+            error = None
+            try:
+                for attempt in range(self.max_retries + 1):
+                    self.limiter.acquire()
+                    try:
+                        if server is None:
+                            server = self._connect()
+                        server.sendmail(sender, to_email, message_str)
+                        error = None
+                        break
+                    except smtplib.SMTPRecipientsRefused as e:
+                        error = e  # permanent for this address, don't retry
+                        break
+                    except (smtplib.SMTPException, OSError) as e:
+                        error = e
+                        # connection is suspect: drop it and reconnect on the next attempt
+                        self._close(server)
+                        server = None
+                        if attempt < self.max_retries:
+                            time.sleep(min(30, 2 ** attempt))
+
+                if error is None:
+                    print(f"Email sent successfully to {to_email}")
+                else:
+                    print(f"Failed to send email to {to_email}: {error}")
+                if on_result:
+                    try:
+                        on_result(error is None, error)
+                    except Exception as e:
+                        print(f"Mail result callback failed: {e}")
+            finally:
+                self._queue.task_done()
+
+# single instance shared by EmailService
+mail_dispatcher = MailDispatcher()
@@ -0,0 +1,279 @@
+# backend/services/mail_outbox.py
+import os
+import sqlite3
+import threading
+import time
+from backend.config import (
+    EMAIL_SENDER, MAIL_OUTBOX_PATH, MAIL_OUTBOX_DRAIN_IN_PROCESS,
+    MAIL_OUTBOX_BATCH, MAIL_OUTBOX_MAX_ATTEMPTS
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    dedupe_key    TEXT UNIQUE,
+    to_email      TEXT NOT NULL,
+    subject       TEXT NOT NULL,
+    html          TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',  -- pending | sending | sent | failed
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    last_error    TEXT,
+    created_at    REAL NOT NULL,
+    updated_at    REAL NOT NULL,
+    claimed_until REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, id);
+CREATE TABLE IF NOT EXISTS broadcast_jobs (
+    job_id      TEXT PRIMARY KEY,
+    event_id    TEXT NOT NULL,
+    subject     TEXT,
+    message     TEXT,
+    status      TEXT NOT NULL DEFAULT 'queued',  -- queued | running | enqueued | failed
+    total       INTEGER NOT NULL DEFAULT 0,
+    enqueued    INTEGER NOT NULL DEFAULT 0,
+    skipped     INTEGER NOT NULL DEFAULT 0,
+    cursor      INTEGER NOT NULL DEFAULT 0,
+    last_error  TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+"""
+
+JOB_FIELDS = ("job_id", "event_id", "subject", "message", "status", "total", "enqueued",
+              "skipped", "cursor", "last_error", "created_at", "updated_at")
+
+
+def booking_key(prefix, booking_id, timestamp):
+    """
+    Dedupe key for mail about one booking. BookingIDs are recycled ticket
+    codes, so the booking's Timestamp tells a rebooked code apart.
+    """
+    return f"{prefix}{booking_id}:{timestamp}"
+
+
+class MailOutbox:
+    """
+    Persistent queue of outgoing emails (SQLite).
+
+    enqueue() is a single local insert, so the booking request never waits
+    on SMTP. Drainers claim batches with a lease; if a process dies mid-send
+    the lease expires and the messages are picked up again.
+    """
+
+    def __init__(self, path=MAIL_OUTBOX_PATH):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def enqueue(self, to_email, subject, html, dedupe_key=None):
+        """Stores a message for delivery. A repeated dedupe_key is ignored (returns False)."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox(dedupe_key, to_email, subject, html, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (dedupe_key, to_email, subject, html, now, now)
+            )
+        return cur.rowcount > 0
+
+    def enqueue_many(self, messages):
+        """Stores (to_email, subject, html, dedupe_key) tuples in one transaction. Returns how many were new."""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO outbox(dedupe_key, to_email, subject, html, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(key, to, subject, html, now, now) for to, subject, html, key in messages]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def claim_batch(self, limit=MAIL_OUTBOX_BATCH, lease_seconds=300, max_attempts=MAIL_OUTBOX_MAX_ATTEMPTS):
+        """
+        Marks up to `limit` pending messages as sending and returns them.
+        Messages whose lease expired are claimed again, unless they already
+        used up max_attempts: those are parked as failed.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # a message that keeps killing its sender must not be retried forever
+                self._conn.execute(
+                    "UPDATE outbox SET status = 'failed', last_error = ?, claimed_until = 0, updated_at = ? "
+                    "WHERE status = 'sending' AND claimed_until < ? AND attempts >= ?",
+                    ("lease expired, no attempts left", now, now, max_attempts)
+                )
+                rows = self._conn.execute(
+                    "SELECT id, to_email, subject, html FROM outbox "
+                    "WHERE status = 'pending' OR (status = 'sending' AND claimed_until < ?) "
+                    "ORDER BY id LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbox SET status = 'sending', claimed_until = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE id = ?",
+                    [(now + lease_seconds, now, r[0]) for r in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [{"id": r[0], "to_email": r[1], "subject": r[2], "html": r[3]} for r in rows]
+
+    def mark_sent(self, message_id):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = 'sent', last_error = NULL, updated_at = ? WHERE id = ?",
+                (time.time(), message_id)
+            )
+
+    def mark_failed(self, message_id, error, max_attempts=MAIL_OUTBOX_MAX_ATTEMPTS):
+        """Puts the message back in the queue, or parks it as failed after max_attempts"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "last_error = ?, claimed_until = 0, updated_at = ? WHERE id = ?",
+                (max_attempts, str(error)[:500], time.time(), message_id)
+            )
+
+    def stats(self, key_prefix=None):
+        """Message counts per status, optionally only for dedupe keys starting with key_prefix"""
+        with self._lock:
+            if key_prefix:
+                # range scan on the dedupe_key index
+                rows = self._conn.execute(
+                    "SELECT status, COUNT(*) FROM outbox WHERE dedupe_key >= ? AND dedupe_key < ? GROUP BY status",
+                    (key_prefix, key_prefix + "\uffff")
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    # ---------- Broadcast jobs ----------
+    def create_job(self, job_id, event_id, subject=None, message=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO broadcast_jobs(job_id, event_id, subject, message, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, str(event_id), subject, message, now, now)
+            )
+        return self.get_job(job_id)
+
+    def get_job(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM broadcast_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(JOB_FIELDS, row)) if row else None
+
+    def update_job(self, job_id, **fields):
+        fields = {k: v for k, v in fields.items() if k in JOB_FIELDS and k != "job_id"}
+        fields["updated_at"] = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE broadcast_jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE job_id = ?",
+                list(fields.values()) + [job_id]
+            )
+
+
+class OutboxDrainer:
+    """Moves outbox messages to the mail dispatcher in batches and records the outcome"""
+
+    def __init__(self, outbox, dispatcher, batch_size=MAIL_OUTBOX_BATCH, interval=2.0, lease_seconds=300):
+        self.outbox = outbox
+        self.dispatcher = dispatcher
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease_seconds = lease_seconds
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def drain_once(self):
+        """Sends one batch and waits for it. Returns the number of messages handled."""
+        # imported here so scripts that only enqueue don't pull in the template/SMTP stack
+        from backend.services.email_service import EmailService
+
+        batch = self.outbox.claim_batch(self.batch_size, lease_seconds=self.lease_seconds)
+        # one release per finished message of this batch; the dispatcher queue
+        # is shared with other senders, so waiting for it to empty could stall
+        done = threading.Semaphore(0)
+        submitted = 0
+        for msg in batch:
+            def on_result(ok, error, message_id=msg["id"]):
+                try:
+                    if ok:
+                        self.outbox.mark_sent(message_id)
+                    else:
+                        self.outbox.mark_failed(message_id, error)
+                finally:
+                    done.release()
+
+            message_str = EmailService.build_message(msg["to_email"], msg["subject"], msg["html"])
+            if self.dispatcher.submit(EMAIL_SENDER, msg["to_email"], message_str, on_result=on_result, timeout=30):
+                submitted += 1
+            else:
+                self.outbox.mark_failed(msg["id"], "mail queue full")
+
+        # past the lease the rows are claimable again, so stop waiting there
+        deadline = time.monotonic() + self.lease_seconds
+        for _ in range(submitted):
+            if not done.acquire(timeout=max(0, deadline - time.monotonic())):
+                print(f"Outbox batch not finished within {self.lease_seconds}s; leases will be reclaimed")
+                break
+        return len(batch)
+
+    def run_forever(self):
+        print(f"📬 Outbox drainer running (batch {self.batch_size})")
+        while True:
+            try:
+                if self.drain_once():
+                    continue  # more may be waiting
+            except Exception as e:
+                print(f"Outbox drain failed: {e}")
+            time.sleep(self.interval)
+
+    def start_background(self):
+        if self._thread:
+            return
+        with self._start_lock:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self.run_forever, name="outbox-drainer", daemon=True)
+            self._thread.start()
+
+# single instances
+mail_outbox = MailOutbox()
+
+
+def get_drainer():
+    from backend.services.mail_dispatcher import mail_dispatcher
+    return OutboxDrainer(mail_outbox, mail_dispatcher)
+
+_in_process_drainer = None
+
+
+def ensure_in_process_drainer():
+    """
+    Starts a drainer thread in this process unless a separate drain process
+    is used (MAIL_OUTBOX_DRAIN_IN_PROCESS=false, see backend/drain_outbox.py).
+    Called at app startup, so mail left pending by a previous run goes out
+    without waiting for new mail.
+    """
+    global _in_process_drainer
+    if not MAIL_OUTBOX_DRAIN_IN_PROCESS:
+        return
+    if _in_process_drainer is None:
+        _in_process_drainer = get_drainer()
+    _in_process_drainer.start_background()
@@ -0,0 +1,113 @@
+# backend/services/passwords.py
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from backend.config import PASSWORD_HASH_ALGO, PASSWORD_WORK_FACTOR, PASSWORD_CACHE_TTL
+
+# Stored format:  <algo>$<work factor>$<salt b64>$<hash b64>
+#   pbkdf2_sha256$100000$...$...   (work factor = iterations)
+#   scrypt$16384$...$...           (work factor = N, r=8, p=1)
+# Anything else in the Password column is a legacy plaintext password.
+ALGORITHMS = ("pbkdf2_sha256", "scrypt")
+SALT_BYTES = 16
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _derive(algo, password, salt, work_factor):
+    if algo == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, work_factor)
+    if algo == "scrypt":
+        # maxmem: N * r * 128 bytes, plus headroom
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=work_factor, r=8, p=1,
+                              maxmem=work_factor * 8 * 128 * 2, dklen=32)
+    raise ValueError(f"unknown password hash algorithm: {algo}")
+
+
+def hash_password(password, algo=PASSWORD_HASH_ALGO, work_factor=PASSWORD_WORK_FACTOR):
+    salt = os.urandom(SALT_BYTES)
+    digest = _derive(algo, str(password), salt, work_factor)
+    return f"{algo}${work_factor}${_b64(salt)}${_b64(digest)}"
+
+
+def _parse(stored):
+    parts = str(stored).split("$")
+    if len(parts) != 4 or parts[0] not in ALGORITHMS or not parts[1].isdigit():
+        return None
+    return parts[0], int(parts[1]), parts[2], parts[3]
+
+
+def is_hashed(stored):
+    return _parse(stored) is not None
+
+
+def needs_rehash(stored, algo=PASSWORD_HASH_ALGO, work_factor=PASSWORD_WORK_FACTOR):
+    parsed = _parse(stored)
+    return parsed is None or parsed[0] != algo or parsed[1] < work_factor
+
+
+class PasswordVerifier:
+    """
+    Checks passwords against the Users sheet's Password column.
+
+    A successful check is remembered for a few minutes, keyed by an HMAC
+    of (stored hash, password) under a per-process random key, so repeated
+    logins don't pay for the slow hash again and no plaintext is kept in
+    memory. Changing the stored hash naturally misses the cache.
+    """
+
+    def __init__(self, ttl=PASSWORD_CACHE_TTL, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+        self._verified = {}  # cache key -> expiry
+
+    def _cache_key(self, stored, password):
+        return hmac.new(self._key, f"{stored}\0{password}".encode("utf-8"), hashlib.sha256).digest()
+
+    def verify(self, stored, password):
+        """True if password matches the stored value (hash or legacy plaintext)"""
+        stored = str(stored or "").strip()
+        password = str(password or "")
+        if not stored:
+            return False
+
+        parsed = _parse(stored)
+        if parsed is None:
+            # legacy plaintext column
+            return hmac.compare_digest(stored.encode("utf-8"), password.strip().encode("utf-8"))
+
+        cache_key = self._cache_key(stored, password)
+        now = time.time()
+        with self._lock:
+            expires = self._verified.get(cache_key)
+            if expires and expires > now:
+                return True
+
+        algo, work_factor, salt, digest = parsed
+        try:
+            ok = hmac.compare_digest(_derive(algo, password, _unb64(salt), work_factor), _unb64(digest))
+        except (ValueError, TypeError):
+            return False
+
+        if ok and self.ttl > 0:
+            with self._lock:
+                if len(self._verified) >= self.max_entries:
+                    self._verified = {k: v for k, v in self._verified.items() if v > now}
+                    if len(self._verified) >= self.max_entries:
+                        self._verified.clear()
+                self._verified[cache_key] = now + self.ttl
+        return ok
+
+# single instance shared by the user routes
+password_verifier = PasswordVerifier()
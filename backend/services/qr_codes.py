@@ -0,0 +1,76 @@
+# backend/services/qr_codes.py
+import json
+import os
+import re
+import threading
+import urllib.parse
+
+try:
+    import segno
+except ImportError:  # optional: without it tickets keep using the external QR service
+    segno = None
+
+QR_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "qr")
+
+# BookingIDs become file names, so only allow a safe character set
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,100}$")
+
+
+def qr_payload(booking_id):
+    # JSON, as the volunteer scanner expects (it reads parsed.bookingId)
+    return json.dumps({"bookingId": booking_id}, separators=(",", ":"))
+
+
+def external_qr_url(booking_id, size=300):
+    return f"https://api.qrserver.com/v1/create-qr-code/?size={size}x{size}&data={urllib.parse.quote_plus(qr_payload(booking_id))}"
+
+
+class QRCodeCache:
+    """
+    Ticket QR images generated locally and cached on disk as
+    static/qr/<BookingID>.png. A ticket's QR never changes, so each file is
+    written once and can be served with a far-future cache header.
+    """
+
+    def __init__(self, folder=QR_DIR, scale=8, border=2):
+        self.folder = folder
+        self.scale = scale
+        self.border = border
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return segno is not None
+
+    def valid_id(self, booking_id):
+        return bool(_SAFE_ID.match(str(booking_id)))
+
+    def path_for(self, booking_id):
+        return os.path.join(self.folder, f"{booking_id}.png")
+
+    def ensure(self, booking_id):
+        """Path of the PNG for booking_id, generating it on first use. None if it can't be generated."""
+        booking_id = str(booking_id)
+        if not self.available or not self.valid_id(booking_id):
+            return None
+        path = self.path_for(booking_id)
+        if os.path.exists(path):
+            return path
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(self.folder, exist_ok=True)
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                segno.make(qr_payload(booking_id), error="m").save(
+                    tmp, kind="png", scale=self.scale, border=self.border
+                )
+                os.replace(tmp, path)  # readers never see a half-written file
+        return path
+
+    def url_for(self, booking_id, base_url):
+        """URL to store on the booking: the local image when possible, the external service otherwise"""
+        if self.ensure(booking_id):
+            return f"{base_url.rstrip('/')}/api/bookings/qr/{booking_id}.png"
+        return external_qr_url(booking_id)
+
+# single instance shared by the booking routes
+qr_codes = QRCodeCache()
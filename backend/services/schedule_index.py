@@ -0,0 +1,124 @@
+# backend/services/schedule_index.py
+import bisect
+import threading
+from datetime import timedelta
+from backend.config import SHEET_EVENTS
+from backend.services.google_sheets import gs
+from backend.services.event_models import Event, event_catalog
+
+
+class _Hall:
+    __slots__ = ("entries", "max_span")
+
+    def __init__(self):
+        self.entries = []               # sorted (start, end, order)
+        self.max_span = timedelta(0)    # longest interval, bounds the backwards search
+
+
+class ScheduleIndex:
+    """
+    Booked time ranges per auditorium, sorted by start time.
+
+    Built once from the Events sheet and rebuilt when the store hands back a
+    different list; the event routes also refresh single events after add,
+    update and delete. An overlap query bisects to the intervals starting
+    before the requested end and walks back at most the longest event
+    duration, so a check is O(log n + k) instead of re-parsing every event.
+    """
+
+    def __init__(self, store, catalog):
+        self.store = store
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._source = None
+        self._halls = {}     # auditorium -> _Hall
+        self._events = {}    # order -> (ID, Name, auditorium, [(start, end)])
+        self._by_id = {}     # str(ID) -> order
+        self._next_order = 0
+
+    # ---------- Maintenance ----------
+    def _sync(self):
+        # callers hold self._lock
+        events = self.store.get_events()
+        if events is self._source:
+            return
+        self._halls, self._events, self._by_id, self._next_order = {}, {}, {}, 0
+        for ev in events:
+            self._insert(self.catalog.model(ev))
+        self._source = events
+
+    def _insert(self, ev, order=None):
+        if order is None:
+            order = self._next_order
+            self._next_order += 1
+        # ev is an Event model: its slots are parsed once and shared with the catalog
+        auditorium = ev.auditorium
+        slots = ev.slots
+        self._events[order] = (ev.get("ID"), ev.name, auditorium, slots)
+        if ev.id:
+            self._by_id.setdefault(ev.id, order)
+        hall = self._halls.get(auditorium)
+        if hall is None:
+            hall = self._halls[auditorium] = _Hall()
+        for start, end in slots:
+            bisect.insort(hall.entries, (start, end, order))
+            hall.max_span = max(hall.max_span, end - start)
+        return order
+
+    def _remove(self, order):
+        _, _, auditorium, slots = self._events.pop(order)
+        hall = self._halls.get(auditorium)
+        for start, end in slots:
+            i = bisect.bisect_left(hall.entries, (start, end, order))
+            if i < len(hall.entries) and hall.entries[i] == (start, end, order):
+                hall.entries.pop(i)
+
+    def refresh_event(self, event_id):
+        """Re-reads one event after it was added or updated"""
+        with self._lock:
+            self._sync()
+            _, ev = self.store.find_row_index(SHEET_EVENTS, "ID", event_id)
+            order = self._by_id.get(str(event_id).strip())
+            if order is not None:
+                self._remove(order)
+            if ev:
+                self._insert(Event(ev), order)
+            elif order is not None:
+                self._by_id.pop(str(event_id).strip(), None)
+
+    def remove_event(self, event_id):
+        with self._lock:
+            self._sync()
+            order = self._by_id.pop(str(event_id).strip(), None)
+            if order is not None:
+                self._remove(order)
+
+    # ---------- Queries ----------
+    def conflicts(self, auditorium, start, end, exclude_event_id=None):
+        """(ID, Name) of events in `auditorium` overlapping [start, end), in sheet order"""
+        with self._lock:
+            self._sync()
+            hall = self._halls.get(auditorium)
+            if hall is None:
+                return []
+            hits = set()
+            # every overlapping interval starts before `end` and no earlier than start - max_span
+            i = bisect.bisect_left(hall.entries, (end,))
+            lower = start - hall.max_span
+            while i > 0:
+                i -= 1
+                ev_start, ev_end, order = hall.entries[i]
+                if ev_start < lower:
+                    break
+                if start < ev_end:
+                    hits.add(order)
+            found = []
+            for order in sorted(hits):
+                ev_id, name = self._events[order][0], self._events[order][1]
+                if ev_id == exclude_event_id:
+                    continue
+                found.append((ev_id, name))
+            return found
+
+# single instance shared by the event routes
+schedule_index = ScheduleIndex(gs, event_catalog)
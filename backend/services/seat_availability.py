@@ -0,0 +1,127 @@
+# backend/services/seat_availability.py
+import base64
+import hashlib
+import threading
+from backend.services.seat_reservations import seat_reservations
+from backend.services.event_models import event_catalog
+from backend.services.seat_layout import BOOKABLE_CELLS
+
+
+def seat_labels(layout):
+    """
+    Seat IDs of a layout's cells, row-major, one per non-gap cell - the same
+    labels the seat picker shows: rows without seats are skipped, the rest
+    are lettered A, B, ... and numbered from 1 (blocked seats included).
+    Returns [(label, cell)].
+    """
+    labels = []
+    row_label = 0
+    for row in (layout or {}).get("grid") or []:
+        if not any(cell != 0 for cell in row):
+            continue
+        letter = chr(65 + row_label)
+        row_label += 1
+        number = 0
+        for cell in row:
+            if cell != 0:
+                number += 1
+                labels.append((f"{letter}{number}", cell))
+    return labels
+
+
+class _SeatMap:
+    __slots__ = ("labels", "bit_of", "bookable")
+
+    def __init__(self, layout):
+        cells = seat_labels(layout)
+        self.labels = [label for label, _ in cells]
+        self.bit_of = {label: i for i, label in enumerate(self.labels)}
+        self.bookable = sum(1 for _, cell in cells if cell in BOOKABLE_CELLS)
+
+
+class _Snapshot:
+    __slots__ = ("key", "etag", "body")
+
+    def __init__(self, key, etag, body):
+        self.key = key
+        self.etag = etag
+        self.body = body
+
+
+class SeatAvailability:
+    """
+    Per-event occupancy bitmaps for the seat picker.
+
+    Bit i is set when the i-th seat of the layout (row-major over non-gap
+    cells, see seat_labels) is taken by a booking or an in-flight
+    reservation; bits are packed MSB first and sent base64 encoded. A
+    snapshot is rebuilt only when the event's layout or the reservation
+    change counter moves (booking, delete, status change, cache refresh),
+    so a poll that finds nothing new costs two dict lookups. The ETag is
+    a hash of the content, so it agrees across worker processes.
+    """
+
+    def __init__(self, reservations, catalog, max_layouts=256):
+        self.reservations = reservations
+        self.catalog = catalog
+        self.max_layouts = max_layouts
+        self._lock = threading.Lock()
+        self._seat_maps = {}  # layout cell -> _SeatMap
+        self._snapshots = {}  # event_id -> _Snapshot
+
+    def _seat_map(self, layout_cell, layout):
+        # callers hold self._lock
+        seat_map = self._seat_maps.get(layout_cell)
+        if seat_map is None:
+            if len(self._seat_maps) >= self.max_layouts:
+                self._seat_maps.clear()
+            seat_map = self._seat_maps[layout_cell] = _SeatMap(layout)
+        return seat_map
+
+    def snapshot(self, event_id):
+        """(etag, body) for an event, None if there is no such event"""
+        event = self.catalog.get(event_id)
+        if event is None:
+            return None
+        event_id = event.id
+        layout_cell = event.layout_cell
+        key = (layout_cell, self.reservations.changes(event_id))
+        with self._lock:
+            snap = self._snapshots.get(event_id)
+            if snap is not None and snap.key == key:
+                return snap.etag, snap.body
+
+        taken = self.reservations.taken_seats(event_id)
+        layout = event.layout
+        with self._lock:
+            seat_map = self._seat_map(layout_cell, layout)
+            bits = bytearray((len(seat_map.labels) + 7) // 8)
+            unmapped = []
+            for seat in taken:
+                i = seat_map.bit_of.get(seat)
+                if i is None:
+                    unmapped.append(seat)
+                else:
+                    bits[i >> 3] |= 0x80 >> (i & 7)
+            mapped = len(taken) - len(unmapped)
+            body = {
+                "eventId": event_id,
+                "layout": layout,
+                "seats": len(seat_map.labels),
+                "bookable": seat_map.bookable,
+                "taken": mapped,
+                "available": max(seat_map.bookable - mapped, 0),
+                "bitmap": base64.b64encode(bytes(bits)).decode("ascii"),
+                # taken seats that are not in the layout (events using the capacity-based default map)
+                "extraTaken": sorted(unmapped),
+            }
+            digest = hashlib.blake2b(digest_size=12)
+            digest.update(str(layout_cell).encode("utf-8"))
+            digest.update(bytes(bits))
+            digest.update(",".join(body["extraTaken"]).encode("utf-8"))
+            etag = f'"{digest.hexdigest()}"'
+            self._snapshots[event_id] = _Snapshot(key, etag, body)
+            return etag, body
+
+# single instance shared by the event routes
+seat_availability = SeatAvailability(seat_reservations, event_catalog)
@@ -0,0 +1,115 @@
+# backend/services/seat_layout.py
+import base64
+import json
+
+# Compact SeatLayout cell:  "SL1:" + base64(payload)
+#   payload = varint rows, varint cols, then the grid row by row as runs,
+#   one byte per run: (cell << 6) | (run length - 1)  -> 2-bit cell, runs of 1..64
+# A 30x60 hall takes ~100-300 chars instead of ~5,500 chars of JSON.
+# Legacy cells hold {"rows":R,"cols":C,"grid":[[...]]} JSON; both decode to that dict.
+PREFIX = "SL1:"
+MAX_RUN = 64
+
+# grid cells: 0 gap, 1 standard, 2 VIP, 3 blocked
+CELL_VALUES = (0, 1, 2, 3)
+BOOKABLE_CELLS = (1, 2)
+
+
+def _put_varint(out, n):
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _get_varint(data, pos):
+    n, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return n, pos
+        shift += 7
+
+
+def is_compact(text):
+    return isinstance(text, str) and text.startswith(PREFIX)
+
+
+def encode_layout(layout):
+    """
+    {"rows","cols","grid"} dict (or its JSON) -> compact string.
+    Short rows are padded with gaps up to `cols`; raises ValueError for
+    cells outside 0-3.
+    """
+    if isinstance(layout, str):
+        layout = json.loads(layout)
+    grid = layout.get("grid") or []
+    rows = int(layout.get("rows") or len(grid))
+    cols = int(layout.get("cols") or max((len(r) for r in grid), default=0))
+
+    out = bytearray()
+    _put_varint(out, rows)
+    _put_varint(out, cols)
+    current, run = None, 0
+    for r in range(rows):
+        line = grid[r] if r < len(grid) else []
+        for c in range(cols):
+            cell = line[c] if c < len(line) else 0
+            if cell not in CELL_VALUES:
+                raise ValueError(f"seat layout cell {cell!r} at ({r}, {c}) is not one of {CELL_VALUES}")
+            if cell == current and run < MAX_RUN:
+                run += 1
+                continue
+            if run:
+                out.append((current << 6) | (run - 1))
+            current, run = cell, 1
+    if run:
+        out.append((current << 6) | (run - 1))
+    return PREFIX + base64.b64encode(bytes(out)).decode("ascii")
+
+
+def _decode_compact(text):
+    data = base64.b64decode(text[len(PREFIX):])
+    rows, pos = _get_varint(data, 0)
+    cols, pos = _get_varint(data, pos)
+    flat = []
+    for byte in data[pos:]:
+        flat.extend([byte >> 6] * ((byte & 0x3F) + 1))
+    if len(flat) != rows * cols:
+        raise ValueError(f"seat layout has {len(flat)} cells, expected {rows}x{cols}")
+    return {"rows": rows, "cols": cols, "grid": [flat[r * cols:(r + 1) * cols] for r in range(rows)]}
+
+
+def decode_layout(value):
+    """SeatLayout cell (compact, legacy JSON or an already decoded dict) -> dict, None if empty or malformed"""
+    if not value:
+        return None
+    try:
+        if is_compact(value):
+            return _decode_compact(value)
+        layout = json.loads(value) if isinstance(value, str) else value
+        grid = layout["grid"]
+        return {"rows": int(layout.get("rows", len(grid))), "cols": int(layout.get("cols", len(grid[0]) if grid else 0)),
+                "grid": grid}
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError):
+        return None
+
+
+def compact_cell(value):
+    """
+    Value for a SeatLayout column on write: layouts are stored compact;
+    empty values, compact strings and anything the codec can't represent
+    are stored unchanged (dicts as JSON).
+    """
+    if not value or is_compact(value):
+        return value
+    try:
+        return encode_layout(value)
+    except (ValueError, TypeError, AttributeError):
+        return value if isinstance(value, str) else json.dumps(value)
@@ -0,0 +1,262 @@
+# backend/services/seat_reservations.py
+import itertools
+import threading
+from backend.config import SHEET_BOOKINGS
+from backend.services.google_sheets import gs
+
+MSG_ALREADY_BOOKED = "You have already booked a seat for this event."
+
+# Bookings in these states hold neither a seat nor the user's slot for the event
+RELEASED_STATUSES = ("cancelled", "canceled", "rejected")
+
+
+def is_released(status):
+    return str(status or "").strip().lower() in RELEASED_STATUSES
+
+
+def parse_seats(seats):
+    """'A1, A2' or ['A1', 'A2'] -> ['A1', 'A2'] (General Entry is not a seat)"""
+    if isinstance(seats, (list, tuple, set)):
+        items = seats
+    else:
+        items = str(seats or "").split(",")
+    return [s.strip() for s in items if str(s).strip() and str(s).strip().lower() != "general entry"]
+
+
+def _usn_key(usn):
+    return str(usn or "").strip().lower()
+
+
+class _EventBookings:
+    __slots__ = ("usns", "seats")
+
+    def __init__(self):
+        self.usns = set()
+        self.seats = set()
+
+
+class SeatReservations:
+    """
+    Per-event booking index (EventID -> booked USNs + taken seats) with
+    atomic check-and-reserve.
+
+    The index is built from the Bookings sheet once and then kept current
+    by the hooks below (commit, release, set_status, forget_event), which
+    the routes call for every booking write. It is only rebuilt when the
+    store's Bookings generation moves, i.e. when the store reloaded rows
+    another worker may have changed, so those show up within the Bookings
+    cache TTL. The rebuild reads the sheet without holding any lock and
+    swaps the new index in under a short one; hooks that ran meanwhile are
+    replayed onto it. Reservations that are not persisted yet are tracked
+    separately as "pending", so a rebuild never drops an in-flight booking.
+    Cancelled and rejected bookings free their seat.
+
+    Check-and-set (reserve/commit/abort/...) is serialized per event through
+    a fixed set of locks striped by EventID, so bookings for different
+    events don't wait on each other.
+
+    reserve() is only atomic within one process. The locks and pending
+    reservations live in memory, and other workers' bookings only show up
+    after the next reload, so two processes can still hand out the same
+    seat. The deployment relies on a single worker process (render.yaml
+    runs gunicorn with its default of one worker); scale with threads, not
+    workers, unless reservations move into a shared transaction.
+
+    Every change to an event's seats bumps its change counter (see
+    changes()), which lets availability snapshots be reused until then.
+
+        ok, message = seat_reservations.reserve(event_id, usn, seats)
+        try:
+            gs.add_booking(...)
+        except Exception:
+            seat_reservations.abort(event_id, usn, seats)
+            raise
+        seat_reservations.commit(event_id, usn, seats)
+    """
+
+    def __init__(self, store, stripes=64):
+        self.store = store
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._index_lock = threading.Lock()    # swaps of _booked, the replay log
+        self._rebuild_lock = threading.Lock()  # one rebuild at a time
+        self._gen = None     # store generation of Bookings the index was built from
+        self._booked = {}    # event_id -> _EventBookings (persisted)
+        self._pending = {}   # event_id -> _EventBookings (reserved, not yet persisted)
+        self._landed = None  # hook calls made while a rebuild is running, replayed onto it
+        self._counter = itertools.count(1)
+        self._changes = {}   # event_id -> change counter
+
+    def _lock_for(self, event_id):
+        return self._stripes[hash(event_id) % len(self._stripes)]
+
+    # ---------- Index ----------
+    def _sync(self):
+        # never called with an event lock held: get_bookings() may fetch the sheet
+        self.store.get_bookings()  # lets an expired cache refresh
+        if self.store.generation(SHEET_BOOKINGS) == self._gen:
+            return
+        # one rebuild at a time; the others keep using the current index meanwhile
+        if not self._rebuild_lock.acquire(blocking=self._gen is None):
+            return
+        try:
+            # read before the rows: they are at least this new
+            gen = self.store.generation(SHEET_BOOKINGS)
+            if gen == self._gen:
+                return
+            with self._index_lock:
+                self._landed = []
+            bookings = self.store.get_bookings()
+
+            booked = {}
+            for b in bookings:
+                if is_released(b.get("Status")):
+                    continue
+                entry = self._entry(booked, str(b.get("EventID", "")).strip())
+                if _usn_key(b.get("USN")):
+                    entry.usns.add(_usn_key(b.get("USN")))
+                entry.seats.update(parse_seats(b.get("Seats", "")))
+
+            with self._index_lock:
+                for op, event_id, usn, seats in self._landed:
+                    self._apply(booked, op, event_id, usn, seats)
+                self._landed = None
+                # only events whose seats actually differ count as changed
+                for event_id in set(booked) | set(self._booked):
+                    old, new = self._booked.get(event_id), booked.get(event_id)
+                    if (old.seats if old else set()) != (new.seats if new else set()):
+                        self._touch(event_id)
+                self._booked = booked
+                self._gen = gen
+        finally:
+            self._rebuild_lock.release()
+
+    def _apply(self, booked, op, event_id, usn, seats):
+        # callers hold self._index_lock
+        if op == "hold":
+            entry = self._entry(booked, event_id)
+            entry.usns.add(usn)
+            entry.seats.update(seats)
+        elif op == "free" and event_id in booked:
+            booked[event_id].usns.discard(usn)
+            booked[event_id].seats.difference_update(seats)
+        elif op == "forget":
+            booked.pop(event_id, None)
+
+    def _persisted(self, op, event_id, usn="", seats=()):
+        """Applies a persisted change ("hold", "free" or "forget") to the index"""
+        # callers hold the event's lock
+        with self._index_lock:
+            self._apply(self._booked, op, event_id, usn, seats)
+            if self._landed is not None:
+                # a rebuild is reading the sheet right now and may have missed it
+                self._landed.append((op, event_id, usn, seats))
+            self._touch(event_id)
+
+    def _touch(self, event_id):
+        # next() on a shared counter: a new value for every change, from any thread
+        self._changes[event_id] = next(self._counter)
+
+    def _entry(self, table, event_id):
+        entry = table.get(event_id)
+        if entry is None:
+            entry = table.setdefault(event_id, _EventBookings())
+        return entry
+
+    # ---------- Queries ----------
+    def taken_seats(self, event_id):
+        event_id = str(event_id).strip()
+        self._sync()
+        with self._lock_for(event_id):
+            taken = set()
+            for table in (self._booked, self._pending):
+                if event_id in table:
+                    taken |= table[event_id].seats
+            return taken
+
+    def changes(self, event_id):
+        """Counter that moves whenever the event's taken seats change (only meaningful within this process)"""
+        event_id = str(event_id).strip()
+        self._sync()
+        return self._changes.get(event_id, 0)
+
+    def has_booked(self, event_id, usn):
+        event_id, usn = str(event_id).strip(), _usn_key(usn)
+        self._sync()
+        with self._lock_for(event_id):
+            return any(event_id in t and usn in t[event_id].usns for t in (self._booked, self._pending))
+
+    # ---------- Check-and-set ----------
+    def reserve(self, event_id, usn, seats):
+        """
+        Atomically claims a booking for (event, user, seats).
+        Returns (True, None) or (False, reason) if the user already booked
+        this event or one of the seats is taken.
+        """
+        seats = parse_seats(seats)
+        event_id, usn = str(event_id).strip(), _usn_key(usn)
+        self._sync()
+        with self._lock_for(event_id):
+            booked = self._booked.get(event_id) or _EventBookings()
+            pending = self._entry(self._pending, event_id)
+
+            if usn in booked.usns or usn in pending.usns:
+                return False, MSG_ALREADY_BOOKED
+            for s in seats:
+                if s in booked.seats or s in pending.seats:
+                    return False, f"Seat {s} is already booked."
+            # no duplicates within the request either
+            if len(set(seats)) != len(seats):
+                dup = next(s for s in seats if seats.count(s) > 1)
+                return False, f"Seat {dup} is already booked."
+
+            pending.usns.add(usn)
+            pending.seats.update(seats)
+            if seats:
+                self._touch(event_id)
+            return True, None
+
+    def commit(self, event_id, usn, seats):
+        """Marks a reservation as persisted (call after the booking row is written)"""
+        seats = parse_seats(seats)
+        event_id, usn = str(event_id).strip(), _usn_key(usn)
+        with self._lock_for(event_id):
+            pending = self._entry(self._pending, event_id)
+            pending.usns.discard(usn)
+            pending.seats.difference_update(seats)
+            self._persisted("hold", event_id, usn, seats)
+
+    def abort(self, event_id, usn, seats):
+        """Drops a reservation whose booking could not be saved"""
+        seats = parse_seats(seats)
+        event_id, usn = str(event_id).strip(), _usn_key(usn)
+        with self._lock_for(event_id):
+            pending = self._entry(self._pending, event_id)
+            pending.usns.discard(usn)
+            pending.seats.difference_update(seats)
+            self._touch(event_id)
+
+    def release(self, event_id, usn, seats):
+        """Frees the user slot and seats of a deleted booking"""
+        seats = parse_seats(seats)
+        event_id, usn = str(event_id).strip(), _usn_key(usn)
+        with self._lock_for(event_id):
+            self._persisted("free", event_id, usn, seats)
+
+    def set_status(self, event_id, usn, seats, status, old_status=""):
+        """
+        A booking's status changed from old_status: becoming cancelled/rejected
+        frees its seats. Reinstating a released booking is not handled here -
+        its seats may be taken by now, so it goes through reserve() and
+        commit() like a new booking.
+        """
+        if is_released(status) and not is_released(old_status):
+            self.release(event_id, usn, seats)
+
+    def forget_event(self, event_id):
+        event_id = str(event_id).strip()
+        with self._lock_for(event_id):
+            self._pending.pop(event_id, None)
+            self._persisted("forget", event_id)
+
+# single instance shared by the booking routes
+seat_reservations = SeatReservations(gs)
@@ -0,0 +1,154 @@
+# backend/services/sheets_sync.py
+import os
+import threading
+import gspread
+from backend.config import SHEETS_SYNC_INTERVAL, SHEETS_SYNC_BACKOFF_MAX
+from backend.services.sqlite_store import SYNC_KEYS, sync_key
+
+# HTTP statuses from the Sheets API that are worth retrying (quota / transient)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _col_letter(n):
+    s = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        s = chr(65 + rem) + s
+    return s
+
+
+def _cell(val):
+    val_str = str(val) if val is not None else ""
+    # SAFETY TRUNCATE (same limit as GoogleSheets.append_row)
+    if len(val_str) > 40000:
+        val_str = val_str[:40000] + "...(TRUNCATED)"
+    return val_str
+
+
+class SheetsSyncWorker(threading.Thread):
+    """
+    Background thread that drains the SQLiteStore journal into Google Sheets.
+
+    Pending changes are coalesced per row (last write wins) and pushed with
+    one values batch_update per sheet, plus one append_rows and one
+    deleteDimension batch when there are new or removed rows. Quota and
+    transient API errors leave the journal untouched and back off
+    exponentially.
+    """
+
+    def __init__(self, store, sheets, interval=SHEETS_SYNC_INTERVAL, batch_size=500):
+        super().__init__(name="sheets-sync", daemon=True)
+        self.store = store
+        self.sheets = sheets
+        self.interval = interval
+        self.batch_size = batch_size
+        self.owner = f"{os.getpid()}-{id(self)}"
+        self._failures = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        print(f"🔄 Sheets sync worker started (every {self.interval}s)")
+        while not self._stop_event.is_set():
+            delay = self.interval
+            try:
+                if self.store.acquire_lease("sheets_sync", self.owner, ttl=self.interval * 6):
+                    while self.flush_once():
+                        pass  # keep draining while full batches are coming back
+                self._failures = 0
+            except gspread.exceptions.APIError as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                self._failures += 1
+                delay = min(SHEETS_SYNC_BACKOFF_MAX, self.interval * (2 ** self._failures))
+                kind = "quota/transient" if status in RETRYABLE_STATUSES else "API"
+                print(f"⚠️ Sheets sync {kind} error ({status}): {e}. Retrying in {delay:.0f}s")
+            except Exception as e:
+                self._failures += 1
+                delay = min(SHEETS_SYNC_BACKOFF_MAX, self.interval * (2 ** self._failures))
+                print(f"⚠️ Sheets sync failed: {e}. Retrying in {delay:.0f}s")
+            self._stop_event.wait(delay)
+
+    def flush_once(self):
+        """Pushes one batch of journal entries. Returns True if the batch was full (more may be pending)."""
+        changes = self.store.pending_changes(self.batch_size)
+        if not changes:
+            return False
+
+        by_sheet = {}
+        for change_id, sheet_name, op, key, record in changes:
+            by_sheet.setdefault(sheet_name, []).append((change_id, op, key, record))
+
+        for sheet_name, entries in by_sheet.items():
+            self._flush_sheet(sheet_name, entries)
+            # only acknowledge once the spreadsheet has accepted the batch
+            self.store.ack_changes([e[0] for e in entries])
+
+        return len(changes) == self.batch_size
+
+    def _flush_sheet(self, sheet_name, entries):
+        # Coalesce: the latest op per row wins. Rows without a key can't be
+        # matched in the sheet, so they're append-only.
+        latest = {}
+        keyless = []
+        for change_id, op, key, record in entries:
+            if not key:
+                if op == "upsert":
+                    keyless.append(record)
+                continue
+            latest[key] = (op, record)
+
+        ws = self.sheets._worksheet(sheet_name)
+        values = ws.get_all_values()
+        sheet_headers = values[0] if values else []
+
+        # Union of spreadsheet headers and any new local columns
+        headers = list(sheet_headers)
+        known = {h.lower() for h in headers}
+        for h in self.store.get_headers(sheet_name):
+            if h.lower() not in known:
+                headers.append(h)
+                known.add(h.lower())
+        last_col = _col_letter(max(len(headers), 1))
+
+        def to_row(record):
+            lowered = {k.lower(): v for k, v in record.items()}
+            return [_cell(record.get(h, lowered.get(h.lower()))) for h in headers]
+
+        # Map each existing sheet row to its sync key
+        key_cols = SYNC_KEYS.get(sheet_name, [])
+        row_for_key = {}
+        for i, row in enumerate(values[1:], start=2):
+            rec = {h: (row[j] if j < len(row) else "") for j, h in enumerate(sheet_headers)}
+            k = sync_key(sheet_name, rec) if key_cols else ""
+            if k and k not in row_for_key:
+                row_for_key[k] = i
+
+        updates = []
+        appends = []
+        deletes = []
+        if headers != sheet_headers:
+            updates.append({"range": f"A1:{last_col}1", "values": [headers]})
+
+        for key, (op, record) in latest.items():
+            row_num = row_for_key.get(key)
+            if op == "delete":
+                if row_num:
+                    deletes.append(row_num)
+            elif row_num:
+                updates.append({"range": f"A{row_num}:{last_col}{row_num}", "values": [to_row(record)]})
+            else:
+                appends.append(to_row(record))
+        appends.extend(to_row(r) for r in keyless)
+
+        # Updates first (row numbers are still valid), then deletes, then appends at the end
+        if updates:
+            ws.batch_update(updates)
+        if deletes:
+            self.sheets._batch_delete_rows(ws, deletes)
+        if appends:
+            ws.append_rows(appends)
+
+        self.sheets._clear_cache(sheet_name)
+        print(f"🔄 Synced {sheet_name}: {len(updates)} updated, {len(appends)} appended, {len(deletes)} deleted")
@@ -0,0 +1,491 @@
+# backend/services/sqlite_store.py
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+from backend.config import (
+    SHEET_USERS, SHEET_EVENTS, SHEET_BOOKINGS,
+    SHEET_SPEAKERS, SHEET_COORDINATORS, SHEET_ATTENDANCE,
+    SHEET_AUDITORIUMS, SHEET_AUDITORIUM_LAYOUTS
+)
+from backend.services.storage import SheetStore
+
+ALL_SHEETS = [
+    SHEET_USERS, SHEET_EVENTS, SHEET_BOOKINGS, SHEET_SPEAKERS,
+    SHEET_COORDINATORS, SHEET_ATTENDANCE, SHEET_AUDITORIUMS,
+    SHEET_AUDITORIUM_LAYOUTS
+]
+
+# Sheet column -> indexed SQL column. Values are stored normalized (strip + lower)
+# so lookups match the case-insensitive semantics of GoogleSheets.find_row_index.
+INDEXED_COLUMNS = {
+    "USN": "usn",
+    "EventID": "event_id",
+    "BookingID": "booking_id",
+    "ID": "record_id",
+    "Name": "name",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_headers (
+    sheet   TEXT PRIMARY KEY,
+    headers TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    row_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    sheet      TEXT NOT NULL,
+    data       TEXT NOT NULL,
+    usn        TEXT,
+    event_id   TEXT,
+    booking_id TEXT,
+    record_id  TEXT,
+    name       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_records_sheet      ON records(sheet, row_id);
+CREATE INDEX IF NOT EXISTS idx_records_usn        ON records(sheet, usn);
+CREATE INDEX IF NOT EXISTS idx_records_event_id   ON records(sheet, event_id);
+CREATE INDEX IF NOT EXISTS idx_records_booking_id ON records(sheet, booking_id);
+CREATE INDEX IF NOT EXISTS idx_records_record_id  ON records(sheet, record_id);
+CREATE INDEX IF NOT EXISTS idx_records_name       ON records(sheet, name);
+CREATE TABLE IF NOT EXISTS sheet_versions (
+    sheet   TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_journal (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    sheet      TEXT NOT NULL,
+    op         TEXT NOT NULL,
+    sync_key   TEXT NOT NULL,
+    data       TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_lease (
+    name       TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Columns that identify a row when it is mirrored to Google Sheets by the
+# write-behind sync (see backend/services/sheets_sync.py).
+SYNC_KEYS = {
+    SHEET_USERS: ["USN"],
+    SHEET_EVENTS: ["ID"],
+    SHEET_BOOKINGS: ["BookingID"],
+    SHEET_SPEAKERS: ["ID"],
+    SHEET_COORDINATORS: ["USN"],
+    SHEET_AUDITORIUMS: ["Name"],
+    SHEET_ATTENDANCE: ["EventID", "USN", "Schedule"],
+    SHEET_AUDITORIUM_LAYOUTS: ["Auditorium", "Version"],
+}
+
+
+def _norm(value):
+    return str(value if value is not None else "").strip().lower()
+
+
+def sync_key(sheet_name, record):
+    """Stable identity of a row across the local store and the spreadsheet ("" if it has none)"""
+    cols = SYNC_KEYS.get(sheet_name, [])
+    if not any(_norm(record.get(c)) for c in cols):
+        return ""
+    return "|".join(_norm(record.get(c)) for c in cols)
+
+
+class SQLiteStore(SheetStore):
+    """
+    Local SQLite engine for the SheetStore interface.
+
+    Every sheet lives in one `records` table as a JSON row, with the key
+    columns (USN, EventID, BookingID, ID, Name) copied into indexed columns.
+    Row indexes handed out are the SQLite row_id, which stays stable across
+    deletes (unlike sheet row numbers).
+
+    read_range() keeps each sheet's rows in memory. Writes patch that copy
+    in place; every write also bumps the sheet's row in sheet_versions, so
+    when another process commits only the sheets it touched are reloaded.
+    """
+
+    def __init__(self, path):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        self._data_cache = {}      # sheet_name -> list of records
+        self._row_ids = {}         # sheet_name -> row_id of each cached record
+        self._cached_versions = {}  # sheet_name -> sheet_versions.version the cached rows match
+        self._generations = {}     # sheet_name -> bumped whenever the cached rows are dropped
+        self._data_version = None  # PRAGMA data_version seen at the last staleness check
+        self.journal_enabled = False  # set by the Sheets write-behind sync
+
+    # ---------- Internal helpers ----------
+    def _drop_stale_cache(self):
+        # data_version only moves when ANOTHER connection (e.g. a second gunicorn
+        # worker) commits; then only the sheets it wrote (version moved) are dropped.
+        # Our own writes patch the cached rows instead.
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        if not self._data_cache:
+            return
+        current = dict(self._conn.execute("SELECT sheet, version FROM sheet_versions").fetchall())
+        for sheet_name in list(self._data_cache):
+            if current.get(sheet_name, 0) != self._cached_versions.get(sheet_name):
+                self._drop_cache(sheet_name)
+
+    def _drop_cache(self, sheet_name):
+        self._generations[sheet_name] = self._generations.get(sheet_name, 0) + 1
+        self._data_cache.pop(sheet_name, None)
+        self._row_ids.pop(sheet_name, None)
+        self._cached_versions.pop(sheet_name, None)
+
+    def _bump_version(self, sheet_name):
+        """Moves the sheet's version inside the current write; returns the version it had before"""
+        row = self._conn.execute("SELECT version FROM sheet_versions WHERE sheet = ?", (sheet_name,)).fetchone()
+        before = row[0] if row else 0
+        self._conn.execute(
+            "INSERT INTO sheet_versions(sheet, version) VALUES (?, ?) "
+            "ON CONFLICT(sheet) DO UPDATE SET version = excluded.version",
+            (sheet_name, before + 1)
+        )
+        return before
+
+    def _patchable(self, sheet_name, before):
+        """
+        Cached rows of a sheet that is being written, or None. The cache is only
+        patched when it matches the version the write started from; if another
+        process got in between it is dropped and reloaded on the next read.
+        """
+        if sheet_name not in self._data_cache:
+            return None
+        if self._cached_versions.get(sheet_name) != before:
+            self._drop_cache(sheet_name)
+            return None
+        self._cached_versions[sheet_name] = before + 1
+        return self._data_cache[sheet_name]
+
+    @staticmethod
+    def _add_columns(data, record):
+        # columns added by this write show up as "" on the other cached rows
+        if data and len(record) > len(data[0]):
+            for h in record:
+                if h not in data[0]:
+                    for r in data:
+                        r.setdefault(h, "")
+
+    def _load_headers(self, sheet_name):
+        row = self._conn.execute(
+            "SELECT headers FROM sheet_headers WHERE sheet = ?", (sheet_name,)
+        ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def _save_headers(self, sheet_name, headers):
+        self._conn.execute(
+            "INSERT INTO sheet_headers(sheet, headers) VALUES (?, ?) "
+            "ON CONFLICT(sheet) DO UPDATE SET headers = excluded.headers",
+            (sheet_name, json.dumps(headers))
+        )
+
+    def _prepare(self, sheet_name, row_dict):
+        """Maps row_dict onto the sheet headers (case-insensitive), adding new columns on the fly"""
+        headers = self._load_headers(sheet_name)
+        header_map = {h.lower(): h for h in headers}
+
+        missing_headers = [k for k in row_dict.keys() if k.lower() not in header_map]
+        if missing_headers:
+            print(f"DEBUG: Found new columns for {sheet_name}: {missing_headers}")
+            headers.extend(missing_headers)
+            self._save_headers(sheet_name, headers)
+
+        record = {}
+        for h in headers:
+            val = row_dict.get(h)
+            if val is None:
+                for k, v in row_dict.items():
+                    if k.lower() == h.lower():
+                        val = v
+                        break
+            record[h] = val if val is not None else ""
+        return record
+
+    def _index_values(self, record):
+        return [
+            _norm(record.get(col)) if record.get(col) not in (None, "") else None
+            for col in INDEXED_COLUMNS
+        ]
+
+    def _to_record(self, headers, data):
+        row = json.loads(data)
+        return {h: row.get(h, "") for h in headers}
+
+    def _journal(self, sheet_name, op, record):
+        """Queues a change for the Sheets write-behind sync (same transaction as the write)"""
+        if not self.journal_enabled:
+            return
+        self._conn.execute(
+            "INSERT INTO sync_journal(sheet, op, sync_key, data, created_at) VALUES (?, ?, ?, ?, ?)",
+            (sheet_name, op, sync_key(sheet_name, record), json.dumps(record, default=str), time.time())
+        )
+
+    def _delete_where(self, sheet_name, where, params):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            headers = self._load_headers(sheet_name)
+            doomed = self._conn.execute(
+                f"SELECT row_id, data FROM records WHERE sheet = ? AND {where}", [sheet_name] + list(params)
+            ).fetchall()
+            before = None
+            if doomed:
+                for row_id, data in doomed:
+                    self._journal(sheet_name, "delete", self._to_record(headers, data))
+                self._conn.executemany("DELETE FROM records WHERE row_id = ?", [(r[0],) for r in doomed])
+                before = self._bump_version(sheet_name)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            self._drop_cache(sheet_name)
+            raise
+        if before is not None:
+            data = self._patchable(sheet_name, before)
+            if data is not None:
+                gone = {r[0] for r in doomed}
+                row_ids = self._row_ids[sheet_name]
+                keep = [i for i, row_id in enumerate(row_ids) if row_id not in gone]
+                # in place, like the Sheets engine: holders of the list see the deletion
+                data[:] = [data[i] for i in keep]
+                row_ids[:] = [row_ids[i] for i in keep]
+        return len(doomed)
+
+    # ---------- Primitives ----------
+    def read_range(self, sheet_name):
+        with self._lock:
+            self._drop_stale_cache()
+            if sheet_name in self._data_cache:
+                return self._data_cache[sheet_name]
+
+            # one read transaction, so the version matches the rows
+            self._conn.execute("BEGIN")
+            try:
+                headers = self._load_headers(sheet_name)
+                row = self._conn.execute(
+                    "SELECT version FROM sheet_versions WHERE sheet = ?", (sheet_name,)
+                ).fetchone()
+                rows = self._conn.execute(
+                    "SELECT row_id, data FROM records WHERE sheet = ? ORDER BY row_id", (sheet_name,)
+                ).fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+            data = [self._to_record(headers, r[1]) for r in rows]
+            self._data_cache[sheet_name] = data
+            self._row_ids[sheet_name] = [r[0] for r in rows]
+            self._cached_versions[sheet_name] = row[0] if row else 0
+            return data
+
+    def append_row(self, sheet_name, row_dict):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                record = self._prepare(sheet_name, row_dict)
+                cur = self._conn.execute(
+                    "INSERT INTO records(sheet, data, usn, event_id, booking_id, record_id, name) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [sheet_name, json.dumps(record, default=str)] + self._index_values(record)
+                )
+                self._journal(sheet_name, "upsert", record)
+                before = self._bump_version(sheet_name)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._drop_cache(sheet_name)
+                raise
+            data = self._patchable(sheet_name, before)
+            if data is not None:
+                self._add_columns(data, record)
+                data.append(record)
+                self._row_ids[sheet_name].append(cur.lastrowid)
+            return True
+
+    def write_row_by_index(self, sheet_name, row_index, row_dict):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                record = self._prepare(sheet_name, row_dict)
+                cur = self._conn.execute(
+                    "UPDATE records SET data = ?, usn = ?, event_id = ?, booking_id = ?, record_id = ?, name = ? "
+                    "WHERE row_id = ? AND sheet = ?",
+                    [json.dumps(record, default=str)] + self._index_values(record) + [row_index, sheet_name]
+                )
+                before = None
+                if cur.rowcount > 0:
+                    self._journal(sheet_name, "upsert", record)
+                    before = self._bump_version(sheet_name)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._drop_cache(sheet_name)
+                raise
+            data = self._patchable(sheet_name, before) if before is not None else None
+            if data is not None:
+                row_ids = self._row_ids[sheet_name]
+                pos = bisect.bisect_left(row_ids, row_index)
+                if pos < len(row_ids) and row_ids[pos] == row_index:
+                    self._add_columns(data, record)
+                    # a new dict, like the Sheets engine: readers holding the old row keep a consistent copy
+                    data[pos] = record
+                else:
+                    self._drop_cache(sheet_name)
+            return cur.rowcount > 0
+
+    def find_row_index(self, sheet_name, key_col_name, key_value):
+        with self._lock:
+            if key_col_name not in INDEXED_COLUMNS:
+                # Non-indexed column: fall back to a scan like the Sheets engine
+                for i, r in self.iter_rows(sheet_name):
+                    if _norm(r.get(key_col_name, "")) == _norm(key_value):
+                        return i, r
+                return None, None
+
+            row = self._conn.execute(
+                f"SELECT row_id, data FROM records WHERE sheet = ? AND {INDEXED_COLUMNS[key_col_name]} = ? "
+                "ORDER BY row_id LIMIT 1",
+                (sheet_name, _norm(key_value))
+            ).fetchone()
+            if not row:
+                return None, None
+            return row[0], self._to_record(self._load_headers(sheet_name), row[1])
+
+    def delete_row(self, sheet_name, row_index):
+        with self._lock:
+            self._delete_where(sheet_name, "row_id = ?", [row_index])
+
+    def delete_rows_matching(self, sheet_name, key_col_name, key_value):
+        with self._lock:
+            if key_col_name in INDEXED_COLUMNS:
+                self._delete_where(sheet_name, f"{INDEXED_COLUMNS[key_col_name]} = ?", [_norm(key_value)])
+            else:
+                doomed = [i for i, r in self.iter_rows(sheet_name)
+                          if str(r.get(key_col_name, "")).strip() == str(key_value)]
+                if doomed:
+                    marks = ",".join("?" * len(doomed))
+                    self._delete_where(sheet_name, f"row_id IN ({marks})", doomed)
+
+    def iter_rows(self, sheet_name):
+        with self._lock:
+            headers = self._load_headers(sheet_name)
+            rows = self._conn.execute(
+                "SELECT row_id, data FROM records WHERE sheet = ? ORDER BY row_id", (sheet_name,)
+            ).fetchall()
+        return [(row_id, self._to_record(headers, data)) for row_id, data in rows]
+
+    def get_headers(self, sheet_name):
+        with self._lock:
+            return self._load_headers(sheet_name)
+
+    def generation(self, sheet_name):
+        with self._lock:
+            self._drop_stale_cache()
+            return self._generations.get(sheet_name, 0)
+
+    def ensure_sheet(self, sheet_name, headers):
+        with self._lock:
+            if not self._load_headers(sheet_name):
+                self._save_headers(sheet_name, list(headers))
+
+    # ---------- Sheets write-behind journal ----------
+    def pending_changes(self, limit=500):
+        """Oldest queued changes as (id, sheet, op, sync_key, record) tuples"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, sheet, op, sync_key, data FROM sync_journal ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(r[0], r[1], r[2], r[3], json.loads(r[4])) for r in rows]
+
+    def ack_changes(self, ids):
+        with self._lock:
+            self._conn.executemany("DELETE FROM sync_journal WHERE id = ?", [(i,) for i in ids])
+
+    def acquire_lease(self, name, owner, ttl):
+        """Cross-process mutex so only one gunicorn worker runs the sync at a time"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT owner, expires_at FROM sync_lease WHERE name = ?", (name,)
+                ).fetchone()
+                if row and row[0] != owner and row[1] > now:
+                    self._conn.execute("COMMIT")
+                    return False
+                self._conn.execute(
+                    "INSERT INTO sync_lease(name, owner, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at",
+                    (name, owner, now + ttl)
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ---------- Import / export ----------
+    def import_from(self, source):
+        """Replaces the local copy of every sheet with the contents of `source` (e.g. GoogleSheets)"""
+        for sheet_name in ALL_SHEETS:
+            try:
+                headers = source.get_headers(sheet_name)
+                rows = source.read_range(sheet_name)
+            except Exception as e:
+                print(f"Skipping {sheet_name}: {e}")
+                continue
+
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute("DELETE FROM records WHERE sheet = ?", (sheet_name,))
+                    self._save_headers(sheet_name, list(headers))
+                    self._bump_version(sheet_name)
+                    for r in rows:
+                        record = {h: r.get(h, "") for h in headers}
+                        self._conn.execute(
+                            "INSERT INTO records(sheet, data, usn, event_id, booking_id, record_id, name) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [sheet_name, json.dumps(record, default=str)] + self._index_values(record)
+                        )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._drop_cache(sheet_name)
+            print(f"Imported {len(rows)} rows into {sheet_name}")
+
+    def export_to(self, target):
+        """Overwrites each sheet in `target` (a GoogleSheets instance) with the local rows"""
+        for sheet_name in ALL_SHEETS:
+            headers = self.get_headers(sheet_name)
+            if not headers:
+                continue
+            values = [headers]
+            for r in self.read_range(sheet_name):
+                row = []
+                for h in headers:
+                    val_str = str(r.get(h, ""))
+                    if len(val_str) > 40000:
+                        val_str = val_str[:40000] + "...(TRUNCATED)"
+                    row.append(val_str)
+                values.append(row)
+
+            ws = target._worksheet(sheet_name)
+            ws.clear()
+            ws.update("A1", values)
+            target._clear_cache(sheet_name)
+            print(f"Exported {len(values) - 1} rows to {sheet_name}")
@@ -0,0 +1,423 @@
+# backend/services/storage.py
+from backend.config import (
+    SHEET_USERS, SHEET_EVENTS, SHEET_BOOKINGS,
+    SHEET_SPEAKERS, SHEET_COORDINATORS, SHEET_ATTENDANCE,
+    SHEET_AUDITORIUMS, SHEET_AUDITORIUM_LAYOUTS
+)
+from datetime import datetime
+import uuid
+
+
+class SheetStore:
+    """
+    Storage interface shared by every backend (Google Sheets, local SQLite).
+
+    Engines implement the row-level primitives below; the sheet-specific
+    helpers the routes call (get_users, add_booking, ...) are built on top of
+    them, so routes never need to know which engine is behind `gs`.
+
+    Row indexes returned by find_row_index / iter_rows are opaque handles:
+    only pass them back into write_row_by_index / delete_row.
+    """
+
+    # ---------- Primitives (implemented by each engine) ----------
+    def read_range(self, sheet_name):
+        raise NotImplementedError
+
+    def append_row(self, sheet_name, row_dict):
+        raise NotImplementedError
+
+    def write_row_by_index(self, sheet_name, row_index, row_dict):
+        raise NotImplementedError
+
+    def find_row_index(self, sheet_name, key_col_name, key_value):
+        raise NotImplementedError
+
+    def delete_row(self, sheet_name, row_index):
+        raise NotImplementedError
+
+    def delete_rows_matching(self, sheet_name, key_col_name, key_value):
+        raise NotImplementedError
+
+    def iter_rows(self, sheet_name):
+        """Yields (row_index, record) pairs in sheet order"""
+        raise NotImplementedError
+
+    def generation(self, sheet_name):
+        """
+        Counter that moves when the cached rows of a sheet are reloaded, i.e.
+        when they may hold changes this process did not write itself. Writes
+        made through this store patch the cache and leave it alone.
+        """
+        raise NotImplementedError
+
+    def get_headers(self, sheet_name):
+        raise NotImplementedError
+
+    def ensure_sheet(self, sheet_name, headers):
+        """Creates the sheet with the given header row if it does not exist yet"""
+        raise NotImplementedError
+
+    # ---------- Users ----------
+    def get_users(self):
+        try:
+            return self.read_range(SHEET_USERS)
+        except Exception:
+            return []
+
+    def add_user(self, user):
+        return self.append_row(SHEET_USERS, user)
+
+    def update_user(self, usn, updates):
+        row_index, existing = self.find_row_index(SHEET_USERS, "USN", usn)
+        if not row_index:
+            return False
+        for k, v in updates.items():
+            existing[k] = v
+        return self.write_row_by_index(SHEET_USERS, row_index, existing)
+
+    def delete_user(self, usn):
+        row_index, _ = self.find_row_index(SHEET_USERS, "USN", usn)
+        if not row_index:
+            return False
+        self.delete_row(SHEET_USERS, row_index)
+        return True
+
+    # ---------- Events ----------
+    def get_events(self):
+        try:
+            return self.read_range(SHEET_EVENTS)
+        except Exception:
+            return []
+
+    def add_event(self, ev):
+        # 1. Fetch existing events to determine next ID
+        existing_events = self.get_events()
+
+        if not ev.get("ID"):
+            # Analyze existing IDs to find max number
+            max_num = 0
+            for e in existing_events:
+                eid = str(e.get("ID", "")).upper()
+                if eid.startswith("EV"):
+                    try:
+                        # Extract numeric part "EV01" -> 1
+                        num_part = int(eid[2:])
+                        if num_part > max_num:
+                            max_num = num_part
+                    except ValueError:
+                        pass
+
+            # Generate new ID
+            next_num = max_num + 1
+            ev["ID"] = f"EV{next_num:02d}"
+
+        # 2. Check for Duplicates (Double Check)
+        for e in existing_events:
+            # Case-insensitive check for ID collision
+            if str(e.get("ID", "")).strip().lower() == str(ev["ID"]).strip().lower():
+                # We could raise an error here if we wanted strict unique ID enforcement
+                # For now just proceed, assuming we want to overwrite or it's fine
+                pass
+
+        print(f"Adding Event: {ev['ID']}") # Debug log
+
+        # FAIL-SAFE SAVE ATTEMPT
+        try:
+            return self.append_row(SHEET_EVENTS, ev)
+        except Exception as e:
+            print(f"CRITICAL: Event Save Failed: {e}. Retrying with Clean Data...", flush=True)
+            # STRATEGIC FALLBACK: Strip heavy fields that likely caused the crash (e.g. Layout too big, Image too big)
+            # We preserve the ID and core info so the event is created.
+            ev_clean = ev.copy()
+            ev_clean["SeatLayout"] = ""
+            ev_clean["Poster"] = ""
+            ev_clean["Speakers"] = ""
+            ev_clean["Coordinators"] = ""
+            ev_clean["About"] += " [AUTO-RECOVERED: Some data omitted due to size error]"
+
+            try:
+                return self.append_row(SHEET_EVENTS, ev_clean)
+            except Exception as e2:
+                 print(f"FATAL: Recovery Save Failed too: {e2}", flush=True)
+                 raise e # Bubble up to global handler now
+
+    def update_event(self, event_id, updates):
+        row_index, existing = self.find_row_index(SHEET_EVENTS, "ID", event_id)
+        if not row_index:
+            return False
+        for k, v in updates.items():
+            existing[k] = v
+        return self.write_row_by_index(SHEET_EVENTS, row_index, existing)
+
+    def delete_event(self, event_id):
+        row_index, _ = self.find_row_index(SHEET_EVENTS, "ID", event_id)
+        if not row_index:
+            return False
+        self.delete_row(SHEET_EVENTS, row_index)
+        # cleanup related bookings and attendance
+        self.delete_bookings_for_event(event_id)
+        self.delete_attendance_for_event(event_id)
+        return True
+
+    def toggle_event_visibility(self, event_id, flag):
+        return self.update_event(event_id, {"Visibility": flag})
+
+    # ---------- Bookings ----------
+    def get_bookings(self):
+        try:
+            return self.read_range(SHEET_BOOKINGS)
+        except Exception:
+            return []
+
+    def add_booking(self, b):
+        if not b.get("BookingID"):
+            b["BookingID"] = str(uuid.uuid4())
+        if not b.get("Timestamp"):
+            b["Timestamp"] = datetime.utcnow().timestamp()
+        return self.append_row(SHEET_BOOKINGS, b)
+
+    def find_booking(self, booking_id):
+        return self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
+
+    def update_booking_status(self, booking_id, status):
+        row_index, existing = self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
+        if not row_index:
+            return False
+        existing["Status"] = status
+        return self.write_row_by_index(SHEET_BOOKINGS, row_index, existing)
+
+    def delete_booking(self, booking_id):
+        row_index, _ = self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
+        if not row_index:
+            return False
+        self.delete_row(SHEET_BOOKINGS, row_index)
+        return True
+
+    def delete_bookings_for_event(self, event_id):
+        self.delete_rows_matching(SHEET_BOOKINGS, "EventID", event_id)
+
+    def mark_booking_attendance(self, booking_id):
+        row_index, existing = self.find_row_index(SHEET_BOOKINGS, "BookingID", booking_id)
+        if not row_index:
+            return False
+
+        # We can add a new column "Attended" dynamically
+        existing["Attended"] = "Yes"
+        existing["AttendedAt"] = str(datetime.utcnow())
+
+        return self.write_row_by_index(SHEET_BOOKINGS, row_index, existing)
+
+    # ---------- Attendance ----------
+    def get_attendance(self):
+        try:
+            return self.read_range(SHEET_ATTENDANCE)
+        except Exception:
+            return []
+
+    def mark_attendance(self, event_id, usn, attended=True, schedule=None, auditorium=None, event_name=None, email=None):
+        try:
+            headers = self.get_headers(SHEET_ATTENDANCE)
+        except Exception:
+            headers = []
+
+        # Find match by EventID, USN, and Schedule (if provided)
+        target_schedule = str(schedule).strip() if schedule else ""
+
+        for i, r in self.iter_rows(SHEET_ATTENDANCE):
+            matched_event = str(r.get("EventID","")).strip() == str(event_id).strip()
+            matched_usn = str(r.get("USN","")).strip().lower() == str(usn).strip().lower()
+            matched_schedule = True
+            if target_schedule:
+                matched_schedule = str(r.get("Schedule","")).strip() == target_schedule
+
+            if matched_event and matched_usn and matched_schedule:
+                r["Attended"] = "Yes" if attended else "No"
+                r["Timestamp"] = str(datetime.utcnow())
+                if auditorium:
+                    r["Auditorium"] = str(auditorium)
+                if event_name:
+                    r["EventName"] = str(event_name)
+                if email:
+                    r["Email"] = str(email)
+                return self.write_row_by_index(SHEET_ATTENDANCE, i, r)
+
+        # append new record
+        new_row = {h: "" for h in headers}
+        new_row["EventID"] = event_id
+        new_row["USN"] = usn
+        new_row["Schedule"] = target_schedule
+        new_row["Attended"] = "Yes" if attended else "No"
+        new_row["Timestamp"] = str(datetime.utcnow())
+        if auditorium:
+            new_row["Auditorium"] = str(auditorium)
+        if event_name:
+            new_row["EventName"] = str(event_name)
+        if email:
+            new_row["Email"] = str(email)
+        return self.append_row(SHEET_ATTENDANCE, new_row)
+
+    def delete_attendance_for_event(self, event_id):
+        self.delete_rows_matching(SHEET_ATTENDANCE, "EventID", event_id)
+
+    # ---------- Speakers / Coordinators ----------
+    def get_speakers(self):
+        try:
+            return self.read_range(SHEET_SPEAKERS)
+        except Exception:
+            return []
+
+    def add_speaker(self, sp):
+        # sp = { "Name": "", "Photo": "", "Designation": "", "Department": "", "Bio": "" }
+        # Check duplicates by Name
+        current = self.get_speakers()
+        for c in current:
+            if str(c.get("Name", "")).lower() == str(sp.get("Name", "")).lower():
+                return False # already exists
+
+        # Determine ID? Or just append.
+        # Sheet columns: ID, Name, Photo, Designation, Department, Bio
+        if "ID" not in sp:
+             sp["ID"] = f"SP{len(current) + 1:03d}"
+
+        return self.append_row(SHEET_SPEAKERS, sp)
+
+    def update_speaker(self, sp_id, updates):
+        row_index, existing = self.find_row_index(SHEET_SPEAKERS, "ID", sp_id)
+        if not row_index:
+             return False
+        for k, v in updates.items():
+             existing[k] = v
+        return self.write_row_by_index(SHEET_SPEAKERS, row_index, existing)
+
+    def delete_speaker(self, sp_id):
+        row_index, _ = self.find_row_index(SHEET_SPEAKERS, "ID", sp_id)
+        if not row_index:
+            return False
+        self.delete_row(SHEET_SPEAKERS, row_index)
+        return True
+
+    def get_coordinators(self):
+        try:
+            return self.read_range(SHEET_COORDINATORS)
+        except Exception:
+            return []
+
+    def add_coordinator(self, coord):
+        # coord = { "USN": "", "Name": "", "Photo": "", "Department": "", "Contact": "", "About": "" }
+        # Check duplicates by Name (since we only capture Name in the event form usually)
+        current = self.get_coordinators()
+        for c in current:
+            if str(c.get("Name", "")).lower() == str(coord.get("Name", "")).lower():
+                return False
+
+        # If USN not provided, generate a placeholder or leave empty
+        # Sheet columns: USN, Name, Photo, Department, Contact, About
+        if "USN" not in coord or not coord["USN"]:
+             coord["USN"] = f"TEMP{len(current) + 1:03d}"
+
+        return self.append_row(SHEET_COORDINATORS, coord)
+
+    def update_coordinator(self, cid, updates):
+        # CID is usually USN
+        row_index, existing = self.find_row_index(SHEET_COORDINATORS, "USN", cid)
+        if not row_index:
+             return False
+        for k, v in updates.items():
+             existing[k] = v
+        return self.write_row_by_index(SHEET_COORDINATORS, row_index, existing)
+
+    def delete_coordinator(self, cid):
+        row_index, _ = self.find_row_index(SHEET_COORDINATORS, "USN", cid)
+        if not row_index:
+            return False
+        self.delete_row(SHEET_COORDINATORS, row_index)
+        return True
+
+    def get_auditoriums(self):
+        # THIS IS THE OLD HELPER getting names from Events
+        # We might want to deprecate this or merge with the new one.
+        # For now, let's look at the actual Auditoriums sheet first.
+        try:
+            # First try to fetch from the new Auditoriums sheet
+            auditoriums = self.read_range(SHEET_AUDITORIUMS)
+            if auditoriums:
+                return sorted([a.get("Name") for a in auditoriums if a.get("Name")])
+        except Exception:
+            pass
+
+        # Fallback to legacy method (reading from events)
+        try:
+            events = self.read_range(SHEET_EVENTS)
+            auditoriums = set()
+            for e in events:
+                val = e.get("Auditorium", "").strip()
+                if val:
+                    auditoriums.add(val)
+            return sorted(list(auditoriums))
+        except Exception:
+            return []
+
+    def get_auditoriums_full(self):
+        try:
+            data = self.read_range(SHEET_AUDITORIUMS)
+            print(f"DEBUG: get_auditoriums_full read {len(data)} records")
+            return data
+        except Exception as e:
+            print(f"Error fetching auditoriums: {e}")
+            return []
+
+    def add_auditorium(self, audi_data):
+        # audi_data = {Name, Capacity, Description, Status, SeatLayout}
+
+        # Ensure sheet exists with headers if it's new
+        self.ensure_sheet(SHEET_AUDITORIUMS, ["Name", "Capacity", "Description", "Status", "SeatLayout", "LayoutVersion"])
+
+        # Check duplicate name
+        current = self.get_auditoriums_full()
+        for c in current:
+            if str(c.get("Name", "")).lower() == str(audi_data.get("Name", "")).lower():
+                return False
+        if audi_data.get("SeatLayout"):
+            audi_data = {**audi_data, "LayoutVersion": 1}
+        ok = self.append_row(SHEET_AUDITORIUMS, audi_data)
+        if ok and audi_data.get("SeatLayout"):
+            self.add_layout_version(audi_data["Name"], 1, audi_data["SeatLayout"])
+        return ok
+
+    def update_auditorium(self, name, updates):
+        row_index, existing = self.find_row_index(SHEET_AUDITORIUMS, "Name", name)
+        if not row_index:
+            return False
+        old_layout = existing.get("SeatLayout", "")
+        old_version = int(existing.get("LayoutVersion") or 0)
+        for k, v in updates.items():
+            existing[k] = v
+
+        # A changed layout is a new version; events pinned to an older one keep resolving it
+        layout_changed = "SeatLayout" in updates and updates["SeatLayout"] != old_layout
+        if layout_changed:
+            existing["LayoutVersion"] = old_version + 1
+        ok = self.write_row_by_index(SHEET_AUDITORIUMS, row_index, existing)
+        if ok and layout_changed:
+            if old_version == 0 and old_layout:
+                # layout from before versioning: keep it resolvable as version 0
+                self.add_layout_version(existing.get("Name", name), 0, old_layout)
+            self.add_layout_version(existing.get("Name", name), old_version + 1, existing["SeatLayout"])
+        return ok
+
+    # ---------- Auditorium layout versions ----------
+    def get_layout_versions(self):
+        try:
+            return self.read_range(SHEET_AUDITORIUM_LAYOUTS)
+        except Exception:
+            return []
+
+    def add_layout_version(self, name, version, seat_layout):
+        self.ensure_sheet(SHEET_AUDITORIUM_LAYOUTS, ["Auditorium", "Version", "SeatLayout", "CreatedAt"])
+        return self.append_row(SHEET_AUDITORIUM_LAYOUTS, {
+            "Auditorium": name,
+            "Version": version,
+            "SeatLayout": seat_layout,
+            "CreatedAt": datetime.utcnow().isoformat(),
+        })
@@ -0,0 +1,97 @@
+# backend/services/ticket_codes.py
+import heapq
+import json
+import os
+import threading
+from backend.services.google_sheets import gs
+
+TICKET_CODES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ticket_codes.json")
+
+
+class TicketCodeAllocator:
+    """
+    Hands out codes from ticket_codes.json as BookingIDs, in file order.
+
+    The pool is loaded once. Used codes are taken from the Bookings sheet on
+    first use, so the allocator picks up where it left off after a restart.
+    After that it only moves a cursor forward, plus a min-heap of codes freed
+    by deleted bookings so the lowest free code is still handed out first.
+    Allocation is O(1) amortized (O(log n) when reusing freed codes).
+    """
+
+    def __init__(self, store, path=TICKET_CODES_PATH):
+        self.store = store
+        self.path = path
+        self._lock = threading.Lock()
+        self._codes = None     # pool in file order
+        self._position = {}    # code -> index in pool
+        self._used = set()     # indexes handed out or booked
+        self._cursor = 0       # next never-used index
+        self._freed = []       # min-heap of indexes released by deleted bookings
+
+    def _load(self):
+        # callers hold self._lock
+        if self._codes is not None:
+            return
+        codes = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    codes = json.load(f)
+            except Exception as e:
+                print(f"Error reading ticket codes: {e}")
+        self._codes = codes
+        self._position = {c: i for i, c in enumerate(codes)}
+
+        # Resume from the bookings that already hold a code
+        for b in self.store.get_bookings():
+            i = self._position.get(str(b.get("BookingID", "")))
+            if i is not None:
+                self._used.add(i)
+        print(f"🎟️ Ticket pool loaded: {len(codes)} codes, {len(self._used)} in use")
+
+    def _taken_elsewhere(self, code):
+        # Another worker may have booked this code since we loaded; the
+        # BookingID lookup is an indexed hit in both storage engines.
+        row_index, _ = self.store.find_booking(code)
+        return bool(row_index)
+
+    def allocate(self):
+        """Next free code, or None if the pool is exhausted"""
+        with self._lock:
+            self._load()
+            while self._freed:
+                i = heapq.heappop(self._freed)
+                if i not in self._used and not self._taken_elsewhere(self._codes[i]):
+                    self._used.add(i)
+                    return self._codes[i]
+            while self._cursor < len(self._codes):
+                i = self._cursor
+                self._cursor += 1
+                if i in self._used:
+                    continue
+                self._used.add(i)
+                if self._taken_elsewhere(self._codes[i]):
+                    continue
+                return self._codes[i]
+            return None
+
+    def release(self, code):
+        """Returns a code to the pool (booking deleted or never saved)"""
+        with self._lock:
+            i = self._position.get(str(code))
+            if i is None or i not in self._used:
+                return
+            self._used.discard(i)
+            heapq.heappush(self._freed, i)
+
+    def reload(self):
+        """Re-reads ticket_codes.json (e.g. after the pool was extended)"""
+        with self._lock:
+            self._codes = None
+            self._used = set()
+            self._cursor = 0
+            self._freed = []
+
+# single instance shared by the booking routes
+ticket_codes = TicketCodeAllocator(gs)
@@ -1,53 +1,56 @@
 
 import sys
-import os
-import json
-from backend.services.google_sheets import GoogleSheets, SHEET_EVENTS, SHEET_AUDITORIUMS
+from backend.services.google_sheets import GoogleSheets
+from backend.services.auditorium_layouts import AuditoriumLayouts
+from backend.services.seat_layout import compact_cell
 
-def sync_layouts():
+# Events no longer carry a copy of the auditorium layout: they reference it
+# (LayoutRef) and follow the auditorium's current version, so publishing a new
+# master layout is one update_auditorium call and no event rows are written.
+# This script only converts events that still hold a copy (or nothing) into
+# references; once converted, re-running it writes nothing.
+#   python -m backend.sync_hallama_events ["Auditorium Name"]
+
+def sync_layouts(auditorium="Hallama Auditorium"):
     print("Connecting to Google Sheets...")
     gs = GoogleSheets()
-    
-    # 1. Get Master Layout for Hallama
-    auditoriums = gs.get_auditoriums_full()
-    hallama = next((a for a in auditoriums if a.get("Name") == "Hallama Auditorium"), None)
-    
-    if not hallama:
-        print("ERROR: Hallama Auditorium not found in master sheet!")
-        return
-        
-    master_layout = hallama.get("SeatLayout", "")
-    if not master_layout:
-        print("ERROR: Hallama Auditorium has no SeatLayout!")
+    layouts = AuditoriumLayouts(gs)
+
+    # 1. Master layout (stored compact; converting it counts as a new version)
+    version, master_layout = layouts.current(auditorium)
+    if master_layout is None:
+        print(f"ERROR: {auditorium} not found in master sheet or has no SeatLayout!")
         return
-        
-    print(f"Found Master Layout. Length: {len(master_layout)} chars")
-    
-    # 2. Get Events
+    if compact_cell(master_layout) != master_layout:
+        gs.update_auditorium(auditorium, {"SeatLayout": compact_cell(master_layout)})
+        version, master_layout = layouts.current(auditorium)
+    print(f"Master layout v{version}: {len(master_layout)} chars")
+
+    # 2. Convert event copies into references
     events = gs.get_events()
     updates_count = 0
-    
-    print(f"Scanning {len(events)} events...")
-    
     for ev in events:
-        if ev.get("Auditorium") == "Hallama Auditorium":
-            # Check if layout is missing or different (simplified check)
-            current_layout = ev.get("SeatLayout", "")
-            if not current_layout or len(current_layout) < 100:
-                print(f"Updating Event '{ev.get('Name')}' (ID: {ev.get('ID')})...")
-                
-                # Update specific event
-                # We use update_event but we need to ensure we pass the layout
-                ok = gs.update_event(ev.get("ID"), {"SeatLayout": master_layout})
-                if ok:
-                    print("  -> Success")
-                    updates_count += 1
-                else:
-                    print("  -> Failed to update")
-            else:
-                print(f"Event '{ev.get('Name')}' already has a layout. Skipping.")
-
-    print(f"Done. Updated {updates_count} events.")
+        if ev.get("Auditorium") != auditorium:
+            continue
+        if ev.get("LayoutRef") and not ev.get("SeatLayout"):
+            continue  # already a reference
+
+        if ev.get("SeatLayout"):
+            # keeps per-event changes as a diff; a layout of another size stays a copy
+            columns = layouts.reference(auditorium, compact_cell(ev["SeatLayout"]))
+        else:
+            columns = {"LayoutRef": auditorium, "LayoutDiff": "", "SeatLayout": ""}
+        if columns["SeatLayout"]:
+            print(f"Event '{ev.get('Name')}' (ID: {ev.get('ID')}) has a layout of another size. Skipping.")
+            continue
+
+        print(f"Referencing {columns['LayoutRef']} from '{ev.get('Name')}' (ID: {ev.get('ID')})...")
+        if gs.update_event(ev.get("ID"), columns):
+            updates_count += 1
+        else:
+            print("  -> Failed to update")
+
+    print(f"Done. Converted {updates_count} events.")
 
 if __name__ == "__main__":
-    sync_layouts()
+    sync_layouts(*sys.argv[1:2])
@@ -0,0 +1,27 @@
+import sys
+from backend.config import SQLITE_PATH
+from backend.services.google_sheets import GoogleSheets
+from backend.services.sqlite_store import SQLiteStore
+
+# Usage:
+#   python -m backend.sync_local_store import   -> copy Google Sheets into the local SQLite store
+#   python -m backend.sync_local_store export   -> push the local SQLite store back to Google Sheets
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else ""
+    if mode not in ("import", "export"):
+        print("Usage: python -m backend.sync_local_store [import|export]")
+        return
+
+    print("Connecting to Google Sheets...")
+    sheets = GoogleSheets()
+    local = SQLiteStore(SQLITE_PATH)
+
+    if mode == "import":
+        local.import_from(sheets)
+    else:
+        local.export_to(sheets)
+    print("Done.")
+
+if __name__ == "__main__":
+    main()
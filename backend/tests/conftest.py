@@ -0,0 +1,13 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+
+# Importing backend.services.* opens the configured store, so the tests point
+# every file at a throwaway directory and never touch Google Sheets.
+_tmp = tempfile.mkdtemp(prefix="bookevntz-tests-")
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["SHEETS_SYNC"] = "false"
+os.environ["SQLITE_PATH"] = os.path.join(_tmp, "store.db")
+os.environ["MAIL_OUTBOX_PATH"] = os.path.join(_tmp, "outbox.db")
+os.environ["MAIL_OUTBOX_DRAIN_IN_PROCESS"] = "false"
+os.environ.setdefault("SESSION_SECRET", "test-secret")
@@ -0,0 +1,48 @@
+# backend/tests/test_auditorium_layouts.py
+import pytest
+from backend.services.auditorium_layouts import make_diff, apply_diff, parse_ref, format_ref
+
+
+BASE = {"rows": 2, "cols": 3, "grid": [[1, 1, 1], [2, 2, 0]]}
+
+
+def test_diff_round_trip():
+    layout = {"rows": 2, "cols": 3, "grid": [[1, 3, 1], [2, 2, 1]]}
+    diff = make_diff(BASE, layout)
+    assert diff == "0:1=3,1:2=1"
+    assert apply_diff(BASE, diff) == layout
+
+
+def test_identical_layouts_have_an_empty_diff():
+    assert make_diff(BASE, {"rows": 2, "cols": 3, "grid": [row[:] for row in BASE["grid"]]}) == ""
+    assert apply_diff(BASE, "") is BASE
+
+
+def test_other_size_has_no_diff():
+    assert make_diff(BASE, {"rows": 3, "cols": 3, "grid": [[1] * 3] * 3}) is None
+
+
+def test_ragged_legacy_grids_count_missing_cells_as_gaps():
+    ragged = {"rows": 2, "cols": 3, "grid": [[1, 1]]}
+    full = {"rows": 2, "cols": 3, "grid": [[1, 1, 1], [0, 0, 0]]}
+    assert make_diff(ragged, full) == "0:2=1"
+    assert make_diff(ragged, {"rows": 2, "cols": 3, "grid": []}) == "0:0=0,0:1=0"
+    assert apply_diff(ragged, "1:1=2") == {"rows": 2, "cols": 3, "grid": [[1, 1, 0], [0, 2, 0]]}
+
+
+def test_apply_diff_does_not_touch_the_base():
+    apply_diff(BASE, "0:0=3")
+    assert BASE["grid"][0][0] == 1
+
+
+@pytest.mark.parametrize("diff", ["2:0=1", "0:3=1", "0:0=5", "-1:0=1"])
+def test_apply_diff_rejects_out_of_range_entries(diff):
+    with pytest.raises(ValueError):
+        apply_diff(BASE, diff)
+
+
+def test_refs():
+    assert parse_ref("Hallama Auditorium@3") == ("Hallama Auditorium", 3)
+    assert parse_ref("Hallama Auditorium") == ("Hallama Auditorium", None)
+    assert parse_ref("Hall @ Main") == ("Hall @ Main", None)
+    assert format_ref("Hall", 2) == "Hall@2" and format_ref("Hall") == "Hall"
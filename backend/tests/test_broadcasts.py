@@ -0,0 +1,65 @@
+# backend/tests/test_broadcasts.py
+import pytest
+from backend.services import broadcasts as broadcasts_module
+from backend.services.broadcasts import BroadcastRunner
+from backend.services.email_service import EmailService
+from backend.services.mail_outbox import MailOutbox
+
+
+class BookingsStore:
+    def __init__(self, bookings):
+        self.bookings = bookings
+
+    def get_users(self):
+        return [{"USN": "U1", "Name": "Asha", "Email": "asha@x.com"}]
+
+    def iter_rows(self, sheet_name):
+        for i, b in enumerate(self.bookings):
+            yield i + 2, b
+
+
+class FakeCatalog:
+    def get(self, event_id):
+        return {"EventID": event_id, "Name": "Show"}
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    monkeypatch.setattr(broadcasts_module, "event_catalog", FakeCatalog())
+    monkeypatch.setattr(EmailService, "credentials_ok", staticmethod(lambda: True))
+    store = BookingsStore([])
+    return BroadcastRunner(store, MailOutbox(str(tmp_path / "outbox.db")))
+
+
+def test_resumed_job_reminds_a_rebooked_ticket_code(runner):
+    runner.store.bookings = [
+        {"BookingID": "T1", "EventID": "E1", "USN": "U1", "Status": "confirmed", "Timestamp": 1000.5},
+    ]
+    runner.outbox.create_job("j1", "E1", None, "hello")
+    runner._run("j1")
+    assert runner.outbox.stats() == {"pending": 1}
+
+    # the booking is deleted and its recycled code booked again before the job is resumed
+    runner.store.bookings = [
+        {"BookingID": "T1", "EventID": "E1", "USN": "U1", "Status": "confirmed", "Timestamp": 2000.25},
+    ]
+    runner._run("j1")
+    assert runner.outbox.stats() == {"pending": 2}
+
+    # resuming again queues nothing new
+    runner._run("j1")
+    job = runner.outbox.get_job("j1")
+    assert (job["status"], job["enqueued"]) == ("enqueued", 2)
+
+
+def test_job_fails_without_email_credentials(runner, monkeypatch):
+    monkeypatch.setattr(EmailService, "credentials_ok", staticmethod(lambda: False))
+    runner.store.bookings = [
+        {"BookingID": "T1", "EventID": "E1", "USN": "U1", "Status": "confirmed", "Timestamp": 1000.5},
+    ]
+    runner.outbox.create_job("j1", "E1", None, "hello")
+    runner._run("j1")
+    job = runner.outbox.get_job("j1")
+    assert (job["status"], job["last_error"]) == ("failed", "email credentials not set")
+    assert runner.outbox.stats() == {}
+
@@ -0,0 +1,130 @@
+# backend/tests/test_email_templates.py
+from backend.services.email_templates import EmailTemplates
+
+
+class LegacyEmail:
+    """The f-string confirmation email EmailService rendered before the compiled templates"""
+
+    @staticmethod
+    def confirmation(user_name, booking_details):
+        subject = f"Booking Confirmed: {booking_details.get('event_name')} - {booking_details.get('booking_id')}"
+        
+        # Template
+        poster_html = ""
+        if booking_details.get("poster"):
+            poster_html = f'<img src="{booking_details.get("poster")}" alt="Event Banner" style="width: 100%; max-height: 200px; object-fit: cover; border-radius: 8px 8px 0 0; display: block;">'
+        
+        qr_html = ""
+        if booking_details.get("qr_url"):
+            qr_html = f'<div style="text-align: center; margin: 20px 0;"><img src="{booking_details.get("qr_url")}" alt="Ticket QR Code" style="width: 150px; height: 150px; border: 2px dashed #4CAF50; padding: 10px; border-radius: 8px;"></div>'
+
+        # Template
+        html_content = f"""
+        <div style="font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; color: #333; max-width: 600px; margin: 0 auto; background-color: #ffffff; border: 1px solid #e0e0e0; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.1);">
+            
+            {poster_html}
+            
+            <div style="padding: 30px;">
+                <!-- Header with Green Animated-style Check -->
+                <div style="text-align: center; margin-bottom: 25px;">
+                    <div style="display: inline-block; background-color: #e8f5e9; border-radius: 50%; padding: 15px; margin-bottom: 10px;">
+                        <span style="font-size: 40px; color: #2e7d32; line-height: 1;">✅</span>
+                    </div>
+                    <h1 style="color: #2e7d32; margin: 0; font-size: 24px; font-weight: 700;">Booking Confirmed!</h1>
+                    <p style="color: #666; margin-top: 5px; font-size: 16px;">You are all set, {user_name.split()[0]}! 🎉</p>
+                </div>
+
+                <p style="font-size: 16px; line-height: 1.6; color: #444; text-align: center;">
+                    Thank you for booking with us. We are thrilled to have you! <br>
+                    Here is your official ticket for <strong>{booking_details.get('event_name')}</strong>.
+                </p>
+
+                <!-- Ticket Card -->
+                <div style="background-color: #f9f9f9; border: 1px solid #ddd; border-radius: 12px; padding: 20px; margin: 25px 0; position: relative;">
+                    <div style="border-left: 4px solid #2e7d32; padding-left: 15px;">
+                        <h3 style="margin: 0 0 15px 0; color: #000; font-size: 18px;">🎟️ Event Details</h3>
+                        
+                        <div style="margin-bottom: 10px;">
+                            <strong style="color: #555; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px;">Event</strong>
+                            <div style="font-size: 16px; font-weight: 600;">{booking_details.get('event_name')}</div>
+                        </div>
+
+                        <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Date</strong>
+                                <div style="font-size: 15px;">{booking_details.get('date')}</div>
+                            </div>
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Time</strong>
+                                <div style="font-size: 15px;">{booking_details.get('time')}</div>
+                            </div>
+                        </div>
+
+                        <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Venue</strong>
+                                <div style="font-size: 15px;">{booking_details.get('venue')}</div>
+                            </div>
+                            <div>
+                                <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Seats</strong>
+                                <div style="font-size: 15px;">{booking_details.get('seats')}</div>
+                            </div>
+                        </div>
+
+                        <div style="margin-top: 15px; padding-top: 10px; border-top: 1px dashed #ccc;">
+                            <strong style="color: #555; font-size: 12px; text-transform: uppercase;">Booking ID</strong>
+                            <div style="font-family: 'Courier New', monospace; font-size: 16px; letter-spacing: 1px; color: #333;">#{booking_details.get('booking_id')}</div>
+                        </div>
+                    </div>
+
+                    {qr_html}
+                    <div style="text-align: center; color: #888; font-size: 12px;">Scan this QR code at the entrance</div>
+                </div>
+
+                <div style="text-align: center; font-size: 14px; color: #666; margin-top: 30px;">
+                    <p>We hope you have a wonderful time at the event! ✨</p>
+                    <p>If you have any questions, feel free to reach out to the coordinators.</p>
+                </div>
+            </div>
+
+            <div style="background-color: #2e7d32; padding: 15px; text-align: center; color: white; font-size: 12px;">
+                © 2026 GM University Auditorium Management<br>
+                <a href="#" style="color: #a5d6a7; text-decoration: none;">View My Bookings</a>
+            </div>
+        </div>
+        """
+        return subject, html_content
+
+
+FULL_BOOKING = {
+    "event_id": "E1",
+    "event_name": "Tech Fest",
+    "poster": "https://example.com/poster.png",
+    "venue": "Hallama Auditorium",
+    "date": "Sat, 21 Feb 2026",
+    "time": "10:36 AM",
+    "seats": "A1,A2",
+    "booking_id": "B-1",
+    "qr_url": "https://example.com/qr/B-1.png",
+}
+
+
+def test_confirmation_matches_legacy_output():
+    templates = EmailTemplates()
+    assert templates.render_confirmation("Asha Rao", FULL_BOOKING) == LegacyEmail.confirmation("Asha Rao", FULL_BOOKING)
+
+
+def test_missing_fields_render_like_legacy_output():
+    # fields the route may not have: the old f-strings printed None for them
+    booking = {"event_id": "E2", "booking_id": "B-2", "seats": ""}
+    templates = EmailTemplates()
+    subject, body = templates.render_confirmation("Asha", booking)
+    assert (subject, body) == LegacyEmail.confirmation("Asha", booking)
+    assert "None" in subject
+
+
+def test_cached_event_fragment_is_reused_per_booking():
+    templates = EmailTemplates()
+    other = dict(FULL_BOOKING, booking_id="B-9", seats="C3", qr_url=None)
+    templates.render_confirmation("Asha Rao", FULL_BOOKING)
+    assert templates.render_confirmation("Ravi", other) == LegacyEmail.confirmation("Ravi", other)
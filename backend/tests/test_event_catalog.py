@@ -0,0 +1,40 @@
+# backend/tests/test_event_catalog.py
+from backend.services.event_models import EventCatalog
+
+
+class EventsStore:
+    def __init__(self, events):
+        self.events = events
+        self.gen = 0
+
+    def get_events(self):
+        return self.events
+
+    def generation(self, sheet_name):
+        return self.gen
+
+
+def test_unknown_id_does_not_rebuild():
+    store = EventsStore([{"ID": "E1", "Name": "Show"}])
+    catalog = EventCatalog(store)
+    assert catalog.get("E1").name == "Show"
+    by_id = catalog._by_id
+    for _ in range(3):
+        assert catalog.get("nope") is None
+    assert catalog._by_id is by_id
+
+
+def test_generation_move_and_stale_position_rebuild():
+    store = EventsStore([{"ID": "E1"}, {"ID": "E2"}])
+    catalog = EventCatalog(store)
+    assert catalog.get("E2").id == "E2"
+
+    # reloaded in place by another worker's write: the generation moves
+    store.events[:] = [{"ID": "E3"}, {"ID": "E2"}]
+    store.gen += 1
+    assert catalog.get("E3").id == "E3"
+
+    # same generation, row swapped in place: the stale hit rebuilds once
+    store.events[0] = {"ID": "E4"}
+    assert catalog.get("E3") is None
+    assert catalog.get("E4").id == "E4"
@@ -0,0 +1,19 @@
+# backend/tests/test_listing.py
+from backend.services.listing import select_fields, selects_field
+
+ROWS = [{"ID": "E1", "Name": "Show", "SeatLayout": "SL1:...", "Poster": "p.png", "Password": "x"}]
+
+
+def test_selects_field_matches_select_fields():
+    cases = [
+        ({}, ()),
+        ({"limit": "10"}, ()),
+        ({"limit": "10", "fields": "ID,SeatLayout"}, ()),
+        ({"fields": "ID,Name"}, ()),
+        ({}, ("Password",)),
+        ({"fields": "ID,Password"}, ("Password",)),
+    ]
+    for args, exclude in cases:
+        kept = set(select_fields(ROWS, args, exclude)[0])
+        for field in ROWS[0]:
+            assert selects_field(args, field, exclude) == (field in kept), (args, field)
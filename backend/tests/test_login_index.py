@@ -0,0 +1,62 @@
+# backend/tests/test_login_index.py
+from backend.services.login_index import LoginIndex
+
+
+class UsersStore:
+    def __init__(self, users):
+        self.users = users
+        self.gen = 0
+
+    def get_users(self):
+        return self.users
+
+    def generation(self, sheet_name):
+        return self.gen
+
+    def reload(self, users):
+        # what a cache refresh looks like: a new list and a new generation
+        self.users = users
+        self.gen += 1
+
+
+def _user(usn, phone="", name=""):
+    return {"USN": usn, "Phone": phone, "Name": name}
+
+
+def test_finds_by_usn_phone_and_name():
+    index = LoginIndex(UsersStore([_user("1AB01", "09876543210", "Asha Rao"), _user("1AB02", "123", "Ravi")]))
+    assert index.find("1ab01")["USN"] == "1AB01"
+    assert index.find("9876543210.0")["USN"] == "1AB01"
+    assert index.find("ravi")["USN"] == "1AB02"
+    assert index.find("ravi", role="admin") is None
+    assert index.find("1AB02", role="admin")["USN"] == "1AB02"
+
+
+def test_unknown_login_does_not_rebuild():
+    store = UsersStore([_user("1AB01")])
+    index = LoginIndex(store)
+    assert index.find("1AB01")
+    maps = index._maps
+    for _ in range(3):
+        assert index.find("nobody") is None
+    assert index._maps is maps
+
+    # appended in place: indexed without a rebuild
+    store.users.append(_user("1AB02"))
+    assert index.find("1AB02")["USN"] == "1AB02"
+    assert index._maps is maps
+
+
+def test_reload_and_stale_positions_rebuild():
+    store = UsersStore([_user("1AB01"), _user("1AB02")])
+    index = LoginIndex(store)
+    assert index.find("1AB02")
+
+    store.reload([_user("1AB03")])
+    assert index.find("1AB03")["USN"] == "1AB03"
+    assert index.find("1AB02") is None
+
+    # a row replaced in place: the stale hit is re-checked and rebuilt
+    store.users[0] = _user("1AB04")
+    assert index.find("1AB03") is None
+    assert index.find("1AB04")["USN"] == "1AB04"
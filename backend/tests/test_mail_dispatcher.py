@@ -0,0 +1,47 @@
+# backend/tests/test_mail_dispatcher.py
+import pytest
+from backend.services import mail_dispatcher as dispatcher_module
+from backend.services.mail_dispatcher import MailDispatcher
+
+
+class FakeSMTP:
+    offers = set()  # extensions the fake server advertises
+
+    def __init__(self, host, port, timeout=None):
+        self.calls = []
+        self.extensions = set(FakeSMTP.offers)
+
+    def ehlo(self):
+        self.calls.append("ehlo")
+
+    def has_extn(self, name):
+        return name in self.extensions
+
+    def starttls(self, context=None):
+        self.calls.append("starttls")
+
+    def login(self, username, password):
+        self.calls.append("login")
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    monkeypatch.setattr(dispatcher_module.smtplib, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+def _dispatcher(**kwargs):
+    return MailDispatcher(host="mail.test", port=587, use_ssl=False,
+                          username="a@x.com", password="pw", auth=True, **kwargs)
+
+
+def test_starttls_before_login_when_offered(smtp):
+    smtp.offers = {"starttls"}
+    assert _dispatcher()._connect().calls == ["ehlo", "starttls", "ehlo", "login"]
+
+
+def test_plain_when_not_offered_or_disabled(smtp):
+    smtp.offers = set()
+    assert _dispatcher()._connect().calls == ["ehlo", "login"]
+    smtp.offers = {"starttls"}
+    assert _dispatcher(starttls=False)._connect().calls == ["login"]
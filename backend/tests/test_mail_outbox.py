@@ -0,0 +1,122 @@
+# backend/tests/test_mail_outbox.py
+import json
+import threading
+import pytest
+from backend.services import email_service
+from backend.services.email_service import EmailService
+from backend.services.mail_outbox import MailOutbox, OutboxDrainer
+from backend.services.ticket_codes import TicketCodeAllocator
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return MailOutbox(str(tmp_path / "outbox.db"))
+
+
+def test_enqueue_dedupes(outbox):
+    assert outbox.enqueue("a@x.com", "s", "<p>", dedupe_key="k1") is True
+    assert outbox.enqueue("a@x.com", "s", "<p>", dedupe_key="k1") is False
+    assert outbox.enqueue_many([("a@x.com", "s", "<p>", "k1"), ("b@x.com", "s", "<p>", "k2")]) == 1
+    assert outbox.stats() == {"pending": 2}
+
+
+def test_claimed_messages_are_not_claimed_twice(outbox):
+    for i in range(3):
+        outbox.enqueue(f"{i}@x.com", "s", "<p>")
+    first = outbox.claim_batch(limit=2)
+    assert [m["to_email"] for m in first] == ["0@x.com", "1@x.com"]
+    second = outbox.claim_batch(limit=2)
+    assert [m["to_email"] for m in second] == ["2@x.com"]
+    assert outbox.claim_batch() == []
+
+
+def test_sent_and_failed(outbox):
+    outbox.enqueue("a@x.com", "s", "<p>")
+    outbox.enqueue("b@x.com", "s", "<p>")
+    a, b = outbox.claim_batch()
+    outbox.mark_sent(a["id"])
+    outbox.mark_failed(b["id"], "boom", max_attempts=2)
+    assert outbox.stats() == {"sent": 1, "pending": 1}
+    # back in the queue, then parked once its attempts are used up
+    [b] = outbox.claim_batch()
+    outbox.mark_failed(b["id"], "boom", max_attempts=2)
+    assert outbox.stats() == {"sent": 1, "failed": 1}
+    assert outbox.claim_batch() == []
+
+
+def test_expired_lease_is_reclaimed_then_failed(outbox):
+    outbox.enqueue("a@x.com", "s", "<p>")
+    # the sender died mid-send: its lease expires and the message is claimed again
+    assert len(outbox.claim_batch(lease_seconds=-1, max_attempts=2)) == 1
+    assert len(outbox.claim_batch(lease_seconds=-1, max_attempts=2)) == 1
+    # ... until it used up its attempts
+    assert outbox.claim_batch(lease_seconds=-1, max_attempts=2) == []
+    assert outbox.stats() == {"failed": 1}
+
+
+def test_live_lease_is_not_reclaimed(outbox):
+    outbox.enqueue("a@x.com", "s", "<p>")
+    assert len(outbox.claim_batch(lease_seconds=300)) == 1
+    assert outbox.claim_batch(lease_seconds=300) == []
+
+
+class BookingStore:
+    """Just enough of the store for the ticket code allocator"""
+
+    def __init__(self):
+        self.bookings = []
+
+    def get_bookings(self):
+        return self.bookings
+
+    def find_booking(self, booking_id):
+        for i, b in enumerate(self.bookings):
+            if b["BookingID"] == booking_id:
+                return i + 2, b
+        return None, None
+
+
+def test_rebooked_ticket_code_gets_its_own_confirmation(outbox, tmp_path, monkeypatch):
+    monkeypatch.setattr(email_service, "mail_outbox", outbox)
+    monkeypatch.setattr(EmailService, "credentials_ok", staticmethod(lambda: True))
+    codes = tmp_path / "ticket_codes.json"
+    codes.write_text(json.dumps(["T1", "T2"]))
+    store = BookingStore()
+    allocator = TicketCodeAllocator(store, path=str(codes))
+
+    def book(timestamp):
+        code = allocator.allocate()
+        store.bookings.append({"BookingID": code, "Timestamp": timestamp})
+        EmailService.send_booking_confirmation("a@x.com", "Asha", {
+            "event_id": "E1", "event_name": "Show", "booking_id": code, "timestamp": timestamp,
+        })
+        return code
+
+    first = book(1000.5)
+    # the booking is deleted and its code goes back to the pool
+    store.bookings.clear()
+    allocator.release(first)
+    assert book(2000.25) == first
+
+    assert outbox.stats() == {"pending": 2}
+
+
+class BusyDispatcher:
+    """Delivers each message on its own thread; other senders keep its queue busy"""
+
+    def submit(self, sender, to_email, message_str, on_result=None, timeout=0):
+        threading.Thread(target=on_result, args=(not to_email.startswith("bad"), "rejected")).start()
+        return True
+
+    def join(self):
+        raise AssertionError("drain_once must not wait for the whole shared queue")
+
+
+def test_drain_once_waits_only_for_its_batch(outbox):
+    outbox.enqueue("a@x.com", "s", "<p>")
+    outbox.enqueue("bad@x.com", "s", "<p>")
+    drainer = OutboxDrainer(outbox, BusyDispatcher(), batch_size=10)
+    assert drainer.drain_once() == 2
+    # both results were recorded before drain_once returned
+    assert outbox.stats() == {"sent": 1, "pending": 1}
+
@@ -0,0 +1,53 @@
+# backend/tests/test_seat_layout.py
+import json
+import pytest
+from backend.services.seat_layout import encode_layout, decode_layout, compact_cell, is_compact
+
+
+def _layout(rows, cols, cell=lambda r, c: 1):
+    return {"rows": rows, "cols": cols, "grid": [[cell(r, c) for c in range(cols)] for r in range(rows)]}
+
+
+@pytest.mark.parametrize("layout", [
+    _layout(1, 1),
+    _layout(3, 4, lambda r, c: (r + c) % 4),
+    _layout(30, 60, lambda r, c: 0 if c in (20, 40) else (2 if r < 3 else 1)),
+    _layout(2, 200),             # runs longer than one byte can hold
+    _layout(0, 0),
+    _layout(3, 0),
+])
+def test_round_trip(layout):
+    text = encode_layout(layout)
+    assert is_compact(text)
+    assert decode_layout(text) == layout
+
+
+def test_encodes_legacy_json_and_pads_short_rows():
+    legacy = json.dumps({"rows": 2, "cols": 3, "grid": [[1, 2], [3]]})
+    assert decode_layout(encode_layout(legacy)) == {"rows": 2, "cols": 3, "grid": [[1, 2, 0], [3, 0, 0]]}
+
+
+def test_rejects_unknown_cells():
+    with pytest.raises(ValueError):
+        encode_layout({"rows": 1, "cols": 2, "grid": [[1, 7]]})
+
+
+def test_decode_legacy_and_malformed():
+    legacy = {"rows": 1, "cols": 2, "grid": [[1, 1]]}
+    assert decode_layout(json.dumps(legacy)) == legacy
+    assert decode_layout(legacy) == legacy
+    assert decode_layout("") is None
+    assert decode_layout("not json") is None
+    # cell count doesn't match rows x cols
+    assert decode_layout(encode_layout(_layout(2, 2))[:-4] + "AA==") is None
+
+
+def test_compact_cell():
+    layout = _layout(4, 5)
+    text = compact_cell(json.dumps(layout))
+    assert decode_layout(text) == layout
+    assert compact_cell(text) == text
+    assert compact_cell("") == ""
+    # anything the codec can't represent is stored unchanged
+    odd = json.dumps({"rows": 1, "cols": 1, "grid": [[9]]})
+    assert compact_cell(odd) == odd
@@ -0,0 +1,107 @@
+# backend/tests/test_seat_reservations.py
+from backend.services.seat_reservations import SeatReservations, MSG_ALREADY_BOOKED
+
+
+class FakeStore:
+    """Just enough of SheetStore for the reservation index"""
+
+    def __init__(self, bookings=()):
+        self.bookings = list(bookings)
+        self.gen = 0
+
+    def get_bookings(self):
+        return self.bookings
+
+    def generation(self, sheet_name):
+        return self.gen
+
+    def reload(self, bookings):
+        # another worker wrote: the store hands back reloaded rows
+        self.bookings = list(bookings)
+        self.gen += 1
+
+
+def _booking(event_id, usn, seats, status="confirmed"):
+    return {"EventID": event_id, "USN": usn, "Seats": seats, "Status": status}
+
+
+def test_reserve_rejects_taken_seats_and_repeat_users():
+    res = SeatReservations(FakeStore([_booking("E1", "U1", "A1,A2")]))
+    assert res.reserve("E1", "u1", ["B1"]) == (False, MSG_ALREADY_BOOKED)
+    assert res.reserve("E1", "U2", ["A2"]) == (False, "Seat A2 is already booked.")
+    assert res.reserve("E1", "U2", ["B1", "B1"]) == (False, "Seat B1 is already booked.")
+    assert res.reserve("E1", "U2", ["B1"]) == (True, None)
+    # same seat in another event is fine
+    assert res.reserve("E2", "U2", ["A1"]) == (True, None)
+
+
+def test_pending_reservations_conflict_until_aborted():
+    res = SeatReservations(FakeStore())
+    assert res.reserve("E1", "U1", "A1") == (True, None)
+    assert res.reserve("E1", "U2", "A1")[0] is False
+    res.abort("E1", "U1", "A1")
+    assert res.reserve("E1", "U2", "A1") == (True, None)
+
+
+def test_commit_release_and_cancelled_bookings():
+    res = SeatReservations(FakeStore([_booking("E1", "U9", "C1", status="Cancelled")]))
+    # cancelled bookings hold nothing
+    assert res.reserve("E1", "U9", "C1") == (True, None)
+    res.commit("E1", "U9", "C1")
+    assert res.taken_seats("E1") == {"C1"}
+    assert res.has_booked("E1", "U9")
+
+    res.release("E1", "U9", "C1")
+    assert res.taken_seats("E1") == set()
+    assert not res.has_booked("E1", "U9")
+
+
+def test_general_entry_is_not_a_seat():
+    res = SeatReservations(FakeStore())
+    assert res.reserve("E1", "U1", "General Entry") == (True, None)
+    assert res.reserve("E1", "U2", "General Entry") == (True, None)
+    assert res.taken_seats("E1") == set()
+
+
+def test_rebuild_on_generation_keeps_pending_and_sees_other_writers():
+    store = FakeStore([_booking("E1", "U1", "A1")])
+    res = SeatReservations(store)
+    assert res.reserve("E1", "U2", "A2") == (True, None)
+    before = res.changes("E1")
+
+    store.reload([_booking("E1", "U1", "A1"), _booking("E1", "U3", "A3")])
+    assert res.taken_seats("E1") == {"A1", "A2", "A3"}
+    assert res.reserve("E1", "U4", "A3")[0] is False
+    assert res.changes("E1") != before
+
+
+def test_own_writes_do_not_rebuild():
+    store = FakeStore()
+    res = SeatReservations(store)
+    res.taken_seats("E1")
+    # a booking written by this process: the store patches its rows in place
+    assert res.reserve("E1", "U1", "A1") == (True, None)
+    store.bookings.append(_booking("E1", "U1", "A1"))
+    res.commit("E1", "U1", "A1")
+    store.bookings.clear()  # would drop A1 if the index were rebuilt from the rows
+    assert res.taken_seats("E1") == {"A1"}
+
+
+def test_status_change_releases_only_on_transition():
+    res = SeatReservations(FakeStore([_booking("E1", "U1", "A1")]))
+    assert res.taken_seats("E1") == {"A1"}
+
+    # an unchanged or non-releasing status keeps the seat
+    res.set_status("E1", "U1", "A1", "confirmed", "confirmed")
+    assert res.taken_seats("E1") == {"A1"}
+
+    res.set_status("E1", "U1", "A1", "Rejected", "confirmed")
+    assert res.taken_seats("E1") == set()
+    assert not res.has_booked("E1", "U1")
+
+    # reinstating does not silently re-take the seat; it goes through reserve()
+    res.set_status("E1", "U1", "A1", "confirmed", "Rejected")
+    assert res.taken_seats("E1") == set()
+    assert res.reserve("E1", "U1", "A1") == (True, None)
+    res.commit("E1", "U1", "A1")
+    assert res.taken_seats("E1") == {"A1"}
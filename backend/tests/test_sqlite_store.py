@@ -0,0 +1,42 @@
+# backend/tests/test_sqlite_store.py
+from backend.services.sqlite_store import SQLiteStore
+
+
+def test_writes_patch_the_cached_rows(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store.db"))
+    for i in range(3):
+        store.append_row("Bookings", {"BookingID": f"B{i}", "Seats": f"A{i}"})
+    rows = store.read_range("Bookings")
+    gen = store.generation("Bookings")
+
+    store.append_row("Bookings", {"BookingID": "B3", "Extra": "x"})
+    row_index, record = store.find_row_index("Bookings", "BookingID", "B1")
+    record["Seats"] = "Z9"
+    store.write_row_by_index("Bookings", row_index, record)
+    store.delete_rows_matching("Bookings", "BookingID", "B0")
+
+    assert store.read_range("Bookings") is rows
+    assert [(r["BookingID"], r["Seats"], r["Extra"]) for r in rows] == [
+        ("B1", "Z9", ""), ("B2", "A2", ""), ("B3", "", "x")
+    ]
+    assert store.generation("Bookings") == gen
+    assert rows == SQLiteStore(store.path).read_range("Bookings")
+
+
+def test_other_process_writes_reload_only_their_sheet(tmp_path):
+    path = str(tmp_path / "store.db")
+    store, other = SQLiteStore(path), SQLiteStore(path)
+    store.append_row("Bookings", {"BookingID": "B1"})
+    store.append_row("Events", {"ID": "E1"})
+    bookings, events = store.read_range("Bookings"), store.read_range("Events")
+    gen = store.generation("Bookings")
+
+    other.append_row("Bookings", {"BookingID": "B2"})
+    assert store.generation("Bookings") != gen
+    assert [r["BookingID"] for r in store.read_range("Bookings")] == ["B1", "B2"]
+    assert store.read_range("Bookings") is not bookings
+    assert store.read_range("Events") is events
+
+    # a local write after the other process's keeps both
+    store.append_row("Bookings", {"BookingID": "B3"})
+    assert [r["BookingID"] for r in store.read_range("Bookings")] == ["B1", "B2", "B3"]
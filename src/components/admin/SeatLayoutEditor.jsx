@@ -1,5 +1,6 @@
 import { useState, useEffect } from "react";
 import "./SeatLayoutEditor.css";
+import { decodeLayout } from "../../utils/seatLayout";
 
 /* 
   layout structure: 
@@ -27,7 +28,7 @@ export default function SeatLayoutEditor({ initialLayout, onChange, readOnly = f
     useEffect(() => {
         if (initialLayout) {
             try {
-                const parsed = typeof initialLayout === 'string' ? JSON.parse(initialLayout) : initialLayout;
+                const parsed = decodeLayout(initialLayout);
                 if (parsed.grid) {
                     setRows(parsed.rows);
                     setCols(parsed.cols);
@@ -88,6 +88,7 @@ export default function Login() {
         sem: user.Sem || user.sem || "",
         college: user.College || user.college || "",
         role: (user.Role || user.role || "user").toLowerCase(),
+        token: data.token || "",
       };
 
       localStorage.setItem("currentUser", JSON.stringify(userData));
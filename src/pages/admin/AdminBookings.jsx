@@ -1,5 +1,6 @@
 import { useEffect, useState } from "react";
 import { apiGet, apiDelete, apiPut, apiPost } from "../../utils/api";
+import { decodeLayout } from "../../utils/seatLayout";
 import Loader from "../../components/Loader";
 
 /* =========================================
@@ -24,7 +25,8 @@ function NewBookingDialog({ onClose, onSaved }) {
     async function loadData() {
       const e = await apiGet("/events/");
       setEvents(e.events || e || []);
-      const u = await apiGet("/users/");
+      // only the dropdown columns
+      const u = await apiGet("/users/?fields=USN,Name");
       setUsers(u.users || u || []);
     }
     loadData();
@@ -59,7 +61,7 @@ function NewBookingDialog({ onClose, onSaved }) {
     if (!selectedEventObj || !selectedEventObj.SeatLayout) return null;
 
     try {
-      const { rows, cols, grid } = JSON.parse(selectedEventObj.SeatLayout);
+      const { rows, cols, grid } = decodeLayout(selectedEventObj.SeatLayout);
       const mapElements = [];
       let rowLabelIdx = 0;
 
@@ -3,7 +3,7 @@ import React, { useState, useEffect, useMemo } from "react";
 import { useNavigate } from "react-router-dom";
 import BackButton from "../../components/BackButton";
 import "./History.css";
-import { BASE } from "../../utils/api";
+import { BASE, authHeaders } from "../../utils/api";
 
 export default function History() {
   const navigate = useNavigate();
@@ -60,6 +60,7 @@ export default function History() {
         const usn = encodeURIComponent(String(currentUser.usn).trim());
         const res = await fetch(`${backendRoot}/bookings/user/${usn}`, {
           method: "GET",
+          headers: authHeaders(),
         });
 
         const contentType = res.headers.get("content-type") || "";
@@ -194,7 +195,7 @@ export default function History() {
     const interval = setInterval(async () => {
       try {
         const usn = encodeURIComponent(String(currentUser.usn).trim());
-        const res = await fetch(`${backendRoot}/bookings/user/${usn}`);
+        const res = await fetch(`${backendRoot}/bookings/user/${usn}`, { headers: authHeaders() });
         const data = await res.json();
         if (data?.data && Array.isArray(data.data)) {
           setBookings((prev) =>
@@ -247,20 +248,9 @@ export default function History() {
   }, [sortedBookings, filter]);
 
   // ------------------ GENERATE QR ------------------
-  const generateQR = (b) => {
-    const payload = {
-      bookingId: b.bookingId,
-      eventId: b.eventId || b.event,
-      eventName: b.eventName,
-      auditorium: b.auditorium, // Include venue
-      seats: b.seats,
-      user: b.usn,
-      bookedOn: b.bookedOn,
-    };
-    return `https://api.qrserver.com/v1/create-qr-code/?size=180x180&data=${encodeURIComponent(
-      JSON.stringify(payload)
-    )}`;
-  };
+  const generateQR = (b) =>
+    // QR image is generated and cached by the backend
+    `${BASE}/bookings/qr/${encodeURIComponent(b.bookingId)}.png`;
 
   // ------------------ LOADING STATE ------------------
   if (loading) {
@@ -357,10 +347,7 @@ export default function History() {
                       src={generateQR(b)}
                       alt="qr"
                       className="qr-img"
-                      onError={(e) =>
-                      (e.currentTarget.src =
-                        "https://api.qrserver.com/v1/create-qr-code/?size=180x180&data=invalid")
-                      }
+                      onError={(e) => (e.currentTarget.style.visibility = "hidden")}
                     />
 
                     <div className="history-buttons">
@@ -2,12 +2,13 @@
 import React, { useState, useEffect } from "react";
 import { useParams, useNavigate, useLocation } from "react-router-dom";
 import { apiGet, apiPost } from "../../utils/api";
+import { decodeLayout, takenSeatsFromAvailability } from "../../utils/seatLayout";
 import "./SeatBooking.css";
 
 // Helper to parse custom layout
 const parseLayout = (layoutJson) => {
     try {
-        const { rows: R, cols: C, grid } = JSON.parse(layoutJson);
+        const { rows: R, cols: C, grid } = decodeLayout(layoutJson);
         const map = [];
         let rowLabelIdx = 0;
 
@@ -177,18 +178,13 @@ export default function SeatBooking() {
     useEffect(() => {
         if (!eventId) return;
 
+        // Occupancy bitmap instead of every booking; the response carries an ETag,
+        // so the browser revalidates and unchanged polls come back as 304s
         const fetchBookings = async () => {
             try {
-                const resBookings = await apiGet(`/bookings/event/${eventId}`);
-                const bArr = resBookings.data || [];
-                const allTaken = [];
-                bArr.forEach(b => {
-                    const s = String(b.Seats || "").split(",");
-                    s.forEach(seat => {
-                        if (seat.trim()) allTaken.push(seat.trim());
-                    });
-                });
-                setBookedSeats(allTaken);
+                const res = await apiGet(`/events/${eventId}/availability`);
+                if (res.status !== "success" || !res.data) return;
+                setBookedSeats(takenSeatsFromAvailability(res.data));
             } catch (err) {
                 console.error("Polling error:", err);
             }
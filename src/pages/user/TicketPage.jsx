@@ -4,7 +4,7 @@ import { useParams, useLocation } from "react-router-dom";
 import html2canvas from "html2canvas";
 import jsPDF from "jspdf";
 import "./TicketPage.css";
-import { apiGet } from "../../utils/api";
+import { apiGet, BASE } from "../../utils/api";
 
 export default function TicketPage() {
   const { ticketId, id } = useParams();
@@ -33,22 +33,8 @@ export default function TicketPage() {
           const normalized = normalizeBooking(t);
           setBooking(normalized);
 
-          // Build QR
-          const qrPayload = {
-            bookingId: normalized.bookingId,
-            eventName: normalized.eventName,
-            auditorium: normalized.auditorium, // Include venue
-            seats: normalized.seats,
-            schedule: normalized.schedule,
-            bookedOn: normalized.bookedOn,
-            user: normalized.usn || "guest",
-          };
-
-          setQrUrl(
-            `https://api.qrserver.com/v1/create-qr-code/?size=400x400&data=${encodeURIComponent(
-              JSON.stringify(qrPayload)
-            )}`
-          );
+          // QR image is generated and cached by the backend
+          setQrUrl(`${BASE}/bookings/qr/${encodeURIComponent(normalized.bookingId)}.png`);
 
           setLoading(false);
           return;
@@ -84,22 +70,8 @@ export default function TicketPage() {
         const normalized = normalizeBooking(found);
         setBooking(normalized);
 
-        // Build QR
-        const qrPayload = {
-          bookingId: normalized.bookingId,
-          eventName: normalized.eventName,
-          auditorium: normalized.auditorium, // Include venue
-          seats: normalized.seats,
-          schedule: normalized.schedule,
-          bookedOn: normalized.bookedOn,
-          user: normalized.usn || "guest",
-        };
-
-        setQrUrl(
-          `https://api.qrserver.com/v1/create-qr-code/?size=400x400&data=${encodeURIComponent(
-            JSON.stringify(qrPayload)
-          )}`
-        );
+        // QR image is generated and cached by the backend
+        setQrUrl(`${BASE}/bookings/qr/${encodeURIComponent(normalized.bookingId)}.png`);
 
       } catch (err) {
         console.error("Error retrieving booking:", err);
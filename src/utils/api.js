@@ -24,17 +24,27 @@ export const BASE = getBaseURL();
 
 console.log("🔧 API Base URL:", BASE);
 
+// Session token issued at login, sent as "Authorization: Bearer <token>"
+export const authHeaders = () => {
+  try {
+    const token = JSON.parse(localStorage.getItem("currentUser") || "{}").token;
+    return token ? { Authorization: `Bearer ${token}` } : {};
+  } catch {
+    return {};
+  }
+};
+
 async function request(path, opts = {}) {
   const url = BASE + path;
-  const headers = { ...opts.headers };
+  const headers = { ...authHeaders(), ...opts.headers };
   // Only send Content-Type for requests with a body (POST/PUT) to avoid CORS Preflight on GET
   if (opts.method === "POST" || opts.method === "PUT") {
     headers["Content-Type"] = "application/json";
   }
 
   const res = await fetch(url, {
-    headers,
     ...opts,
+    headers,
   });
 
   const text = await res.text();
@@ -0,0 +1,63 @@
+// Decodes a SeatLayout cell into { rows, cols, grid }.
+// Cells are either legacy JSON ('{"rows":R,"cols":C,"grid":[[...]]}') or the
+// compact form written by the backend (backend/services/seat_layout.py):
+//   "SL1:" + base64( varint rows, varint cols, runs )
+//   one byte per run: (cell << 6) | (length - 1)  -> 0 gap, 1 std, 2 VIP, 3 blocked
+const PREFIX = "SL1:";
+
+const decodeCompact = (text) => {
+  const bin = atob(text.slice(PREFIX.length));
+  let pos = 0;
+  const varint = () => {
+    let n = 0, shift = 0, byte;
+    do {
+      byte = bin.charCodeAt(pos++);
+      n += (byte & 0x7f) * 2 ** shift;
+      shift += 7;
+    } while (byte & 0x80);
+    return n;
+  };
+  const rows = varint();
+  const cols = varint();
+
+  const flat = [];
+  for (; pos < bin.length; pos++) {
+    const byte = bin.charCodeAt(pos);
+    const cell = byte >> 6;
+    for (let i = (byte & 0x3f) + 1; i > 0; i--) flat.push(cell);
+  }
+  if (flat.length !== rows * cols) throw new Error(`Seat layout has ${flat.length} cells, expected ${rows}x${cols}`);
+
+  const grid = [];
+  for (let r = 0; r < rows; r++) grid.push(flat.slice(r * cols, (r + 1) * cols));
+  return { rows, cols, grid };
+};
+
+// Throws on malformed input, like JSON.parse did
+export const decodeLayout = (value) => {
+  if (value && typeof value === "object") return value;
+  if (typeof value === "string" && value.startsWith(PREFIX)) return decodeCompact(value);
+  return JSON.parse(value);
+};
+
+// Seat IDs taken according to /events/<id>/availability: bit i of the
+// base64 bitmap (MSB first) is the i-th non-gap cell, labelled the way the
+// seat picker labels seats (rows without seats skipped, A1, A2, ...).
+export const takenSeatsFromAvailability = ({ layout, bitmap, extraTaken = [] }) => {
+  const bits = atob(bitmap || "");
+  const taken = [...extraTaken];
+  let i = 0;
+  let rowLabelIdx = 0;
+  for (const row of layout?.grid || []) {
+    if (!row.some(x => x !== 0)) continue;
+    const label = String.fromCharCode(65 + rowLabelIdx++);
+    let seatNum = 0;
+    for (const cell of row) {
+      if (cell === 0) continue;
+      seatNum++;
+      if (bits.charCodeAt(i >> 3) & (0x80 >> (i & 7))) taken.push(`${label}${seatNum}`);
+      i++;
+    }
+  }
+  return taken;
+};